@@ -88,7 +88,7 @@ from utils import (
     MemoryManager, SecurityManager, AsyncAPIHandler, 
     TempFileManager, FileChunker, analyze_audio_file, create_waveform_plot,
     estimate_processing_time, analyze_text_with_ai, get_speech_speed_category,
-    highlight_keywords_in_text, create_ai_analysis_display, initialize_openai_client
+    highlight_keywords_in_text, initialize_openai_client
 )
 from export_utils import PDFExporter, WordExporter, ExcelExporter, QRCodeGenerator, ZipArchiver, EmailSender
 from youtube_transcriber import render_youtube_tab
@@ -122,6 +122,11 @@ try:
 except ImportError:
     qrcode = None
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 from io import BytesIO
 
 try:
@@ -697,22 +702,20 @@ class TranscriptionProcessor:
                 raise WhisperAIError(error_msg, "API_ERROR", str(e))
     
     def _merge_timestamped_transcripts(self, transcripts: list, format_type: str) -> str:
-        """Timestamp'li transkriptleri birleştir"""
+        """Timestamp'li transkriptleri birleştir - parçalar listede toplanıp tek join ile"""
         if format_type == "srt":
-            result = ""
-            for i, transcript in enumerate(transcripts, 1):
-                start_time = self._seconds_to_srt_time(transcript['start_time'])
-                end_time = self._seconds_to_srt_time(transcript['end_time'])
-                result += f"{i}\n{start_time} --> {end_time}\n{transcript['text']}\n\n"
-            return result
+            to_time = self._seconds_to_srt_time
+            return "".join([
+                f"{i}\n{to_time(t['start_time'])} --> {to_time(t['end_time'])}\n{t['text']}\n\n"
+                for i, t in enumerate(transcripts, 1)
+            ])
         
         elif format_type == "vtt":
-            result = "WEBVTT\n\n"
-            for transcript in transcripts:
-                start_time = self._seconds_to_vtt_time(transcript['start_time'])
-                end_time = self._seconds_to_vtt_time(transcript['end_time'])
-                result += f"{start_time} --> {end_time}\n{transcript['text']}\n\n"
-            return result
+            to_time = self._seconds_to_vtt_time
+            return "WEBVTT\n\n" + "".join([
+                f"{to_time(t['start_time'])} --> {to_time(t['end_time'])}\n{t['text']}\n\n"
+                for t in transcripts
+            ])
         
         return " ".join([t['text'] for t in transcripts])
     
@@ -798,6 +801,7 @@ def main():
         # İlk başlatma temizliği
         MemoryManager.cleanup_session_state(force_cleanup=True)
         TempFileManager.cleanup_session_temp_files()
+        MemoryManager.configure_gc()
         st.session_state.app_initialized = True
         logger.info("Application initialized with memory cleanup")
 
@@ -1284,7 +1288,9 @@ with st.sidebar:
         session_keys = len(st.session_state.keys())
         file_data_keys = len([k for k in st.session_state.keys() if isinstance(k, str) and k.startswith('file_data_')])
         
-        st.caption(f"📊 Session Keys: {session_keys} | File Data: {file_data_keys}")
+        completed_count = len(st.session_state.get('_completed_registry', []))
+        
+        st.caption(f"📊 Session Keys: {session_keys} | File Data: {file_data_keys} | Completed: {completed_count}")
         
         if file_data_keys > 5:
             warning_text = get_text("too_many_file_data")
@@ -1827,9 +1833,19 @@ with tab6:
                             "rapor_tarihi": datetime.now().isoformat()
                         }
                         
+                        # orjson doğrudan bytes üretir - download_button bytes kabul eder
+                        if orjson is not None:
+                            report_json = orjson.dumps(
+                                report_data,
+                                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                                default=str
+                            )
+                        else:
+                            report_json = json.dumps(report_data, indent=2, ensure_ascii=False)
+                        
                         st.download_button(
                             "📥 Detaylı Rapor İndir",
-                            data=json.dumps(report_data, indent=2, ensure_ascii=False),
+                            data=report_json,
                             file_name=f"whisper_detailed_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                             mime="application/json"
                         )
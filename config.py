@@ -6,6 +6,7 @@ Bu modül uygulamanın tüm konfigürasyon ayarlarını ve çok dilli desteği y
 
 import os
 from pathlib import Path
+from functools import lru_cache
 
 # =============================================
 # 🌍 LANGUAGE SUPPORT SYSTEM
@@ -911,6 +912,11 @@ def get_text(key, lang=None):
     if lang is None:
         lang = get_current_language()
     
+    return _resolve_text(lang, key)
+
+@lru_cache(maxsize=4096)
+def _resolve_text(lang, key):
+    """UI_TEXTS sabit olduğundan (dil, anahtar) çözümü bir kez yapılır; dil anahtarın parçası, temizleme gerekmez"""
     return UI_TEXTS.get(lang, {}).get(key, key)
 
 def set_language(language_code):
@@ -1013,7 +1019,13 @@ ADVANCED_CONFIG = {
     'openai_api_key': OPENAI_API_KEY,
     'whisper_model': 'whisper-1',
     'enable_chunking': True,
-    'overlap_seconds': 5
+    'overlap_seconds': 5,
+    'api_concurrency': 4,  # Büyük dosyada aynı anda gönderilen parça sayısı
+    'enable_cache': True,  # Aynı ses içeriği için Whisper sonucunu diskten kullan
+    'cache_dir': '.whisper_cache',
+    'download_cache_max_mb': 1024,  # İndirme cache'i bu boyutu aşınca en eski gövdeler silinir
+    'chunk_policy': 'smart',  # always | smart | never - eşiği az aşan kısa dosyalar tek çağrıda gider
+    'chunk_min_duration_seconds': 600
 }
 
 # =============================================
@@ -16,6 +16,11 @@ import os
 import tempfile
 import threading
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
 # Config'den import
 from config import DATABASE_CONFIG, SECURITY_CONFIG, get_config
 
@@ -194,15 +199,17 @@ class DatabaseManager:
     
     def save_transcription(self, file_name: str, file_bytes: bytes, audio_info: dict,
                           language: str, format_type: str, transcript_text: str,
-                          ai_analysis: dict = None, processing_info: dict = None) -> Optional[int]:
-        """Transkripsiyon kaydeder"""
+                          ai_analysis: dict = None, processing_info: dict = None,
+                          file_hash: Optional[str] = None) -> Optional[int]:
+        """Transkripsiyon kaydeder (file_hash önceden hesaplandıysa tekrar hash'lenmez)"""
         try:
             with self.lock:
                 conn = self._get_connection()
                 cursor = conn.cursor()
                 
                 # Dosya hash'i
-                file_hash = hashlib.md5(file_bytes).hexdigest()
+                if file_hash is None:
+                    file_hash = get_file_hash(file_bytes)
                 
                 # Duplicate kontrolü
                 cursor.execute("SELECT id FROM transcriptions WHERE file_hash = ? AND deleted_at IS NULL", (file_hash,))
@@ -336,6 +343,24 @@ class DatabaseManager:
             self.logger.error(f"Failed to get transcription by ID: {e}")
             return None
     
+    def find_transcription(self, file_hash: str, language: str, format_type: str) -> Optional[dict]:
+        """Aynı kaynak, dil ve formatla silinmemiş kayıt varsa döndürür"""
+        try:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                SELECT id, transcript_text FROM transcriptions
+                WHERE file_hash = ? AND language = ? AND format_type = ? AND deleted_at IS NULL
+            ''', (file_hash, language, format_type))
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
+            
+        except Exception as e:
+            self.logger.error(f"Failed to find transcription: {e}")
+            return None
+    
     def toggle_favorite(self, transcription_id: int) -> bool:
         """Favori durumunu değiştirir"""
         try:
@@ -479,6 +504,14 @@ class DatabaseManager:
                 'transcriptions': df.to_dict('records')
             }
             
+            # orjson varsa tek bir bytes buffer'a serialize et (stdlib json'dan çok daha hızlı)
+            if orjson is not None:
+                return orjson.dumps(
+                    export_data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                    default=str
+                ).decode('utf-8')
+            
             return json.dumps(export_data, ensure_ascii=False, indent=2)
             
         except Exception as e:
@@ -645,20 +678,31 @@ def get_file_hash(file_bytes: bytes) -> str:
 
 def save_transcription_to_db(file_name: str, file_bytes: bytes, audio_info: dict, 
                            language: str, format_type: str, transcript_text: str, 
-                           ai_analysis: dict = None) -> Optional[int]:
+                           ai_analysis: dict = None, file_hash: Optional[str] = None) -> Optional[int]:
     """Legacy function - DatabaseManager kullanır"""
     return db_manager.save_transcription(
         file_name, file_bytes, audio_info, language, 
-        format_type, transcript_text, ai_analysis
+        format_type, transcript_text, ai_analysis,
+        file_hash=file_hash
     )
 
+def _youtube_source_key(video_url: str, language: str, format_type: str) -> Tuple[str, str]:
+    """(video_id, file_hash) - hash video ID, dil ve formattan üretilir
+    
+    file_hash sütunu UNIQUE olduğundan aynı videonun farklı dil/format sonuçları
+    ayrı anahtarla saklanır; youtu.be/ID ile watch?v=ID&t=5 aynı kayda düşer.
+    """
+    from youtube_transcriber import extract_youtube_id
+    video_id = extract_youtube_id(video_url) or video_url
+    return video_id, get_file_hash(f"youtube:{video_id}:{language}:{format_type}".encode('utf-8'))
+
 def save_youtube_transcription(video_url: str, video_info: dict, transcript_text: str,
                               language: str, format_type: str = "text") -> Optional[int]:
     """YouTube transkripsiyon sonucunu veritabanına kaydeder"""
     try:
-        # YouTube URL'sinden sahte dosya hash'i oluştur
-        video_id = video_url.split('=')[-1].split('&')[0] if '=' in video_url else video_url.split('/')[-1]
-        fake_file_bytes = video_url.encode('utf-8')  # URL'yi bytes olarak kullan
+        # Kayıt anahtarı video/dil/format; dosya boyutu için URL bytes kullanılır
+        video_id, file_hash = _youtube_source_key(video_url, language, format_type)
+        fake_file_bytes = video_url.encode('utf-8')
         
         # Dosya adı oluştur
         video_title = video_info.get('title', f'YouTube Video {video_id}')
@@ -700,13 +744,19 @@ def save_youtube_transcription(video_url: str, video_info: dict, transcript_text
             format_type=format_type,
             transcript_text=transcript_text,
             ai_analysis=ai_analysis,
-            processing_info=processing_info
+            processing_info=processing_info,
+            file_hash=file_hash
         )
         
     except Exception as e:
         logger.error(f"YouTube transkripsiyon kaydedilemedi: {e}")
         return None
 
+def find_youtube_transcription(video_url: str, language: str, format_type: str = "text") -> Optional[dict]:
+    """save_youtube_transcription ile kaydedilmiş aynı video/dil/format transkripsiyonu"""
+    _, file_hash = _youtube_source_key(video_url, language, format_type)
+    return db_manager.find_transcription(file_hash, language, format_type)
+
 def get_transcription_history() -> pd.DataFrame:
     """Legacy function - DatabaseManager kullanır"""
     return db_manager.get_transcription_history()
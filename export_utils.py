@@ -1072,6 +1072,10 @@ class ZipArchiver:
             import zipfile
             from io import BytesIO
             import json
+            try:
+                import orjson  # type: ignore
+            except ImportError:
+                orjson = None
             
             buffer = BytesIO()
             
@@ -1090,7 +1094,15 @@ class ZipArchiver:
                     'export_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'version': 'Whisper AI v2.0'
                 }
-                zf.writestr(f"{base_name}_metadata.json", json.dumps(metadata, indent=2, ensure_ascii=False))
+                if orjson is not None:
+                    metadata_json = orjson.dumps(
+                        metadata,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+                        default=str
+                    )
+                else:
+                    metadata_json = json.dumps(metadata, indent=2, ensure_ascii=False)
+                zf.writestr(f"{base_name}_metadata.json", metadata_json)
                 
                 # README dosyası
                 readme_content = f"""Whisper AI Transkripsiyon Arşivi
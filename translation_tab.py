@@ -225,10 +225,15 @@ def render_translation_tab():
         
         # İndirme butonu
         if info:
-            filename = f"translation_{info['target_language']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            # Zaman damgası çeviri anında sabitlenir - her rerun'da değişip widget'ı yeniden oluşturmasın
+            file_stamp = info.get('file_stamp') or datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"translation_{info['target_language']}_{file_stamp}.txt"
+            # Çeviri bir kez UTF-8'e çevrilip saklanır; her rerun'da tekrar encode edilmez
+            download_data = (st.session_state.get('translation_result_bytes')
+                             or st.session_state.translation_result)
             st.download_button(
                 label=get_text("download_translation"),
-                data=st.session_state.translation_result,
+                data=download_data,
                 file_name=filename,
                 mime="text/plain",
                 key="download_translation"
@@ -237,6 +242,7 @@ def render_translation_tab():
         # Temizle butonu
         if st.button(get_text("clear_new_translation"), type="secondary"):
             st.session_state.translation_result = None
+            st.session_state.translation_result_bytes = None
             st.session_state.translation_info = None
             st.rerun()
         
@@ -248,7 +254,7 @@ def render_translation_tab():
     # Önce güncel session state'ten son işlenen dosyaları kontrol et
     recent_files = []
     if "processed_files_list" in st.session_state and st.session_state.processed_files_list:
-        recent_files = st.session_state.processed_files_list[-5:]  # Son 5 dosya
+        recent_files = list(st.session_state.processed_files_list)[-5:]  # Son 5 dosya (deque dilimlenemez)
         recent_files.reverse()  # En yeniden en eskiye
     
     # Veritabanından geçmiş kayıtları al
@@ -400,13 +406,17 @@ def render_translation_tab():
             status_text.info("💾 Sonuç kaydediliyor...")
             
             # Sonucu session state'e kaydet
+            file_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            translation_bytes = translation_result.encode('utf-8')
             st.session_state.translation_result = translation_result
+            st.session_state.translation_result_bytes = translation_bytes
             st.session_state.translation_info = {
                 'source_file': selected_transcription['file_name'],
                 'target_language': target_language,
                 'model_used': model_choice,
                 'original_text': selected_transcription['transcript_text'],
-                'source_id': selected_transcription['id']
+                'source_id': selected_transcription['id'],
+                'file_stamp': file_stamp
             }
             
             translation_logger.progress(3, 4, "Veritabanına kaydetme")
@@ -447,10 +457,10 @@ def render_translation_tab():
             st.text_area("", translation_result, height=400, key="current_translation")
             
             # İndirme butonu
-            filename = f"translation_{language_code}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+            filename = f"translation_{language_code}_{file_stamp}.txt"
             st.download_button(
                 label=get_text("download_translation"),
-                data=translation_result,
+                data=translation_bytes,
                 file_name=filename,
                 mime="text/plain",
                 key="download_current_translation"
@@ -6,14 +6,18 @@ Temiz ve düzenli dosya yükleme arayüzü
 import streamlit as st
 import os
 import time
-import gc
 import tempfile
 import json
-from typing import Optional, Dict, Any
+import re
+import unicodedata
+from typing import Optional, Dict, Any, Tuple
 from collections import Counter
+from itertools import filterfalse
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+
 from config import (
     ALLOWED_FORMATS, FILE_SIZE_LIMITS, LANGUAGES, RESPONSE_FORMATS,
     get_text, get_current_language
@@ -22,9 +26,110 @@ from utils import (
     analyze_audio_file, create_waveform_plot, estimate_processing_time,
     analyze_text_with_ai, TranscriptionProcessor, MemoryManager
 )
-from database import save_transcription_to_db
+from database import save_transcription_to_db, get_file_hash
 from logger_config import transcription_logger
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# Metin istatistikleri için tek geçişlik token deseni: kelime | nokta | paragraf arası
+_TOKEN_RE = re.compile(r"(\w+)|(\.)|(\n\s*\n)")
+
+# Metnin (baştaki boşluklar hariç) '{' ile başlayıp başlamadığını kopyasız kontrol eder
+_JSON_OBJECT_START_RE = re.compile(r"\s*\{")
+
+# "85%" gibi güven değerlerinin baştaki tamsayı kısmı
+_PERCENT_RE = re.compile(r"\s*(\d+)")
+
+# Temel Türkçe stopwords - import sırasında bir kez oluşturulur
+_TURKISH_STOPWORDS = frozenset({
+    've', 'bir', 'bu', 'da', 'de', 'ile', 'için', 'olan', 'olarak', 
+    'var', 'yok', 'gibi', 'kadar', 'daha', 'çok', 'az', 'ya', 'ya da', 
+    'ama', 'fakat', 'ancak', 'lakin', 'hem', 'ise', 'eğer', 'şayet',
+    'ki', 'mi', 'mı', 'mu', 'mü', 'ne', 'nasıl', 'neden', 'niçin',
+    'ben', 'sen', 'o', 'biz', 'siz', 'onlar', 'şu'
+})
+
+# Duygu -> renk tablosu
+_DEFAULT_EMOTION_COLOR = 'linear-gradient(135deg, #6b7280, #4b5563)'
+_EMOTION_COLORS = {
+    'Pozitif': 'linear-gradient(135deg, #10b981, #047857)',
+    'Negatif': 'linear-gradient(135deg, #ef4444, #dc2626)',
+    'Nötr': 'linear-gradient(135deg, #6b7280, #4b5563)',
+    'Mutlu': 'linear-gradient(135deg, #f59e0b, #d97706)',
+    'Üzgün': 'linear-gradient(135deg, #3b82f6, #1d4ed8)',
+    'Öfkeli': 'linear-gradient(135deg, #ef4444, #991b1b)',
+    'Heyecanlı': 'linear-gradient(135deg, #8b5cf6, #7c3aed)',
+    'Sakin': 'linear-gradient(135deg, #06b6d4, #0891b2)',
+    'Gergin': 'linear-gradient(135deg, #f97316, #ea580c)',
+    'Rahat': 'linear-gradient(135deg, #22c55e, #16a34a)',
+}
+
+# Detaylı AI analiz ekranının okuduğu alanlar ve varsayılan değerleri (sırası önemli)
+_AI_ANALYSIS_FIELDS = (
+    ('text_statistics', None),
+    ('audio_metadata', {}),
+    ('content_quality', {}),
+    ('word_frequency', {}),
+    ('keywords', []),
+    ('emotion_analysis', ''),
+    ('sentiment_score', None),
+    ('summary', 'Özet bulunamadı'),
+    ('topics', []),
+    ('content_category', 'Bilinmiyor'),
+    ('language_detected', 'Bilinmiyor'),
+)
+
+# Anahtar kelime chip'leri ve konu kartları için HTML şablonları
+_KEYWORD_CHIP_COLORS = (
+    'linear-gradient(135deg, #4a90e2, #667eea)',
+    'linear-gradient(135deg, #10b981, #34d399)', 
+    'linear-gradient(135deg, #f59e0b, #fbbf24)',
+    'linear-gradient(135deg, #ef4444, #f87171)',
+    'linear-gradient(135deg, #8b5cf6, #a78bfa)',
+    'linear-gradient(135deg, #f97316, #fb923c)',
+    'linear-gradient(135deg, #06b6d4, #22d3ee)',
+    'linear-gradient(135deg, #84cc16, #a3e635)'
+)
+_KEYWORD_CHIP_TEMPLATE = (
+    '<span style="display: inline-block; background: {color}; color: white; padding: 6px 12px; '
+    'margin: 3px; border-radius: 15px; font-size: 0.85rem; font-weight: 500; '
+    'box-shadow: 0 2px 4px rgba(0,0,0,0.2);">{keyword}</span>'
+)
+_TOPIC_CARD_TEMPLATE = (
+    '<div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); '
+    'padding: 1.5rem; border-radius: 10px; text-align: center; margin: 0.5rem 0; '
+    'box-shadow: 0 4px 8px rgba(0,0,0,0.1);"><h4 style="color: white; margin: 0;">{topic}</h4></div>'
+)
+
+# Sonuç ve analiz kartları - iskelet sabit, yalnızca içerik değişir
+_TRANSCRIPT_CARD_TEMPLATE = (
+    '<div style="background: #1a1d23; padding: 1.5rem; border-radius: 10px; margin: 1rem 0; '
+    'border-left: 4px solid #4a90e2;">'
+    '<p style="line-height: 1.6; color: #fafafa; margin: 0;">{text}</p></div>'
+)
+_EMOTION_CARD_TEMPLATE = (
+    '<div style="background: {color}; padding: 2rem; border-radius: 15px; text-align: center; '
+    'box-shadow: 0 4px 8px rgba(0,0,0,0.1);">'
+    '<h2 style="color: white; margin-bottom: 1rem;">😊 {emotion}</h2>'
+    '<div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px;">'
+    '<p style="color: white; margin: 0; font-size: 1.1rem;"><strong>Güven Oranı:</strong> {confidence}</p>'
+    '<p style="color: white; margin: 0.5rem 0 0 0; font-size: 1.1rem;"><strong>Genel Ton:</strong> {tone}</p>'
+    '</div></div>'
+)
+_EMOTION_TEXT_TEMPLATE = (
+    '<div style="background: #1a1d23; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #f59e0b;">'
+    '<h4 style="color: #f59e0b; margin-bottom: 1rem;">💭 Duygu Analizi</h4>'
+    '<p style="line-height: 1.6; color: #fafafa; margin: 0;">{text}</p></div>'
+)
+_SUMMARY_CARD_TEMPLATE = (
+    '<div style="background: #1a1d23; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #10b981;">'
+    '<h4 style="color: #10b981; margin-bottom: 1rem;">📄 İçerik Özeti</h4>'
+    '<p style="line-height: 1.8; color: #fafafa; margin: 0; font-size: 1.1rem;">{summary}</p></div>'
+)
+
 
 def _create_pdf_report(uploaded_file, transcript_text: str, ai_analysis: Optional[Dict], 
                       transcription_id: int, audio_info: Dict) -> Optional[str]:
@@ -66,8 +171,6 @@ def _create_pdf_report(uploaded_file, transcript_text: str, ai_analysis: Optiona
         
         try:
             # Unicode destekli fontları dene
-            import os
-            
             # Windows sistem fontları
             windows_fonts = [
                 'C:/Windows/Fonts/arial.ttf',
@@ -159,7 +262,6 @@ def _create_pdf_report(uploaded_file, transcript_text: str, ai_analysis: Optiona
             
             # Unicode normalizasyon dene
             try:
-                import unicodedata
                 normalized = unicodedata.normalize('NFC', str(text))
                 
                 # Eğer Unicode font kayıtlıysa, direkt kullan
@@ -551,12 +653,28 @@ def render_upload_tab(client, transcription_processor):
     </div>
     """, unsafe_allow_html=True)
     
-    # Her dosyayı işle
+    # Ön geçiş: boyut/format hatalı dosyalar işleme UI'ı kurulmadan ayıklanır
+    valid_files = []
+    validation_errors = []
     for i, uploaded_file in enumerate(uploaded_files):
-        _process_single_file(uploaded_file, i, client, transcription_processor)
+        error, file_extension = _validate_file(uploaded_file)
+        if error:
+            validation_errors.append(error)
+        else:
+            valid_files.append((i, uploaded_file, file_extension))
+    
+    # Reddedilen dosyalar tek bir mesajda gösterilir
+    if validation_errors:
+        st.error("\n\n".join(validation_errors))
+    
+    # Geçerli dosyaları işle - her dosya kendi container'ında
+    for i, uploaded_file, file_extension in valid_files:
+        with st.container():
+            _process_single_file(uploaded_file, i, file_extension, client, transcription_processor)
 
 
-def _process_single_file(uploaded_file, file_index: int, client, transcription_processor):
+def _process_single_file(uploaded_file, file_index: int, file_extension: str,
+                         client, transcription_processor):
     """Tek bir dosyayı işler"""
     
     st.markdown("---")
@@ -564,13 +682,15 @@ def _process_single_file(uploaded_file, file_index: int, client, transcription_p
     # Dosya başlığı
     st.markdown(f"### 📄 {uploaded_file.name}")
     
-    # Dosya validasyonu
-    if not _validate_file(uploaded_file):
-        return
-    
-    # Ses analizi
+    # Ses analizi - dosya yükleme başına bir kez hash'lenir; cache, DB ve session anahtarları bu digest'i paylaşır
     file_bytes = uploaded_file.getvalue()
-    audio_info = _analyze_audio(uploaded_file.name, file_bytes)
+    upload_digests = st.session_state.setdefault('_upload_digests', {})
+    file_digest = upload_digests.get(uploaded_file.file_id)
+    if file_digest is None:
+        file_digest = upload_digests[uploaded_file.file_id] = get_file_hash(file_bytes)
+    audio_info = _analyze_audio(uploaded_file.name, file_bytes, file_digest, file_extension)
+    # Byte'lar yalnızca transkripsiyon başlatılırsa yeniden okunur - bu frame tutmaz
+    del file_bytes
     
     if not audio_info:
         return
@@ -579,33 +699,35 @@ def _process_single_file(uploaded_file, file_index: int, client, transcription_p
     _display_file_info(audio_info)
     
     # Transkripsiyon işlemi
-    _handle_transcription(uploaded_file, file_index, file_bytes, audio_info, client, transcription_processor)
+    _handle_transcription(uploaded_file, file_index, file_digest, audio_info,
+                          client, transcription_processor)
 
 
-def _validate_file(uploaded_file) -> bool:
-    """Dosya validasyonu"""
+def _validate_file(uploaded_file) -> Tuple[Optional[str], Optional[str]]:
+    """Dosya validasyonu - (hata mesajı, uzantı) döndürür; geçerliyse hata None olur"""
     
     # Boyut kontrolü
     if uploaded_file.size > FILE_SIZE_LIMITS["max_file_size"]:
-        st.error(f"❌ {uploaded_file.name} {get_text('file_too_large')} "
-                f"({FILE_SIZE_LIMITS['max_file_size'] // (1024*1024)} {get_text('mb_limit')})")
-        return False
+        return (f"❌ {uploaded_file.name} {get_text('file_too_large')} "
+                f"({FILE_SIZE_LIMITS['max_file_size'] // (1024*1024)} {get_text('mb_limit')})"), None
     
-    # Format kontrolü
+    # Format kontrolü - uzantı sonraki adımlarda tekrar hesaplanmasın diye döndürülür
     file_extension = os.path.splitext(uploaded_file.name)[1].lower()[1:]
     if file_extension not in ALLOWED_FORMATS:
-        st.error(f"❌ {uploaded_file.name} {get_text('unsupported_format')}")
-        return False
+        return f"❌ {uploaded_file.name} {get_text('unsupported_format')}", None
     
-    return True
+    return None, file_extension
 
 
-def _analyze_audio(file_name: str, file_bytes: bytes) -> Optional[Dict]:
+def _analyze_audio(file_name: str, file_bytes: bytes, file_digest: str,
+                   file_extension: str) -> Optional[Dict]:
     """Ses dosyası analizi"""
     
     with st.spinner(f"🔍 {file_name} {get_text('analyzing')}..."):
         try:
-            return analyze_audio_file(file_bytes, file_name)
+            # Bu tab dalga formu çizmiyor - yalnızca süre/dB/format metrikleri gösterilir
+            return analyze_audio_file(file_bytes, file_name, file_digest, file_extension,
+                                      compute_waveform=False)
         except Exception as e:
             st.error(f"❌ {get_text('audio_analysis_error')}: {str(e)}")
             return None
@@ -650,12 +772,12 @@ def _display_file_info(audio_info: Dict):
     st.info(f"**{get_text('estimated_processing_time')}:** {estimated_time}")
 
 
-def _handle_transcription(uploaded_file, file_index: int, file_bytes: bytes, 
+def _handle_transcription(uploaded_file, file_index: int, file_digest: str,
                          audio_info: Dict, client, transcription_processor):
     """Transkripsiyon işlemini yönetir"""
     
-    # Processing kontrolü
-    processing_key = f"processing_{file_index}"
+    # Processing kontrolü - aynı içerik iki kez yüklense de tek işlem
+    processing_key = f"processing_{file_digest}"
     
     if st.session_state.get(processing_key, False):
         st.warning(f"⏳ {uploaded_file.name} işleniyor...")
@@ -668,14 +790,18 @@ def _handle_transcription(uploaded_file, file_index: int, file_bytes: bytes,
                 use_container_width=True):
         
         st.session_state[processing_key] = True
-        _perform_transcription(uploaded_file, file_index, file_bytes, audio_info, client, transcription_processor)
+        _perform_transcription(uploaded_file, file_index, file_digest, audio_info,
+                               client, transcription_processor)
 
 
-def _perform_transcription(uploaded_file, file_index: int, file_bytes: bytes,
+def _perform_transcription(uploaded_file, file_index: int, file_digest: str,
                           audio_info: Dict, client, transcription_processor):
     """Gerçek transkripsiyon işlemi"""
     
     try:
+        # Dosya içeriğinin tek referansı bu frame'dedir; DB kaydından sonra bırakılır
+        file_bytes = uploaded_file.getvalue()
+        
         # Sidebar'dan ayarları al
         language_code = st.session_state.get('selected_language_code', None)
         response_format = st.session_state.get('response_format', 'text')
@@ -689,9 +815,17 @@ def _perform_transcription(uploaded_file, file_index: int, file_bytes: bytes,
             progress_bar = st.progress(0)
             status_text = st.empty()
             
+            # Son gönderilen yüzde ve zaman - aynı yüzdeyi 100 ms içinde tekrar gönderme
+            last_update = [-1, 0.0]
+            
             def progress_callback(message: str, percent: float):
-                progress_bar.progress(percent / 100.0)
-                status_text.info(f"🔄 {message}")
+                pct = int(percent)
+                now = time.monotonic()
+                if pct != last_update[0] or now - last_update[1] > 0.1:
+                    progress_bar.progress(pct / 100.0)
+                    status_text.info(f"🔄 {message}")
+                    last_update[0] = pct
+                    last_update[1] = now
             
             # Transkripsiyon
             status_text.info("🎵 Transkripsiyon başlıyor...")
@@ -742,8 +876,11 @@ def _perform_transcription(uploaded_file, file_index: int, file_bytes: bytes,
                 language_code or 'auto',
                 response_format,
                 transcript_text,
-                ai_analysis or {}
+                ai_analysis or {},
+                file_hash=file_digest
             )
+            # Sonuç ekranı çizilmeden önce ses byte'larını serbest bırak
+            del file_bytes
             
             # Tamamlandı
             progress_bar.progress(1.0)
@@ -757,6 +894,8 @@ def _perform_transcription(uploaded_file, file_index: int, file_bytes: bytes,
                     'completed_at': datetime.now().strftime("%H:%M:%S"),
                     'has_ai_analysis': bool(ai_analysis)
                 }
+                # ID'ler ayrıca listeye eklenir - okuyanlar session state'i taramaz
+                st.session_state.setdefault('_completed_registry', []).append(transcription_id)
             
             # Sonuçları göster
             if transcription_id:
@@ -770,22 +909,114 @@ def _perform_transcription(uploaded_file, file_index: int, file_bytes: bytes,
     
     finally:
         # Processing flagini temizle
-        if f"processing_{file_index}" in st.session_state:
-            del st.session_state[f"processing_{file_index}"]
+        if f"processing_{file_digest}" in st.session_state:
+            del st.session_state[f"processing_{file_digest}"]
         
         # Bellek temizliği
         MemoryManager.smart_cleanup_after_processing()
 
 
+def _compute_text_stats(text: str, stopwords=_TURKISH_STOPWORDS) -> Dict[str, Any]:
+    """Metni tek geçişte tarayarak kelime, cümle, paragraf ve frekans istatistiklerini çıkarır"""
+    
+    word_count = 0
+    sentence_count = 0
+    paragraph_count = 0
+    total_word_length = 0
+    short_words = 0
+    medium_words = 0
+    long_words = 0
+    in_sentence = False
+    in_paragraph = False
+    candidate_words = []
+    
+    # Metin tek geçişte taranır; küçük harf dönüşümü sadece sayılan kelimelere
+    # uygulanır (Türkçe 'İ'.lower() birleşik nokta ürettiği için tüm metne değil)
+    for match in _TOKEN_RE.finditer(text):
+        word = match.group(1)
+        if word is not None:
+            word_count += 1
+            in_sentence = in_paragraph = True
+            
+            length = len(word)
+            total_word_length += length
+            if length <= 4:
+                short_words += 1
+            elif length <= 6:
+                medium_words += 1
+            else:
+                long_words += 1
+            
+            if length > 2:
+                candidate_words.append(word.lower())
+        elif match.group(2) is not None:
+            if in_sentence:
+                sentence_count += 1
+                in_sentence = False
+        elif in_paragraph:
+            paragraph_count += 1
+            in_paragraph = False
+    
+    # Noktayla bitmeyen son cümle / paragraf
+    if in_sentence:
+        sentence_count += 1
+    if in_paragraph:
+        paragraph_count += 1
+    
+    # Stopword filtresi ve sayım C seviyesinde: frozenset.__contains__ + Counter
+    word_counter = Counter(filterfalse(stopwords.__contains__, candidate_words))
+    
+    return {
+        'word_count': word_count,
+        'sentence_count': sentence_count,
+        'paragraph_count': paragraph_count,
+        'average_word_length': total_word_length / word_count if word_count else 0,
+        'short_words': short_words,
+        'medium_words': medium_words,
+        'long_words': long_words,
+        'word_counter': word_counter
+    }
+
+
+def _most_common_words(word_counter: Counter, n: int = 10, numpy_threshold: int = 5000):
+    """En sık n kelimeyi döndürür - büyük kelime dağarcığında numpy argpartition ile O(N) seçim"""
+    
+    if len(word_counter) <= numpy_threshold:
+        return word_counter.most_common(n)
+    
+    words = list(word_counter)
+    counts = np.fromiter(word_counter.values(), dtype=np.int64, count=len(words))
+    top_idx = np.argpartition(counts, -n)[-n:]
+    top_idx = top_idx[np.argsort(-counts[top_idx], kind='stable')]
+    return [(words[i], int(counts[i])) for i in top_idx]
+
+
+def _parse_emotion_json(emotion_text: str) -> Optional[Dict]:
+    """Duygu analizi JSON formatındaysa parse eder, değilse None döndürür"""
+    
+    if not _JSON_OBJECT_START_RE.match(emotion_text):
+        return None
+    
+    try:
+        if orjson is not None:
+            emotion_data = orjson.loads(emotion_text)
+        else:
+            emotion_data = json.loads(emotion_text)
+    except ValueError:  # orjson.JSONDecodeError da ValueError alt sınıfı
+        return None
+    
+    return emotion_data if isinstance(emotion_data, dict) else None
+
+
 def _enhance_ai_analysis(ai_analysis: Dict, transcript_text: str, audio_info: Dict) -> Dict:
     """AI analiz sonucunu ek verilerle zenginleştir"""
     
     try:
-        # Temel metin istatistikleri ekle
-        words = transcript_text.split()
-        word_count = len(words)
+        # Temel metin istatistikleri - tek geçişte
+        stats = _compute_text_stats(transcript_text)
+        word_count = stats['word_count']
         char_count = len(transcript_text)
-        sentences = len([s for s in transcript_text.split('.') if s.strip()])
+        sentences = stats['sentence_count']
         
         # Ses verisi ile bağlantı kur
         duration_seconds = audio_info.get('duration', 0)
@@ -800,9 +1031,14 @@ def _enhance_ai_analysis(ai_analysis: Dict, transcript_text: str, audio_info: Di
                 'word_count': word_count,
                 'character_count': char_count,
                 'sentence_count': sentences,
+                'paragraph_count': stats['paragraph_count'],
                 'average_words_per_sentence': word_count / max(sentences, 1),
                 'words_per_minute': words_per_minute,
-                'reading_time_minutes': word_count / 200  # Ortalama okuma hızı
+                'reading_time_minutes': word_count * 0.005,  # Ortalama okuma hızı (200 kel/dk)
+                'average_word_length': stats['average_word_length'],
+                'short_words': stats['short_words'],
+                'medium_words': stats['medium_words'],
+                'long_words': stats['long_words']
             },
             'audio_metadata': {
                 'duration_seconds': duration_seconds,
@@ -822,29 +1058,13 @@ def _enhance_ai_analysis(ai_analysis: Dict, transcript_text: str, audio_info: Di
         
         # Kelime frekansı analizi
         if word_count > 10:
-            # Temel Türkçe stopwords
-            stopwords = {
-                've', 'bir', 'bu', 'da', 'de', 'ile', 'için', 'olan', 'olarak', 
-                'var', 'yok', 'gibi', 'kadar', 'daha', 'çok', 'az', 'ya', 'ya da', 
-                'ama', 'fakat', 'ancak', 'lakin', 'hem', 'ise', 'eğer', 'şayet',
-                'ki', 'mi', 'mı', 'mu', 'mü', 'ne', 'nasıl', 'neden', 'niçin',
-                'ben', 'sen', 'o', 'biz', 'siz', 'onlar', 'bu', 'şu', 'o'
-            }
-            
-            # Kelimeleri temizle ve filtrele
-            clean_words = []
-            for word in words:
-                clean_word = word.lower().strip('.,!?;:"()[]{}')
-                if len(clean_word) > 2 and clean_word not in stopwords:
-                    clean_words.append(clean_word)
-            
-            # En sık kullanılan kelimeleri bul
-            word_freq = Counter(clean_words).most_common(10)
+            word_counter = stats['word_counter']
+            filtered_total = sum(word_counter.values())
             
             ai_analysis['word_frequency'] = {
-                'most_common_words': word_freq,
-                'unique_word_count': len(set(clean_words)),
-                'vocabulary_richness': len(set(clean_words)) / max(len(clean_words), 1)
+                'most_common_words': _most_common_words(word_counter, 10),
+                'unique_word_count': len(word_counter),
+                'vocabulary_richness': len(word_counter) / max(filtered_total, 1)
             }
     
     except Exception as e:
@@ -863,11 +1083,7 @@ def _display_results(uploaded_file, transcript_text: str, ai_analysis: Optional[
     st.markdown(f"### 📝 {uploaded_file.name} - {get_text('transcription_result_header')}")
     
     with st.container():
-        st.markdown(f"""
-        <div style="background: #1a1d23; padding: 1.5rem; border-radius: 10px; margin: 1rem 0; border-left: 4px solid #4a90e2;">
-            <p style="line-height: 1.6; color: #fafafa; margin: 0;">{transcript_text}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_TRANSCRIPT_CARD_TEMPLATE.format(text=transcript_text), unsafe_allow_html=True)
     
     # AI Analiz sonuçları (eğer varsa) - DETAYLI VERSIYON
     if ai_analysis:
@@ -885,7 +1101,8 @@ def _display_results(uploaded_file, transcript_text: str, ai_analysis: Optional[
 def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text: str):
     """DETAYLI AI ANALİZ SONUÇLARINI GÖSTERIR - TÜM ÖZELLİKLERİ KULLANIR"""
     
-    if not ai_analysis:
+    # Boş veride sekmeler hiç kurulmaz
+    if not ai_analysis or not transcript_text:
         st.warning("⚠️ AI analiz verisi bulunamadı")
         return
     
@@ -893,13 +1110,14 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
     st.markdown("#### ⚡ Hızlı Bakış")
     quick_col1, quick_col2, quick_col3, quick_col4, quick_col5 = st.columns(5)
     
-    # Temel metrikleri al
-    text_stats = ai_analysis.get('text_statistics', {})
-    audio_meta = ai_analysis.get('audio_metadata', {})
-    content_quality = ai_analysis.get('content_quality', {})
+    # Tüm alanları tek seferde al - sekmeler yerel değişkenleri kullanır
+    (text_stats, audio_meta, content_quality, word_freq_data, keywords,
+     emotion_analysis, sentiment_score, summary, topics, content_category,
+     language_detected) = [ai_analysis.get(key, default) for key, default in _AI_ANALYSIS_FIELDS]
+    text_stats = text_stats or _compute_text_stats(transcript_text)
     
     with quick_col1:
-        word_count = text_stats.get('word_count', len(transcript_text.split()))
+        word_count = text_stats.get('word_count', 0)
         st.metric("📝 Kelime", f"{word_count:,}")
     
     with quick_col2:
@@ -915,17 +1133,13 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
     
     with quick_col4:
         # Ana duyguyu çıkar
-        emotion = ai_analysis.get('emotion_analysis', 'Bilinmiyor')
-        if isinstance(emotion, str) and emotion != "Duygusal analiz yapılamadı":
-            try:
-                import json
-                if emotion.strip().startswith('{'):
-                    emotion_data = json.loads(emotion)
-                    main_emotion = emotion_data.get('Ana Duygu', 'Bilinmiyor')
-                else:
-                    main_emotion = emotion.split()[0] if emotion else 'Bilinmiyor'
-            except:
-                main_emotion = 'Bilinmiyor'
+        if emotion_analysis and isinstance(emotion_analysis, str) and emotion_analysis != "Duygusal analiz yapılamadı":
+            emotion_data = _parse_emotion_json(emotion_analysis)
+            if emotion_data is not None:
+                main_emotion = emotion_data.get('Ana Duygu', 'Bilinmiyor')
+            else:
+                first_word = emotion_analysis.split(None, 1)
+                main_emotion = first_word[0] if first_word else 'Bilinmiyor'
         else:
             main_emotion = 'Bilinmiyor'
         
@@ -959,16 +1173,18 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
         with stat_col1:
             st.markdown("**📝 Metin Yapısı**")
             char_count = text_stats.get('character_count', len(transcript_text))
-            sentence_count = text_stats.get('sentence_count', len([s for s in transcript_text.split('.') if s.strip()]))
+            sentence_count = text_stats.get('sentence_count', 0)
+            paragraph_count = text_stats.get('paragraph_count', 0)
             avg_words_per_sentence = text_stats.get('average_words_per_sentence', 0)
             
             st.write(f"• **Karakter Sayısı:** {char_count:,}")
             st.write(f"• **Cümle Sayısı:** {sentence_count:,}")
+            st.write(f"• **Paragraf Sayısı:** {paragraph_count:,}")
             st.write(f"• **Ortalama Kelime/Cümle:** {avg_words_per_sentence:.1f}")
             
         with stat_col2:
             st.markdown("**⏱️ Zaman Analizi**")
-            reading_time = text_stats.get('reading_time_minutes', word_count / 200)
+            reading_time = text_stats.get('reading_time_minutes', word_count * 0.005)
             
             st.write(f"• **Okuma Süresi:** {reading_time:.1f} dakika")
             st.write(f"• **Konuşma Süresi:** {duration_min:.1f} dakika")
@@ -981,7 +1197,6 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
             speech_rate = content_quality.get('speech_rate', 'Bilinmiyor')
             
             # Kelime zenginliği
-            word_freq_data = ai_analysis.get('word_frequency', {})
             vocab_richness = word_freq_data.get('vocabulary_richness', 0)
             unique_words = word_freq_data.get('unique_word_count', 0)
             
@@ -994,52 +1209,32 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
         st.markdown("#### 🏷️ Anahtar Kelimeler ve Kelime Analizi")
         
         # AI'dan gelen anahtar kelimeler
-        keywords = ai_analysis.get('keywords', [])
         if keywords:
             st.markdown("**🎯 AI Tespit Ettiği Anahtar Kelimeler**")
             
-            # Anahtar kelimeleri güzel chip'ler halinde göster - tek seferde
-            if keywords:
-                st.markdown("**🎯 AI Tespit Ettiği Anahtar Kelimeler**")
-                
-                # Kolayca okunabilir chip gösterimi
-                keywords_html = '<div style="background: #1a1d23; padding: 1rem; border-radius: 10px; border-left: 4px solid #4a90e2;">'
-                
-                for i, keyword in enumerate(keywords[:15]):  # İlk 15 anahtar kelime
-                    # Renkli gradient'ler
-                    colors = [
-                        'linear-gradient(135deg, #4a90e2, #667eea)',
-                        'linear-gradient(135deg, #10b981, #34d399)', 
-                        'linear-gradient(135deg, #f59e0b, #fbbf24)',
-                        'linear-gradient(135deg, #ef4444, #f87171)',
-                        'linear-gradient(135deg, #8b5cf6, #a78bfa)',
-                        'linear-gradient(135deg, #f97316, #fb923c)',
-                        'linear-gradient(135deg, #06b6d4, #22d3ee)',
-                        'linear-gradient(135deg, #84cc16, #a3e635)'
-                    ]
-                    color = colors[i % len(colors)]
-                    
-                    keywords_html += f'''
-                    <span style="display: inline-block; background: {color}; 
-                                 color: white; padding: 6px 12px; margin: 3px; 
-                                 border-radius: 15px; font-size: 0.85rem; font-weight: 500;
-                                 box-shadow: 0 2px 4px rgba(0,0,0,0.2);">
-                        {keyword}
-                    </span>'''
-                
-                keywords_html += '</div>'
-                
-                st.markdown(keywords_html, unsafe_allow_html=True)
-                
-                # Fazla kelime varsa bilgi göster
-                if len(keywords) > 15:
-                    st.info(f"💡 Toplam {len(keywords)} anahtar kelime bulundu. İlk 15 tanesi gösteriliyor.")
-            else:
-                st.warning("⚠️ Anahtar kelime bulunamadı")
+            # Anahtar kelimeleri chip'ler halinde göster - tek seferde, join ile
+            keywords_html = ''.join(
+                _KEYWORD_CHIP_TEMPLATE.format(
+                    color=_KEYWORD_CHIP_COLORS[i % len(_KEYWORD_CHIP_COLORS)],
+                    keyword=keyword
+                )
+                for i, keyword in enumerate(keywords[:15])  # İlk 15 anahtar kelime
+            )
+            
+            st.markdown(
+                '<div style="background: #1a1d23; padding: 1rem; border-radius: 10px; border-left: 4px solid #4a90e2;">'
+                f'{keywords_html}</div>',
+                unsafe_allow_html=True
+            )
+            
+            # Fazla kelime varsa bilgi göster
+            if len(keywords) > 15:
+                st.info(f"💡 Toplam {len(keywords)} anahtar kelime bulundu. İlk 15 tanesi gösteriliyor.")
+        else:
+            st.warning("⚠️ Anahtar kelime bulunamadı")
         
         # Kelime frekansı analizi
         st.markdown("---")
-        word_freq_data = ai_analysis.get('word_frequency', {})
         most_common = word_freq_data.get('most_common_words', [])
         
         if most_common:
@@ -1068,13 +1263,11 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
         # DUYGU ANALİZİ
         st.markdown("#### 💭 Detaylı Duygu Analizi")
         
-        emotion_analysis = ai_analysis.get('emotion_analysis', '')
         if emotion_analysis and emotion_analysis != "Duygusal analiz yapılamadı":
             try:
                 # JSON formatında geliyorsa parse et
-                if emotion_analysis.strip().startswith('{'):
-                    import json
-                    emotion_data = json.loads(emotion_analysis)
+                emotion_data = _parse_emotion_json(emotion_analysis)
+                if emotion_data is not None:
                     
                     # Ana duygu ve detaylar
                     main_emotion = emotion_data.get('Ana Duygu', 'Bilinmiyor')
@@ -1083,20 +1276,17 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
                     
                     # Görsel duygu gösterimi
                     emotion_color = _get_emotion_color(main_emotion)
-                    confidence_num = int(confidence.replace('%', '')) if '%' in confidence else 0
+                    confidence_match = _PERCENT_RE.match(str(confidence))
+                    confidence_num = int(confidence_match.group(1)) if confidence_match else 0
                     
                     emo_col1, emo_col2 = st.columns([2, 1])
                     
                     with emo_col1:
-                        st.markdown(f"""
-                        <div style="background: {emotion_color}; padding: 2rem; border-radius: 15px; text-align: center; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                            <h2 style="color: white; margin-bottom: 1rem;">😊 {main_emotion}</h2>
-                            <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 10px;">
-                                <p style="color: white; margin: 0; font-size: 1.1rem;"><strong>Güven Oranı:</strong> {confidence}</p>
-                                <p style="color: white; margin: 0.5rem 0 0 0; font-size: 1.1rem;"><strong>Genel Ton:</strong> {tone}</p>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(
+                            _EMOTION_CARD_TEMPLATE.format(color=emotion_color, emotion=main_emotion,
+                                                          confidence=confidence, tone=tone),
+                            unsafe_allow_html=True
+                        )
                     
                     with emo_col2:
                         st.markdown("**🎯 Duygu Metrikleri**")
@@ -1116,18 +1306,12 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
                         st.write(f"**Kesinlik:** {certainty}")
                         
                         # Sentiment skoru varsa göster
-                        sentiment_score = ai_analysis.get('sentiment_score', None)
                         if sentiment_score is not None:
                             st.metric("📈 Sentiment Skoru", f"{sentiment_score:.2f}")
                 
                 else:
                     # Düz metin formatında
-                    st.markdown(f"""
-                    <div style="background: #1a1d23; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #f59e0b;">
-                        <h4 style="color: #f59e0b; margin-bottom: 1rem;">💭 Duygu Analizi</h4>
-                        <p style="line-height: 1.6; color: #fafafa; margin: 0;">{emotion_analysis}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(_EMOTION_TEXT_TEMPLATE.format(text=emotion_analysis), unsafe_allow_html=True)
             except Exception as e:
                 st.error(f"Duygu analizi parse hatası: {e}")
                 st.text(emotion_analysis)
@@ -1139,35 +1323,21 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
         st.markdown("#### 📋 İçerik Özeti ve Konu Analizi")
         
         # Özet gösterimi
-        summary = ai_analysis.get('summary', 'Özet bulunamadı')
-        st.markdown(f"""
-        <div style="background: #1a1d23; padding: 1.5rem; border-radius: 10px; border-left: 4px solid #10b981;">
-            <h4 style="color: #10b981; margin-bottom: 1rem;">📄 İçerik Özeti</h4>
-            <p style="line-height: 1.8; color: #fafafa; margin: 0; font-size: 1.1rem;">{summary}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_SUMMARY_CARD_TEMPLATE.format(summary=summary), unsafe_allow_html=True)
         
         # Ana konular
-        topics = ai_analysis.get('topics', [])
         if topics:
             st.markdown("#### 🎯 Ana Konular")
             
-            # Konuları grid halinde göster
-            topic_cols = st.columns(min(len(topics), 3))
-            for i, topic in enumerate(topics):
-                with topic_cols[i % 3]:
-                    st.markdown(f"""
-                    <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
-                               padding: 1.5rem; border-radius: 10px; text-align: center; 
-                               margin: 0.5rem 0; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-                        <h4 style="color: white; margin: 0;">{topic}</h4>
-                    </div>
-                    """, unsafe_allow_html=True)
+            # Konuları grid halinde göster - tek HTML emisyonu
+            topics_html = ''.join(_TOPIC_CARD_TEMPLATE.format(topic=topic) for topic in topics)
+            st.markdown(
+                f'<div style="display: grid; grid-template-columns: repeat({min(len(topics), 3)}, 1fr); '
+                f'gap: 0 1rem;">{topics_html}</div>',
+                unsafe_allow_html=True
+            )
         
         # İçerik kategorisi
-        content_category = ai_analysis.get('content_category', 'Bilinmiyor')
-        language_detected = ai_analysis.get('language_detected', 'Bilinmiyor')
-        
         cat_col1, cat_col2 = st.columns(2)
         with cat_col1:
             st.info(f"🏷️ **İçerik Kategorisi:** {content_category}")
@@ -1236,8 +1406,6 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
         # KELİME ANALİZİ VE İSTATİSTİKLER
         st.markdown("#### 📈 Gelişmiş Kelime Analizi")
         
-        word_freq_data = ai_analysis.get('word_frequency', {})
-        
         if word_freq_data:
             vocab_richness = word_freq_data.get('vocabulary_richness', 0)
             unique_words = word_freq_data.get('unique_word_count', 0)
@@ -1272,11 +1440,12 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
                         percentage = (count / word_count) * 100 if word_count > 0 else 0
                         st.write(f"{i}. **{word}** - {count}x ({percentage:.1f}%)")
         
-        # Kelime uzunluğu analizi
-        words = transcript_text.split()
-        if words:
-            avg_word_length = sum(len(word.strip('.,!?;:"()[]{}')) for word in words) / len(words)
-            long_words = len([word for word in words if len(word.strip('.,!?;:"()[]{}')) > 6])
+        # Kelime uzunluğu analizi - tek geçişte hesaplanan istatistiklerden
+        if 'average_word_length' not in text_stats:
+            text_stats = _compute_text_stats(transcript_text)
+        if word_count:
+            avg_word_length = text_stats['average_word_length']
+            long_words = text_stats['long_words']
             
             length_col1, length_col2 = st.columns(2)
             
@@ -1288,8 +1457,8 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
             with length_col2:
                 # Basit kelime uzunluğu dağılımı
                 st.markdown("**📊 Uzunluk Dağılımı**")
-                short_words = len([w for w in words if len(w.strip('.,!?;:"()[]{}')) <= 4])
-                medium_words = len([w for w in words if 5 <= len(w.strip('.,!?;:"()[]{}')) <= 6])
+                short_words = text_stats['short_words']
+                medium_words = text_stats['medium_words']
                 
                 st.write(f"• **Kısa (≤4 harf):** {short_words:,}")
                 st.write(f"• **Orta (5-6 harf):** {medium_words:,}")
@@ -1302,8 +1471,6 @@ def _display_detailed_ai_analysis(ai_analysis: Dict[str, Any], transcript_text:
 
 def _clean_for_json(obj):
     """Nesneyi JSON serializable hale getirir (numpy array'leri vs. temizler)"""
-    import numpy as np
-    
     if isinstance(obj, dict):
         return {key: _clean_for_json(value) for key, value in obj.items()}
     elif isinstance(obj, list):
@@ -1424,19 +1591,7 @@ def _display_export_options(uploaded_file, transcript_text: str, ai_analysis: Op
 
 def _get_emotion_color(emotion: str) -> str:
     """Duyguya göre renk döndürür"""
-    emotion_colors = {
-        'Pozitif': 'linear-gradient(135deg, #10b981, #047857)',
-        'Negatif': 'linear-gradient(135deg, #ef4444, #dc2626)',
-        'Nötr': 'linear-gradient(135deg, #6b7280, #4b5563)',
-        'Mutlu': 'linear-gradient(135deg, #f59e0b, #d97706)',
-        'Üzgün': 'linear-gradient(135deg, #3b82f6, #1d4ed8)',
-        'Öfkeli': 'linear-gradient(135deg, #ef4444, #991b1b)',
-        'Heyecanlı': 'linear-gradient(135deg, #8b5cf6, #7c3aed)',
-        'Sakin': 'linear-gradient(135deg, #06b6d4, #0891b2)',
-        'Gergin': 'linear-gradient(135deg, #f97316, #ea580c)',
-        'Rahat': 'linear-gradient(135deg, #22c55e, #16a34a)',
-    }
-    return emotion_colors.get(emotion, 'linear-gradient(135deg, #6b7280, #4b5563)')
+    return _EMOTION_COLORS.get(emotion, _DEFAULT_EMOTION_COLOR)
 
 
 def _get_sentiment_color(score: float) -> str:
@@ -11,6 +11,7 @@ import time
 import json
 import tempfile
 import threading
+import atexit
 import logging
 import hashlib
 import numpy as np
@@ -20,12 +21,20 @@ import subprocess
 import asyncio
 import shutil
 import socket
-from typing import Optional, Dict, Any, Tuple, List, Callable
-from concurrent.futures import ThreadPoolExecutor
-from collections import defaultdict
+import mmap
+from urllib.parse import urlparse
+from typing import Optional, Dict, Any, Tuple, List, Callable, Iterator, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from collections import defaultdict, deque
+from functools import lru_cache
 import re
 
 import streamlit as st
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
+
 try:
     from openai import OpenAI  # type: ignore
 except ImportError:
@@ -52,6 +61,28 @@ try:
 except ImportError:
     go = None
 
+try:
+    import tiktoken  # type: ignore
+except ImportError:
+    tiktoken = None
+
+# Alternatif indirme yöneticileri için - yoksa ilgili indirici hata mesajı döndürür
+try:
+    import requests  # type: ignore
+except ImportError:
+    requests = None
+
+try:
+    import httpx  # type: ignore
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    _HTTP2_AVAILABLE = True  # httpx HTTP/2 desteği h2 paketini gerektirir
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 # Optional imports with error handling - import edilen modüller runtime'da kontrol edilecek
 try:
     import psutil  # type: ignore
@@ -64,6 +95,9 @@ from config import ADVANCED_CONFIG, SPEECH_SPEED_CATEGORIES
 # Logger setup
 logger = logging.getLogger(__name__)
 
+# gc.freeze süreç başına bir kez yapılır (Streamlit script'i her etkileşimde yeniden çalıştırır)
+_GC_CONFIGURED = False
+
 # =============================================
 # 🧠 MEMORY MANAGEMENT CLASS
 # =============================================
@@ -72,56 +106,63 @@ class MemoryManager:
     """Bellek yönetimi için sınıf - iyileştirilmiş versiyon"""
     
     @staticmethod
-    def cleanup_session_state(prefixes: Optional[List[str]] = None, force_cleanup: bool = False):
-        """Session state temizleme - iyileştirilmiş versiyon"""
+    def cleanup_session_state(prefixes: Optional[Tuple[str, ...]] = None, force_cleanup: bool = False):
+        """Session state temizleme - tek geçişte aday toplama"""
         if prefixes is None:
-            prefixes = ["processed_", "result_", "file_", "audio_", "chunk_", "temp_", "file_data_"]
+            prefixes = ("processed_", "result_", "file_", "audio_", "chunk_", "temp_", "file_data_")
+        else:
+            prefixes = tuple(prefixes)
         
         cleaned_count = 0
         total_size_freed = 0
         
-        # Tüm file_data_ anahtarlarını bul ve boyutlarına göre sırala
-        file_data_keys = []
-        for key in st.session_state.keys():
-            if isinstance(key, str) and key.startswith("file_data_"):
-                try:
-                    value = st.session_state[key]
-                    size = sys.getsizeof(value)
-                    # Eğer bytes data varsa onu da hesapla
-                    if isinstance(value, dict) and 'file_bytes' in value:
-                        size += len(value['file_bytes'])
-                    file_data_keys.append((key, size))
-                except Exception:
-                    file_data_keys.append((key, 0))
-        
-        # Boyuta göre sırala (büyükten küçüğe)
-        file_data_keys.sort(key=lambda x: x[1], reverse=True)
-        
-        # Force cleanup veya 5'ten fazla file_data varsa temizle
-        if force_cleanup or len(file_data_keys) > 5:
-            # En büyük dosyaları temizle
-            keys_to_clean = file_data_keys[:max(len(file_data_keys) - 3, 1)]
-            for key, size in keys_to_clean:
-                if key in st.session_state:
-                    # Geçici dosyayı da temizle
-                    value = st.session_state[key]
+        # Tek geçiş: file_data_ öğeleri boyutlarıyla, prefix eşleşenler doğrudan aday
+        file_data_items = []
+        prefix_items = []
+        for key, value in st.session_state.items():
+            if not isinstance(key, str):
+                continue
+            is_file_data = key.startswith("file_data_")
+            if not is_file_data and not key.startswith(prefixes):
+                continue
+            try:
+                size = sys.getsizeof(value)
+                # Eğer bytes data varsa onu da hesapla
+                if is_file_data and isinstance(value, dict) and 'file_bytes' in value:
+                    size += len(value['file_bytes'])
+            except Exception:
+                size = 0
+            if is_file_data:
+                file_data_items.append((key, value, size))
+            else:
+                prefix_items.append((key, value, size))
+        
+        # Silinecekler: force veya 5'ten fazla file_data varsa en büyükler + prefix eşleşen tüm anahtarlar
+        to_delete = []
+        if file_data_items:
+            file_data_items.sort(key=lambda item: item[2], reverse=True)
+            if force_cleanup or len(file_data_items) > 5:
+                # En büyük dosyaları temizle - geçici dosyalarıyla birlikte
+                keep_from = max(len(file_data_items) - 3, 1)
+                for key, value, size in file_data_items[:keep_from]:
                     if isinstance(value, dict) and 'file_path' in value:
                         TempFileManager.cleanup_temp_file(value['file_path'])
-                    
-                    del st.session_state[key]
-                    cleaned_count += 1
-                    total_size_freed += size
+                    to_delete.append((key, size))
+                remaining = file_data_items[keep_from:]
+            else:
+                remaining = file_data_items
+            # Kalan file_data_ anahtarları prefix listesine uyuyorsa onlar da gider
+            to_delete.extend((key, size) for key, _, size in remaining if key.startswith(prefixes))
+        to_delete.extend((key, size) for key, _, size in prefix_items)
         
-        # Diğer prefix'leri temizle
-        for key in list(st.session_state.keys()):
-            if isinstance(key, str) and any(key.startswith(prefix) for prefix in prefixes):
-                try:
-                    size = sys.getsizeof(st.session_state[key])
-                    del st.session_state[key]
-                    cleaned_count += 1
-                    total_size_freed += size
-                except Exception:
-                    continue
+        # Silme işlemi iterasyon bittikten sonra toplu yapılır
+        for key, size in to_delete:
+            try:
+                del st.session_state[key]
+                cleaned_count += 1
+                total_size_freed += size
+            except Exception:
+                continue
         
         # Geçici dosyaları da temizle
         temp_cleaned = TempFileManager.cleanup_session_temp_files()
@@ -134,6 +175,64 @@ class MemoryManager:
                    f"{temp_cleaned} temp files cleaned")
         return cleaned_count
     
+    # Bu boyutun üzerindeki öğeler "büyük" sayılır ve otomatik temizlenir
+    LARGE_ITEM_BYTES = 5 * 1024 * 1024
+    
+    @staticmethod
+    def _estimate_item_size(value: Any) -> int:
+        """Session öğesinin yaklaşık boyutu"""
+        if isinstance(value, bytes):
+            return len(value)
+        if isinstance(value, str):
+            return len(value.encode('utf-8'))
+        if isinstance(value, dict) and 'file_bytes' in value:
+            # file_bytes içeren dict'ler için özel işlem
+            return len(value['file_bytes']) + sys.getsizeof(value)
+        return sys.getsizeof(value)
+    
+    @staticmethod
+    def set_session(key: str, value: Any) -> Any:
+        """Session state'e yazar ve temizlik takibini günceller
+        
+        Session 'kirli' işaretlenir; değer büyükse anahtarı büyük öğeler
+        kümesine eklenir. auto_cleanup_large_files değişiklik yoksa tüm
+        session'ı taramak yerine yalnızca bu kümeye bakar.
+        """
+        st.session_state[key] = value
+        st.session_state['_session_dirty'] = True
+        large_keys = st.session_state.setdefault('_large_keys', set())
+        if MemoryManager._estimate_item_size(value) > MemoryManager.LARGE_ITEM_BYTES:
+            large_keys.add(key)
+        else:
+            large_keys.discard(key)
+        return value
+    
+    @staticmethod
+    def configure_gc() -> bool:
+        """Başlangıçta yüklenen uzun ömürlü nesneleri GC taramasından çıkarır
+        
+        gc.freeze sonrası modüller, client ve config nesneleri kalıcı nesil
+        sayılır; sonraki toplamalar yalnızca yeni oluşan nesneleri tarar.
+        """
+        global _GC_CONFIGURED
+        if _GC_CONFIGURED:
+            return False
+        gc.collect()
+        gc.freeze()
+        _GC_CONFIGURED = True
+        logger.info(f"GC frozen with {gc.get_freeze_count()} long-lived objects")
+        return True
+    
+    @staticmethod
+    def _statm_rss_mb() -> float:
+        """/proc/self/statm üzerinden RSS (MB) - okunamazsa 0"""
+        try:
+            with open('/proc/self/statm') as f:
+                resident_pages = int(f.read().split()[1])
+            return resident_pages * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+        except Exception:
+            return 0.0
+    
     @staticmethod
     def get_memory_usage():
         """Mevcut bellek kullanımını al"""
@@ -147,9 +246,9 @@ class MemoryManager:
                     'percent': process.memory_percent()
                 }
             else:
-                # psutil kullanılamıyorsa sys modülünü kullan
+                # psutil kullanılamıyorsa Linux'ta /proc/self/statm'dan gerçek RSS okunur
                 return {
-                    'rss': sys.getsizeof(globals()) / 1024 / 1024,
+                    'rss': MemoryManager._statm_rss_mb(),
                     'vms': 0,
                     'percent': 0
                 }
@@ -158,26 +257,33 @@ class MemoryManager:
     
     @staticmethod
     def auto_cleanup_large_files(force: bool = False):
-        """Büyük dosyaları otomatik temizle - her işlem sonrası çağrılır"""
+        """Büyük dosyaları otomatik temizle - her işlem sonrası çağrılır
+        
+        Session'ın ilk taramasından sonra set_session ile değişiklik
+        yapılmadıysa tüm session yerine yalnızca bilinen büyük anahtarlar
+        kontrol edilir; bilinen büyük anahtar da yoksa tarama atlanır.
+        """
         session_size = 0
         large_items = []
         
-        for key, value in list(st.session_state.items()):
+        full_scan = (force or st.session_state.get('_session_dirty', False)
+                     or '_large_keys' not in st.session_state)
+        if full_scan:
+            candidates = list(st.session_state.items())
+        else:
+            tracked = st.session_state['_large_keys']
+            if not tracked:
+                return 0
+            candidates = [(key, st.session_state[key]) for key in tracked
+                          if key in st.session_state]
+        
+        for key, value in candidates:
             try:
-                if isinstance(value, bytes):
-                    size = len(value)
-                elif isinstance(value, str):
-                    size = len(value.encode('utf-8'))
-                elif isinstance(value, dict) and 'file_bytes' in value:
-                    # file_bytes içeren dict'ler için özel işlem
-                    size = len(value['file_bytes']) + sys.getsizeof(value)
-                else:
-                    size = sys.getsizeof(value)
-                
+                size = MemoryManager._estimate_item_size(value)
                 session_size += size
                 
                 # 5MB'dan büyük veya force flag varsa temizle
-                if size > 5 * 1024 * 1024 or force:
+                if size > MemoryManager.LARGE_ITEM_BYTES or force:
                     large_items.append((key, size))
                     
             except Exception:
@@ -194,11 +300,15 @@ class MemoryManager:
                 del st.session_state[key]
                 logger.info(f"Removed large item {key} ({size/1024/1024:.1f}MB)")
         
+        # Tarama tamamlandı - silinemeyip hâlâ büyük kalan anahtarlar takipte kalır
+        st.session_state['_large_keys'] = {key for key, _ in large_items if key in st.session_state}
+        st.session_state['_session_dirty'] = False
+        
         # Garbage collection
         gc.collect()
         
         total_size_mb = session_size / 1024 / 1024
-        logger.info(f"Session total size: {total_size_mb:.1f}MB, "
+        logger.info(f"Session {'total' if full_scan else 'tracked'} size: {total_size_mb:.1f}MB, "
                    f"cleaned {len(large_items)} large items")
         
         return len(large_items)
@@ -221,16 +331,31 @@ class MemoryManager:
 # 📁 TEMPORARY FILE MANAGER
 # =============================================
 
+# Oturum başına oluşturulan geçici dosyalar - temizlikte session state taranmaz
+_SESSION_TEMP_FILES: Dict[str, set] = defaultdict(set)
+_SESSION_TEMP_FILES_LOCK = threading.Lock()
+
+def _current_session_id() -> Optional[str]:
+    """Script thread'indeysek Streamlit oturum kimliği; worker thread'lerde None"""
+    if get_script_run_ctx is None:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
 class TempFileManager:
     """Geçici dosya yönetimi"""
     
     @staticmethod
     def create_temp_file(file_bytes: bytes, suffix: str = "") -> Optional[str]:
-        """Güvenli geçici dosya oluştur"""
+        """Güvenli geçici dosya oluştur - script thread'inde oluşturulanlar oturuma kaydedilir"""
         try:
             with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
                 tmp_file.write(file_bytes)
                 temp_path = tmp_file.name
+            session_id = _current_session_id()
+            if session_id:
+                with _SESSION_TEMP_FILES_LOCK:
+                    _SESSION_TEMP_FILES[session_id].add(temp_path)
             return temp_path
         except Exception as e:
             logger.error(f"Temp file creation failed: {e}")
@@ -239,6 +364,10 @@ class TempFileManager:
     @staticmethod
     def cleanup_temp_file(file_path: Optional[str]) -> bool:
         """Geçici dosyayı temizle"""
+        session_id = _current_session_id()
+        if session_id and file_path:
+            with _SESSION_TEMP_FILES_LOCK:
+                _SESSION_TEMP_FILES.get(session_id, set()).discard(file_path)
         try:
             if file_path and os.path.exists(file_path):
                 os.unlink(file_path)
@@ -248,15 +377,46 @@ class TempFileManager:
             logger.warning(f"Temp file cleanup failed for {file_path}: {e}")
             return False
     
+    @staticmethod
+    def acquire_scratch(pool: Dict[int, str], suffix: str = "") -> Optional[str]:
+        """Çağıran thread'e ait, tekrar tekrar üzerine yazılacak geçici dosya yolunu döndürür"""
+        ident = threading.get_ident()
+        path = pool.get(ident)
+        if path is None:
+            path = TempFileManager.create_temp_file(b"", suffix)
+            if path:
+                pool[ident] = path  # Her thread kendi anahtarına yazar - kilit gerekmez
+        return path
+    
+    @staticmethod
+    def overwrite_scratch(path: str, data: bytes) -> bool:
+        """Scratch dosyanın içeriğini yeni veriyle değiştirir"""
+        try:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return True
+        except Exception as e:
+            logger.error(f"Scratch file write failed for {path}: {e}")
+            return False
+    
+    @staticmethod
+    def release_scratch(pool: Dict[int, str]) -> int:
+        """Havuzdaki tüm scratch dosyalarını siler"""
+        cleaned = sum(TempFileManager.cleanup_temp_file(path) for path in pool.values())
+        pool.clear()
+        return cleaned
+    
     @staticmethod
     def cleanup_session_temp_files() -> int:
-        """Session'daki tüm geçici dosyaları temizle"""
-        cleaned_count = 0
-        for key, value in list(st.session_state.items()):
-            if isinstance(value, dict) and 'file_path' in value:
-                if TempFileManager.cleanup_temp_file(value['file_path']):
-                    cleaned_count += 1
-        return cleaned_count
+        """Bu oturumda create_temp_file ile oluşturulup silinmemiş geçici dosyaları temizle"""
+        session_id = _current_session_id()
+        if not session_id:
+            return 0
+        with _SESSION_TEMP_FILES_LOCK:
+            temp_paths = _SESSION_TEMP_FILES.pop(session_id, None)
+        if not temp_paths:
+            return 0
+        return sum(TempFileManager.cleanup_temp_file(path) for path in temp_paths)
 
 # =============================================
 # 🔐 SECURITY MANAGER
@@ -265,7 +425,18 @@ class TempFileManager:
 class SecurityManager:
     """Güvenlik yönetimi sınıfı"""
     
+    ALLOWED_EXTENSIONS = frozenset({'.mp3', '.wav', '.m4a', '.mp4', '.flac', '.ogg'})
+    
+    # Magic number'lar uzunluklarına göre gruplanır: tek dilim + set araması
+    # 4 bayt: WAV (RIFF), FLAC, OGG | 3 bayt: MP3 (ID3), MP4/M4A (box boyutu)
+    _AUDIO_MAGIC_4 = frozenset({b'RIFF', b'fLaC', b'OggS'})
+    _AUDIO_MAGIC_3 = frozenset({b'ID3', b'\x00\x00\x00'})
+    
+    # Zararlı dosya adı karakterleri -> '_' (tek translate geçişi için)
+    _SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+    
     @staticmethod
+    @lru_cache(maxsize=16)
     def validate_api_key(api_key: str) -> bool:
         """API anahtarı format validation"""
         if not api_key:
@@ -296,39 +467,32 @@ class SecurityManager:
             return False, f"Dosya çok büyük: {len(file_bytes)/1024/1024:.1f}MB > 25MB"
         
         # Dosya uzantısı kontrolü
-        allowed_extensions = ['.mp3', '.wav', '.m4a', '.mp4', '.flac', '.ogg']
         file_ext = os.path.splitext(filename.lower())[1]
-        if file_ext not in allowed_extensions:
+        if file_ext not in SecurityManager.ALLOWED_EXTENSIONS:
             return False, f"Desteklenmeyen dosya türü: {file_ext}"
         
-        # Basit magic number kontrolü
-        magic_numbers = {
-            b'ID3': 'MP3',
-            b'RIFF': 'WAV',
-            b'\x00\x00\x00': 'MP4/M4A',
-            b'fLaC': 'FLAC',
-            b'OggS': 'OGG'
-        }
-        
-        file_start = file_bytes[:8]
-        is_valid_audio = False
-        for magic, format_name in magic_numbers.items():
-            if file_start.startswith(magic):
-                is_valid_audio = True
-                break
-        
-        if not is_valid_audio:
+        if not SecurityManager._is_audio_header(bytes(file_bytes[:8])):
             return False, "Dosya geçerli bir ses dosyası değil"
         
         return True, "OK"
     
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _is_audio_header(header: bytes) -> bool:
+        """İlk 8 bayttan magic number kontrolü - aynı başlık tekrar değerlendirilmez"""
+        # MP4/M4A ayrıca 4. bayttaki 'ftyp' box'ı ile tanınır
+        prefix4 = header[:4]
+        return (
+            prefix4 in SecurityManager._AUDIO_MAGIC_4
+            or prefix4[:3] in SecurityManager._AUDIO_MAGIC_3
+            or header[4:8] == b'ftyp'
+        )
+    
     @staticmethod
     def sanitize_filename(filename: str) -> str:
         """Dosya adını temizle"""
         # Zararlı karakterleri kaldır
-        dangerous_chars = '<>:"/\\|?*'
-        for char in dangerous_chars:
-            filename = filename.replace(char, '_')
+        filename = filename.translate(SecurityManager._SANITIZE_TABLE)
         
         # Maksimum uzunluk
         if len(filename) > 100:
@@ -341,9 +505,34 @@ class SecurityManager:
 # 🌐 ASYNC API HANDLER
 # =============================================
 
+# Timeout'lu API çağrıları için paylaşılan worker havuzu - her çağrıda thread açılmaz
+_API_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_API_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_api_executor() -> ThreadPoolExecutor:
+    """Paylaşılan API executor'ını ilk kullanımda oluşturur"""
+    global _API_EXECUTOR
+    if _API_EXECUTOR is None:
+        with _API_EXECUTOR_LOCK:
+            if _API_EXECUTOR is None:
+                _API_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='whisper-api')
+                atexit.register(_API_EXECUTOR.shutdown, wait=False)
+    return _API_EXECUTOR
+
+
 class AsyncAPIHandler:
     """Asenkron API çağrıları için yardımcı sınıf"""
     
+    @staticmethod
+    def _call_with_executor(func, args, kwargs, timeout):
+        """Çağrıyı paylaşılan havuzda çalıştırıp en fazla timeout kadar bekler"""
+        future = _get_api_executor().submit(func, *args, **kwargs)
+        try:
+            return True, future.result(timeout=timeout)
+        except Exception as e:
+            return False, str(e)
+    
     @staticmethod
     def safe_api_call(func, *args, timeout=30, **kwargs):
         """API çağrısını güvenli şekilde yapar - timeout ile"""
@@ -358,14 +547,8 @@ class AsyncAPIHandler:
         try:
             # Windows için farklı yaklaşım
             if sys.platform.startswith('win'):
-                # ThreadPoolExecutor kullan
-                with ThreadPoolExecutor(max_workers=1) as executor:
-                    future = executor.submit(func, *args, **kwargs)
-                    try:
-                        result = future.result(timeout=timeout)
-                        return True, result
-                    except Exception as e:
-                        return False, str(e)
+                # Paylaşılan ThreadPoolExecutor kullan
+                return AsyncAPIHandler._call_with_executor(func, args, kwargs, timeout)
             else:
                 # Unix sistemler için signal kullan - Windows'ta çalışmaz
                 try:
@@ -381,15 +564,9 @@ class AsyncAPIHandler:
                     except Exception as e:
                         signal.alarm(0)  # type: ignore
                         return False, str(e)
-                except AttributeError:
-                    # signal.SIGALRM Windows'ta yok, ThreadPoolExecutor kullan
-                    with ThreadPoolExecutor(max_workers=1) as executor:
-                        future = executor.submit(func, *args, **kwargs)
-                        try:
-                            result = future.result(timeout=timeout)
-                            return True, result
-                        except Exception as e:
-                            return False, str(e)
+                except (AttributeError, ValueError):
+                    # SIGALRM yok ya da ana thread dışındayız (Streamlit script thread'i) - havuzu kullan
+                    return AsyncAPIHandler._call_with_executor(func, args, kwargs, timeout)
                     
         except Exception as e:
             return False, f"Unexpected error: {str(e)}"
@@ -426,6 +603,16 @@ class FileChunker:
     @staticmethod
     def chunk_audio_file(file_bytes: bytes, file_name: str, chunk_duration_seconds: int = 300) -> List[dict]:
         """Ses dosyasını belirtilen süre parçalarına böler"""
+        return list(FileChunker.iter_audio_chunks(file_bytes, file_name, chunk_duration_seconds))
+    
+    @staticmethod
+    def iter_audio_chunks(file_bytes: bytes, file_name: str,
+                          chunk_duration_seconds: int = 300) -> Iterator[dict]:
+        """Parçaları üretildikçe döndürür - tüm parçaların WAV byte'ları aynı anda bellekte tutulmaz
+        
+        Her parça 'index' ve 'total' alanlarını da taşır; böylece tüketici
+        listeyi görmeden ilerleme hesaplayabilir.
+        """
         temp_path: Optional[str] = None  # Initialize temp_path
         try:
             # Geçici dosya oluştur
@@ -433,45 +620,139 @@ class FileChunker:
             if not temp_path:
                 raise Exception("Geçici dosya oluşturulamadı")
             
-            # PyDub ile yükle
-            if AudioSegment is None:
-                raise Exception("pydub kütüphanesi yüklü değil")
-            audio = AudioSegment.from_file(temp_path)
-            
-            # Chunk'lara böl
-            chunk_length_ms = chunk_duration_seconds * 1000
-            chunks = []
+            # Önce soundfile: tek decode + numpy dilimleme, ffmpeg turu yok
+            decoded = FileChunker._decode_with_soundfile(temp_path)
+            if decoded is not None:
+                chunk_iter = FileChunker._iter_pcm_chunks(decoded[0], decoded[1], chunk_duration_seconds)
+            else:
+                # PyDub ile yükle - soundfile yoksa veya format desteklenmiyorsa
+                if AudioSegment is None:
+                    raise Exception("pydub kütüphanesi yüklü değil")
+                audio = AudioSegment.from_file(temp_path)
+                chunk_iter = FileChunker._iter_segment_chunks(audio, chunk_duration_seconds)
+        except Exception as e:
+            logger.error(f"File chunking failed: {e}")
+            return
+        finally:
+            # Ses belleğe çözüldü - geçici dosya parçalama başlamadan silinir
+            TempFileManager.cleanup_temp_file(temp_path)
+        
+        try:
+            yield from chunk_iter
+        except Exception as e:
+            logger.error(f"File chunking failed: {e}")
+    
+    @staticmethod
+    def _decode_with_soundfile(temp_path: str):
+        """Dosyayı soundfile ile int16 PCM'e çözer - desteklenmiyorsa None"""
+        if sf is None:
+            return None
+        try:
+            return sf.read(temp_path, dtype='int16', always_2d=False)
+        except RuntimeError as e:  # libsndfile bu formatı (ör. m4a) okuyamıyor
+            logger.debug(f"soundfile decode unavailable, falling back to pydub: {e}")
+            return None
+    
+    @staticmethod
+    def _iter_pcm_chunks(data, sample_rate: int, chunk_duration_seconds: int) -> Iterator[dict]:
+        """PCM dizisini dilimleyip her dilimi WAV olarak üretir"""
+        total_samples = len(data)
+        chunk_samples = chunk_duration_seconds * sample_rate
+        total = -(-total_samples // chunk_samples)
+        
+        for index, i0 in enumerate(range(0, total_samples, chunk_samples)):
+            i1 = min(i0 + chunk_samples, total_samples)
             
-            for i in range(0, len(audio), chunk_length_ms):
-                chunk = audio[i:i + chunk_length_ms]
-                
-                # Chunk'ı WAV formatında bytes'a çevir
-                chunk_buffer = io.BytesIO()
-                chunk.export(chunk_buffer, format="wav")
-                chunk_bytes = chunk_buffer.getvalue()
-                
-                chunks.append({
-                    'data': chunk_bytes,
-                    'start_time': i / 1000,  # saniye
-                    'end_time': min((i + chunk_length_ms) / 1000, len(audio) / 1000),
-                    'duration': len(chunk) / 1000
-                })
+            # Dilim kopyalanmadan doğrudan WAV olarak yazılır; getbuffer ile byte'lar kopyalanmaz
+            chunk_buffer = io.BytesIO()
+            sf.write(chunk_buffer, data[i0:i1], sample_rate, format='WAV', subtype='PCM_16')
             
-            # Geçici dosyayı temizle
-            TempFileManager.cleanup_temp_file(temp_path)
+            yield {
+                'data': chunk_buffer.getbuffer(),
+                'start_time': i0 / sample_rate,  # saniye
+                'end_time': i1 / sample_rate,
+                'duration': (i1 - i0) / sample_rate,
+                'index': index,
+                'total': total
+            }
+    
+    @staticmethod
+    def _iter_segment_chunks(audio, chunk_duration_seconds: int) -> Iterator[dict]:
+        """PyDub AudioSegment'i parçalara bölüp her parçayı WAV olarak üretir"""
+        chunk_length_ms = chunk_duration_seconds * 1000
+        audio_length_ms = len(audio)
+        total = -(-audio_length_ms // chunk_length_ms)
+        
+        for index, i in enumerate(range(0, audio_length_ms, chunk_length_ms)):
+            chunk = audio[i:i + chunk_length_ms]
             
-            return chunks
+            # Chunk'ı WAV formatında bytes'a çevir
+            chunk_buffer = io.BytesIO()
+            chunk.export(chunk_buffer, format="wav")
             
-        except Exception as e:
-            logger.error(f"File chunking failed: {e}")
-            # temp_path burada mutlaka tanımlı çünkü try bloğunda tanımlandı
-            TempFileManager.cleanup_temp_file(temp_path)
-            return []
+            yield {
+                'data': chunk_buffer.getbuffer(),
+                'start_time': i / 1000,  # saniye
+                'end_time': min((i + chunk_length_ms) / 1000, audio_length_ms / 1000),
+                'duration': len(chunk) / 1000,
+                'index': index,
+                'total': total
+            }
+
+# =============================================
+# 💾 WHISPER RESULT CACHE
+# =============================================
+
+def _fast_sha256(buf) -> str:
+    """bytes / memoryview içeriğinin SHA-256 özetini kopya almadan hesaplar
+    
+    hashlib OpenSSL'e bağlıdır; CPU destekliyorsa SHA-NI komutları kullanılır.
+    """
+    return hashlib.sha256(memoryview(buf)).hexdigest()
+
+
+class WhisperResultCache:
+    """İçerik hash'ine göre Whisper sonuçlarını diskte saklar - aynı ses tekrar gönderilmez"""
+    
+    def __init__(self, cache_dir: str = ".whisper_cache"):
+        self.cache_dir = cache_dir
+    
+    @staticmethod
+    def make_key(audio_bytes: bytes, language: Optional[str], response_format: str, model: str) -> str:
+        """Ses içeriği + transkripsiyon ayarlarından cache anahtarı üretir"""
+        digest = _fast_sha256(audio_bytes)
+        return f"{digest}-{language or 'auto'}-{response_format}-{model}"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Cache'teki transkripti döndürür, yoksa None"""
+        try:
+            with open(os.path.join(self.cache_dir, f"{key}.json"), 'r', encoding='utf-8') as f:
+                return json.load(f).get('transcript')
+        except (OSError, ValueError):
+            return None
+    
+    def put(self, key: str, transcript: Any) -> None:
+        """Metin transkripti cache'e yazar - yarım dosya kalmaması için rename ile"""
+        if not isinstance(transcript, str):
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            final_path = os.path.join(self.cache_dir, f"{key}.json")
+            tmp_path = f"{final_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'transcript': transcript}, f, ensure_ascii=False)
+            os.replace(tmp_path, final_path)
+        except OSError as e:
+            logger.warning(f"Whisper cache write failed: {e}")
 
 # =============================================
 # 🎵 TRANSCRIPTION PROCESSOR
 # =============================================
 
+# Whisper API'nin tek istekte kabul ettiği en büyük dosya (MB)
+WHISPER_API_MAX_FILE_MB = 25
+
+
 class TranscriptionProcessor:
     """Gelişmiş transkripsiyon işlemcisi"""
     
@@ -480,6 +761,9 @@ class TranscriptionProcessor:
         self.config = config
         self.retry_count = 0
         self.max_retries = config.get('max_retries', 3)
+        self.model = config.get('whisper_model', 'whisper-1')
+        self.cache = (WhisperResultCache(config.get('cache_dir', '.whisper_cache'))
+                      if config.get('enable_cache', True) else None)
     
     def process_audio_file(self, file_bytes: bytes, file_name: str, language: Optional[str] = None, 
                           response_format: str = "text", progress_callback=None) -> dict:
@@ -495,14 +779,64 @@ class TranscriptionProcessor:
         # Dosya boyutunu kontrol et
         file_size_mb = len(file_bytes) / (1024 * 1024)
         
+        # Aynı içerik aynı ayarlarla daha önce işlendiyse API'ya hiç gidilmez
+        cache_key = None
+        if self.cache is not None:
+            cache_key = WhisperResultCache.make_key(file_bytes, language, response_format, self.model)
+            cached_transcript = self.cache.get(cache_key)
+            if cached_transcript is not None:
+                if progress_callback:
+                    progress_callback("⚡ Önbellekten alındı", 100)
+                return {
+                    'transcript': cached_transcript,
+                    'chunk_count': 0,
+                    'processing_time': time.time() - start_time,
+                    'file_size_mb': file_size_mb,
+                    'cached': True
+                }
+        
         if progress_callback:
             progress_callback("🔍 Dosya analiz ediliyor...", 10)
         
         # Dosya büyükse chunk'lara böl
-        if FileChunker.should_chunk_file(file_size_mb, threshold_mb=self.config.get('max_file_size_mb', 20)):
-            return self._process_large_file(file_bytes, file_name, language, response_format, progress_callback)
+        if self._needs_chunking(file_bytes, file_size_mb):
+            result = self._process_large_file(file_bytes, file_name, language, response_format, progress_callback)
         else:
-            return self._process_single_file(file_bytes, file_name, language, response_format, progress_callback)
+            result = self._process_single_file(file_bytes, file_name, language, response_format, progress_callback)
+        
+        # Parçalardan bazıları başarısızsa ya da hiç metin çıkmadıysa sonuç cache'lenmez
+        chunk_count = result.get('chunk_count') or 0
+        transcript = result.get('transcript') or ''
+        if (cache_key is not None and chunk_count > 0
+                and result.get('chunks_processed', chunk_count) == chunk_count
+                and transcript.strip() not in ('', 'WEBVTT')):
+            self.cache.put(cache_key, transcript)
+        
+        return result
+    
+    def _needs_chunking(self, file_bytes: bytes, file_size_mb: float) -> bool:
+        """Parçalama kararı - config'teki chunk_policy: always | smart | never
+        
+        smart: eşiği az aşan dosyalarda decode + WAV encode maliyetine girmeden
+        tek çağrı yapılır. API'nin kabul ettiği boyutun üstü her zaman parçalanır;
+        eşik ile sınır arasındaki dosyalar yalnızca uzunsa parçalanır.
+        """
+        threshold_mb = self.config.get('max_file_size_mb', 20)
+        policy = self.config.get('chunk_policy', 'smart')
+        
+        if policy == 'never' or not FileChunker.should_chunk_file(file_size_mb, threshold_mb):
+            return False
+        if policy != 'smart' or file_size_mb > min(1.5 * threshold_mb, WHISPER_API_MAX_FILE_MB):
+            return True
+        
+        # Süre yalnızca başlıktan okunur; okunamazsa güvenli tarafta kalıp parçalanır
+        duration = None
+        if sf is not None:
+            try:
+                duration = sf.info(io.BytesIO(file_bytes)).duration
+            except Exception:
+                duration = None
+        return duration is None or duration > self.config.get('chunk_min_duration_seconds', 600)
     
     def _process_single_file(self, file_bytes: bytes, file_name: str, language: Optional[str], 
                            response_format: str, progress_callback) -> dict:
@@ -556,50 +890,67 @@ class TranscriptionProcessor:
         if progress_callback:
             progress_callback("✂️ Dosya parçalara bölünüyor...", 20)
         
-        # Dosyayı chunk'lara böl
-        chunks = FileChunker.chunk_audio_file(file_bytes, file_name, self.config.get('chunk_duration_seconds', 300))
-        
-        if progress_callback:
-            progress_callback(f"📦 {len(chunks)} parça oluşturuldu", 25)
+        # Dosyayı chunk'lara böl - parçalar ihtiyaç oldukça üretilir
+        chunk_iter = FileChunker.iter_audio_chunks(file_bytes, file_name, self.config.get('chunk_duration_seconds', 300))
+        
+        results: List[Optional[dict]] = []
+        total_chunks = 0
+        completed = 0
+        
+        # Whisper çağrıları ağ beklemesi ağırlıklı - parçalar eşzamanlı gönderilir,
+        # progress_callback yalnızca bu (Streamlit) thread'inden çağrılır.
+        # Havuzda en fazla max_workers parça bekler; biri bitince sıradaki üretilir
+        # Her worker thread parçalar boyunca tek bir .wav scratch dosyasını yeniden kullanır
+        scratch_pool: Dict[int, str] = {}
+        max_workers = max(1, self.config.get('api_concurrency', 4))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            
+            def submit_next() -> bool:
+                chunk = next(chunk_iter, None)
+                if chunk is None:
+                    return False
+                future = executor.submit(self._process_one_chunk, chunk, language, response_format, scratch_pool)
+                pending[future] = (chunk['index'], chunk['total'])
+                return True
+            
+            for _ in range(max_workers):
+                if not submit_next():
+                    break
+            
+            if pending:
+                total_chunks = next(iter(pending.values()))[1]
+            # Toplam ilk parçayla bilinir; sonuçlar sıra indeksine yazılır (tamamlanma sırası rastgele)
+            results = [None] * total_chunks
+            if progress_callback:
+                progress_callback(f"📦 {total_chunks} parça oluşturuldu", 25)
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, _ = pending.pop(future)
+                    try:
+                        result = future.result()
+                        if result is not None:
+                            results[i] = result
+                    except Exception as e:
+                        logger.error(f"Error processing chunk {i}: {e}")
+                    
+                    completed += 1
+                    if progress_callback:
+                        progress = 25 + (completed / total_chunks) * 60
+                        progress_callback(f"🔄 Parça {completed}/{total_chunks} işlendi", progress)
+                    
+                    # Yalnızca genç nesil - tam toplama smart_cleanup_after_processing'de
+                    if completed % 10 == 0:
+                        gc.collect(0)
+                    
+                    submit_next()
         
-        transcripts = []
-        total_chunks = len(chunks)
+        TempFileManager.release_scratch(scratch_pool)
         
-        for i, chunk in enumerate(chunks):
-            temp_path: Optional[str] = None  # Initialize for each chunk
-            try:
-                if progress_callback:
-                    progress = 25 + (i / total_chunks) * 60
-                    progress_callback(f"🔄 Parça {i+1}/{total_chunks} işleniyor...", progress)
-                
-                # Chunk'ı geçici dosyaya kaydet
-                temp_path = TempFileManager.create_temp_file(chunk['data'], ".wav")
-                if not temp_path:
-                    continue
-                
-                # API çağrısı
-                with open(temp_path, "rb") as audio_file:
-                    chunk_transcript = self._call_whisper_api(audio_file, language, response_format)
-                
-                transcripts.append({
-                    'text': chunk_transcript,
-                    'start_time': chunk['start_time'],
-                    'end_time': chunk['end_time'],
-                    'duration': chunk['duration']
-                })
-                
-                # Geçici dosyayı temizle
-                TempFileManager.cleanup_temp_file(temp_path)
-                
-                # Bellek temizliği
-                if i % 3 == 0:  # Her 3 chunk'ta bir
-                    gc.collect()
-                
-            except Exception as e:
-                logger.error(f"Error processing chunk {i}: {e}")
-                # temp_path burada tanımlı olmalı
-                TempFileManager.cleanup_temp_file(temp_path)
-                continue
+        # Sıra korunur; başarısız parçalar atlanır
+        transcripts = [t for t in results if t is not None]
         
         if progress_callback:
             progress_callback("🔗 Parçalar birleştiriliyor...", 90)
@@ -615,139 +966,245 @@ class TranscriptionProcessor:
         
         return {
             'transcript': full_transcript,
-            'chunk_count': len(chunks),
+            'chunk_count': total_chunks,
             'processing_time': processing_time,
             'file_size_mb': len(file_bytes) / (1024 * 1024),
             'chunks_processed': len(transcripts)
         }
     
-    def _call_whisper_api(self, audio_file, language: Optional[str], response_format: str, retry_count: int = 0):
-        """Whisper API çağrısı - retry logic ile"""
-        
-        try:
-            # API çağrısı
-            if language:
-                return self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format=response_format,
-                    language=language,
-                    timeout=self.config.get('api_timeout_seconds', 30)
-                )
+    def _process_one_chunk(self, chunk: dict, language: Optional[str], response_format: str,
+                           scratch_pool: Optional[Dict[int, str]] = None) -> Optional[dict]:
+        """Tek parçayı geçici dosyaya yazıp Whisper'a gönderir - worker thread'de çalışır"""
+        # Yarıda kalan bir işlemin tamamlanmış parçaları tekrar gönderilmez
+        chunk_key = None
+        chunk_transcript = None
+        if self.cache is not None:
+            chunk_key = WhisperResultCache.make_key(chunk['data'], language, response_format, self.model)
+            chunk_transcript = self.cache.get(chunk_key)
+        
+        if chunk_transcript is None:
+            if scratch_pool is not None:
+                # Thread'in scratch dosyası üzerine yazılır; silme işlemi en sonda toplu
+                temp_path = TempFileManager.acquire_scratch(scratch_pool, ".wav")
+                if not temp_path or not TempFileManager.overwrite_scratch(temp_path, chunk['data']):
+                    return None
             else:
-                return self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    response_format=response_format,
-                    timeout=self.config.get('api_timeout_seconds', 30)
-                )
+                temp_path = TempFileManager.create_temp_file(chunk['data'], ".wav")
+                if not temp_path:
+                    return None
+            
+            try:
+                with open(temp_path, "rb") as audio_file:
+                    chunk_transcript = self._call_whisper_api(audio_file, language, response_format)
+            finally:
+                if scratch_pool is None:
+                    TempFileManager.cleanup_temp_file(temp_path)
+            
+            if chunk_key is not None:
+                self.cache.put(chunk_key, chunk_transcript)
         
-        except Exception as e:
-            error_message = str(e)
-            
-            # Rate limiting hatası
-            if "Rate limit" in error_message or "rate_limit_exceeded" in error_message:
-                logger.warning(f"Rate limit hit, waiting...")
-                time.sleep(5)  # 5 saniye bekle
-                if retry_count < 3:
-                    return self._call_whisper_api(audio_file, language, response_format, retry_count + 1)
-                else:
-                    raise Exception(f"Rate limit exceeded after retries: {error_message}")
-            
-            # Genel retry logic
-            if retry_count < self.max_retries:
-                wait_time = (2 ** retry_count) * 1  # Exponential backoff
-                logger.warning(f"API call failed, retrying in {wait_time}s... (attempt {retry_count + 1})")
+        return {
+            'text': chunk_transcript,
+            'start_time': chunk['start_time'],
+            'end_time': chunk['end_time'],
+            'duration': chunk['duration']
+        }
+    
+    def _call_whisper_api(self, audio_file, language: Optional[str], response_format: str):
+        """Whisper API çağrısı - retry logic ile (döngüsel, tek frame)"""
+        
+        request_kwargs = {
+            'model': self.model,
+            'file': audio_file,
+            'response_format': response_format,
+            'timeout': self.config.get('api_timeout_seconds', 30)
+        }
+        if language:
+            request_kwargs['language'] = language
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                if attempt:
+                    # Önceki deneme dosyayı okumuş olabilir - baştan gönder
+                    audio_file.seek(0)
+                return self.client.audio.transcriptions.create(**request_kwargs)
+            
+            except Exception as e:
+                error_message = str(e)
+                
+                # Rate limiting hatası
+                if "Rate limit" in error_message or "rate_limit_exceeded" in error_message:
+                    if attempt >= self.max_retries:
+                        raise Exception(f"Rate limit exceeded after retries: {error_message}")
+                    logger.warning(f"Rate limit hit, waiting...")
+                    time.sleep(5)  # 5 saniye bekle
+                    continue
+                
+                # Genel retry logic
+                if attempt >= self.max_retries:
+                    raise Exception(f"API call failed after retries: {error_message}")
+                wait_time = (2 ** attempt) * 1  # Exponential backoff
+                logger.warning(f"API call failed, retrying in {wait_time}s... (attempt {attempt + 1})")
                 time.sleep(wait_time)
-                return self._call_whisper_api(audio_file, language, response_format, retry_count + 1)
-            else:
-                raise Exception(f"API call failed after retries: {error_message}")
     
     def _merge_timestamped_transcripts(self, transcripts: list, format_type: str) -> str:
-        """Timestamp'li transkriptleri birleştir"""
+        """Timestamp'li transkriptleri birleştir - parçalar listede toplanıp tek join ile"""
         if format_type == "srt":
-            result = ""
-            for i, transcript in enumerate(transcripts, 1):
-                start_time = self._seconds_to_srt_time(transcript['start_time'])
-                end_time = self._seconds_to_srt_time(transcript['end_time'])
-                result += f"{i}\n{start_time} --> {end_time}\n{transcript['text']}\n\n"
-            return result
+            to_time = self._seconds_to_srt_time
+            return "".join([
+                f"{i}\n{to_time(t['start_time'])} --> {to_time(t['end_time'])}\n{t['text']}\n\n"
+                for i, t in enumerate(transcripts, 1)
+            ])
         
         elif format_type == "vtt":
-            result = "WEBVTT\n\n"
-            for transcript in transcripts:
-                start_time = self._seconds_to_vtt_time(transcript['start_time'])
-                end_time = self._seconds_to_vtt_time(transcript['end_time'])
-                result += f"{start_time} --> {end_time}\n{transcript['text']}\n\n"
-            return result
+            to_time = self._seconds_to_vtt_time
+            return "WEBVTT\n\n" + "".join([
+                f"{to_time(t['start_time'])} --> {to_time(t['end_time'])}\n{t['text']}\n\n"
+                for t in transcripts
+            ])
         
         return " ".join([t['text'] for t in transcripts])
     
+    @staticmethod
+    def _split_timestamp(seconds: float) -> Tuple[int, int, int, int]:
+        """Saniyeyi (saat, dakika, saniye, milisaniye) olarak tamsayı divmod'larla ayırır"""
+        total_ms = int(seconds * 1000)
+        total_secs, millisecs = divmod(total_ms, 1000)
+        hours, rem = divmod(total_secs, 3600)
+        minutes, secs = divmod(rem, 60)
+        return hours, minutes, secs, millisecs
+    
     def _seconds_to_srt_time(self, seconds: float) -> str:
         """Saniyeyi SRT zaman formatına çevir"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = int(seconds % 60)
-        millisecs = int((seconds % 1) * 1000)
+        hours, minutes, secs, millisecs = self._split_timestamp(seconds)
         return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
     
     def _seconds_to_vtt_time(self, seconds: float) -> str:
         """Saniyeyi VTT zaman formatına çevir"""
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+        hours, minutes, secs, millisecs = self._split_timestamp(seconds)
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millisecs:03d}"
 
 # =============================================
 # 🎵 AUDIO ANALYSIS FUNCTIONS
 # =============================================
 
-@st.cache_data
-def analyze_audio_file(file_bytes, file_name):
-    """Ses dosyasını analiz eder ve bilgileri döndürür"""
+def analyze_audio_file(file_bytes, file_name, file_digest: Optional[str] = None,
+                       file_extension: Optional[str] = None, compute_waveform: bool = True):
+    """Ses dosyasını analiz eder ve bilgileri döndürür
+    
+    file_digest verilirse cache anahtarı olarak kullanılır; böylece Streamlit
+    her rerun'da tüm dosya byte'larını yeniden hash'lemez. file_extension
+    (noktasız) validasyonda hesaplandıysa tekrar çıkarılmaz. Grafik çizmeyen
+    çağıranlar compute_waveform=False ile dalga formu taramasını atlar.
+    """
+    if file_digest is None:
+        file_digest = hashlib.md5(file_bytes).hexdigest()
+    if file_extension is None:
+        file_extension = os.path.splitext(file_name)[1].lower()[1:]
+    return _analyze_audio_file_cached(file_digest, file_name, file_extension, compute_waveform, file_bytes)
+
+# pydub sample_width (byte) -> numpy dtype; get_array_of_samples ile aynı işaretli tipler
+_PCM_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# libsndfile subtype -> örnek genişliği (byte); listede olmayanlar 2 kabul edilir
+_SF_SUBTYPE_WIDTHS = {'PCM_S8': 1, 'PCM_U8': 1, 'PCM_16': 2, 'PCM_24': 3, 'PCM_32': 4,
+                      'FLOAT': 4, 'DOUBLE': 8}
+
+def _samples_dbfs(samples, full_scale: float, block: int = 1 << 20) -> float:
+    """Örneklerin RMS seviyesini dBFS olarak hesaplar - blok blok, tam boy geçici dizi olmadan"""
+    flat = samples.reshape(-1)
+    if flat.size == 0:
+        return float('-inf')
+    sum_squares = 0.0
+    for i in range(0, flat.size, block):
+        part = flat[i:i + block].astype(np.float64)
+        sum_squares += float(np.dot(part, part))
+    rms = np.sqrt(sum_squares / flat.size)
+    return float(20 * np.log10(rms / full_scale)) if rms > 0 else float('-inf')
+
+def _load_samples_with_soundfile(file_bytes: bytes):
+    """Bellekteki byte'ları libsndfile ile çözer - desteklenmeyen formatta None"""
+    if sf is None:
+        return None
     try:
-        # Geçici dosya oluştur
-        temp_path = TempFileManager.create_temp_file(file_bytes, os.path.splitext(file_name)[1])
-        if not temp_path:
-            raise Exception("Geçici dosya oluşturulamadı")
-        
-        # PyDub ile ses dosyasını yükle (daha güvenilir)
-        if AudioSegment is None:
-            raise Exception("pydub kütüphanesi yüklü değil")
-        audio = AudioSegment.from_file(temp_path)
+        with sf.SoundFile(io.BytesIO(file_bytes)) as s:
+            sample_rate = s.samplerate
+            channels = s.channels
+            sample_width = _SF_SUBTYPE_WIDTHS.get(s.subtype, 2)
+            out = np.empty((s.frames, channels), dtype=np.float32)
+            frames_read = s.read(out=out)
+    except RuntimeError as e:  # libsndfile bu formatı (ör. mp3/m4a) okuyamıyor
+        logger.debug(f"soundfile decode unavailable, falling back to pydub: {e}")
+        return None
+    out = out[:len(frames_read)]
+    
+    # dBFS: float örnekler zaten tam ölçeğe (±1.0) göre normalize
+    avg_db = _samples_dbfs(out, 1.0)
+    
+    raw_data = out[:, 0] if channels == 1 else out.mean(axis=1, dtype=np.float32)
+    return raw_data, sample_rate, channels, sample_width, len(out) / sample_rate, avg_db
+
+def _load_samples_with_pydub(file_bytes: bytes, file_extension: str):
+    """ffmpeg gerektiren formatlar için pydub yolu - byte'lar ffmpeg'e pipe ile verilir"""
+    if AudioSegment is None:
+        raise Exception("pydub kütüphanesi yüklü değil")
+    
+    # Geçici dosya yazılmaz; format açıkça verilir (pydub m4a -> mp4 eşlemesini kendisi yapar)
+    audio = AudioSegment.from_file(io.BytesIO(file_bytes), format=file_extension or None)
+    
+    sample_rate = audio.frame_rate
+    channels = audio.channels
+    sample_width = audio.sample_width
+    
+    # Dalga formu verisi - PCM buffer'ı kopyalanmadan numpy görünümü olarak okunur
+    sample_dtype = _PCM_DTYPES.get(sample_width)
+    if sample_dtype is None:
+        raw_data = np.array(audio.get_array_of_samples())
+    else:
+        raw_data = np.frombuffer(audio.raw_data, dtype=sample_dtype)
+    
+    # dBFS pydub'ın Python düzeyindeki audio.dBFS'i yerine aynı numpy görünümünden (tüm kanallar)
+    avg_db = _samples_dbfs(raw_data, float(1 << (8 * sample_width - 1)))
+    
+    if channels == 2:
+        # Stereo ise mono'ya çevir - float ara dizi olmadan tamsayı ortalaması
+        frames = raw_data[:len(raw_data) - len(raw_data) % 2].reshape((-1, 2))
+        wide_dtype = np.int64 if frames.dtype.itemsize >= 4 else np.int32
+        raw_data = ((frames[:, 0].astype(wide_dtype) + frames[:, 1]) >> 1).astype(frames.dtype)
+    
+    return raw_data, sample_rate, channels, sample_width, len(audio) / 1000.0, avg_db
+
+@st.cache_data(persist="disk", show_spinner=False)
+def _analyze_audio_file_cached(file_digest, file_name, file_extension, compute_waveform, _file_bytes):
+    """analyze_audio_file'ın cache'li gövdesi - anahtar digest, byte'lar hash'lenmez"""
+    file_bytes = _file_bytes
+    try:
+        # WAV/FLAC/OGG/AIFF libsndfile ile doğrudan bellekten; diğerleri pydub/ffmpeg ile
+        loaded = _load_samples_with_soundfile(file_bytes)
+        if loaded is None:
+            loaded = _load_samples_with_pydub(file_bytes, file_extension)
+        raw_data, sample_rate, channels, sample_width, duration, avg_db = loaded
         
         # Temel bilgiler
-        duration = len(audio) / 1000.0  # milliseconds to seconds
         duration_minutes = int(duration // 60)
         duration_seconds = int(duration % 60)
         
-        # Ses kalitesi bilgileri
-        sample_rate = audio.frame_rate
-        channels = audio.channels
-        sample_width = audio.sample_width
-        
-        # dB hesaplaması
-        avg_db = audio.dBFS
-        
-        # Dalga formu verisi için basit örnekleme
-        raw_data = audio.get_array_of_samples()
-        if channels == 2:
-            # Stereo ise mono'ya çevir
-            raw_data = np.array(raw_data).reshape((-1, 2)).mean(axis=1)
-        else:
-            raw_data = np.array(raw_data)
-        
-        # Downsampling for visualization
-        downsample_factor = max(1, len(raw_data) // 2000)
-        time_axis = np.arange(0, len(raw_data), downsample_factor) / sample_rate
-        waveform_data = raw_data[::downsample_factor]
-        
-        # Normalize waveform
-        if len(waveform_data) > 0:
-            waveform_data = waveform_data / np.max(np.abs(waveform_data)) if np.max(np.abs(waveform_data)) > 0 else waveform_data
-        
-        # Geçici dosyayı temizle
-        TempFileManager.cleanup_temp_file(temp_path)
+        # Plotly yoksa grafik çizilemez - tam buffer taramasına gerek yok
+        time_axis = waveform_data = None
+        if compute_waveform and go is not None:
+            # Downsampling for visualization - her blok için tepe genliği (zarf)
+            block_size = max(1, len(raw_data) // 2000)
+            n_blocks = len(raw_data) // block_size
+            blocks = raw_data[:block_size * n_blocks].reshape((n_blocks, block_size))
+            # Tam boy abs() dizisi yerine blok max/min; int16 -32768 taşması da böylece olmaz
+            waveform_data = np.maximum(np.abs(blocks.max(axis=1).astype(np.float32)),
+                                       np.abs(blocks.min(axis=1).astype(np.float32))) if n_blocks else np.zeros(0, dtype=np.float32)
+            time_axis = (np.arange(n_blocks) * block_size) / sample_rate
+            
+            # Normalize waveform
+            peak = waveform_data.max() if n_blocks else 0.0
+            if peak > 0:
+                waveform_data /= peak
         
         return {
             'duration': duration,
@@ -774,10 +1231,11 @@ def create_waveform_plot(time_axis, waveform):
         st.warning("📊 Plotly is not available. Waveform visualization cannot be displayed.")
         return None
     
+    # WebGL izi ve float32 - tarayıcıya giden JSON yarıya iner, çok noktada SVG yavaşlamaz
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
-        x=time_axis,
-        y=waveform,
+    fig.add_trace(go.Scattergl(
+        x=np.asarray(time_axis, dtype=np.float32),
+        y=np.asarray(waveform, dtype=np.float32),
         mode='lines',
         name=get_text('waveform_trace_name'),
         line=dict(color='#4a90e2', width=1)
@@ -796,8 +1254,9 @@ def create_waveform_plot(time_axis, waveform):
     
     return fig
 
+@lru_cache(maxsize=256)
 def estimate_processing_time(duration_minutes):
-    """İşlem süresi tahmini"""
+    """İşlem süresi tahmini - aynı dosyanın rerun'larında cache'ten"""
     # Ortalama olarak 1 dakika ses = 10-15 saniye işlem süresi
     estimated_seconds = duration_minutes * 12
     if estimated_seconds < 60:
@@ -809,134 +1268,236 @@ def estimate_processing_time(duration_minutes):
 # 🤖 AI ANALYSIS FUNCTIONS
 # =============================================
 
-def analyze_text_with_ai(text, client, duration_seconds=None, model="gpt-4-turbo"):
-    """Metni AI ile analiz eder - asenkron ve güvenli versiyon"""
-    
-    def safe_ai_call(prompt, max_tokens=200, temperature=0.3, timeout=30):
-        """Güvenli AI çağrısı"""
-        success, result = AsyncAPIHandler.safe_api_call(
-            client.chat.completions.create,
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=max_tokens,
-            temperature=temperature,
-            timeout=timeout
-        )
+# AI analiz prompt şablonu - özet, anahtar kelimeler ve duygu tek istekte JSON olarak istenir
+_AI_ANALYSIS_PROMPT_TEMPLATE = """
+        Aşağıdaki metni analiz et ve yalnızca şu anahtarları içeren bir JSON nesnesi döndür:
+        - "summary": Metnin özeti; ana konuları ve önemli noktaları vurgula
+        - "keywords": Metindeki en önemli 10 anahtar kelime (string listesi)
+        - "emotion": {{"general": "pozitif" | "negatif" | "nötr", "detail": kısa açıklama, "confidence": "%" ile güven}}
         
-        if success:
-            # result OpenAI response objesi olmalı
-            try:
-                # Type güvenli erişim
-                result_obj: Any = result
-                if hasattr(result_obj, 'choices') and result_obj.choices:
-                    return result_obj.choices[0].message.content.strip()
-                else:
-                    # Eğer string ise direkt döndür
-                    return str(result)
-            except:
-                return str(result)
-        else:
-            raise Exception(f"AI call failed: {result}")
-    
+        {text}
+        """
+
+# Üç eski isteğin (200 + 100 + 150) toplamı
+AI_ANALYSIS_MAX_TOKENS = 450
+
+_AI_TEXT_TRUNCATED_NOTE = "\n\n[Metin analiz için kısaltılmıştır...]"
+
+# Token bütçesi (tiktoken varsa); yoksa eski karakter sınırı kullanılır
+AI_TEXT_TOKEN_BUDGET = 3500
+
+@lru_cache(maxsize=4)
+def _get_token_encoding(model: str):
+    """Model için tiktoken kodlayıcısı - tiktoken yoksa None"""
+    if tiktoken is None:
+        return None
     try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+def _trim_analysis_text(text: str, model: str) -> str:
+    """Analiz metnini token sınırında kırpar"""
+    encoding = _get_token_encoding(model)
+    if encoding is None:
         # Metin çok uzunsa kısalt
         if len(text) > 8000:
-            text = text[:8000] + "\n\n[Metin analiz için kısaltılmıştır...]"
-        
-        # 1. Özetleme - asenkron
-        summary_prompt = f"""
-        Lütfen aşağıdaki metni özetle. Ana konuları ve önemli noktaları vurgula:
-        
-        {text}
-        
-        Özet:
-        """
-        
-        try:
-            summary = safe_ai_call(summary_prompt, max_tokens=200, timeout=20)
-        except Exception as e:
-            logger.warning(f"Summary generation failed: {e}")
-            summary = "Özet oluşturulamadı"
-        
-        # 2. Anahtar kelime çıkarma - asenkron
-        keywords_prompt = f"""
-        Aşağıdaki metinden en önemli 10 anahtar kelimeyi çıkar. Sadece kelimeleri virgülle ayırarak listele:
-        
-        {text}
-        
-        Anahtar kelimeler:
-        """
-        
-        try:
-            keywords_text = safe_ai_call(keywords_prompt, max_tokens=100, timeout=15)
-            keywords = [kw.strip() for kw in keywords_text.split(',') if kw.strip()]
-        except Exception as e:
-            logger.warning(f"Keywords generation failed: {e}")
-            keywords = []
-        
-        # 3. Duygusal analiz - asenkron
-        emotion_prompt = f"""
-        Aşağıdaki metnin duygusal tonunu analiz et. Sadece bu formatla cevap ver:
-        Genel Duygu: [pozitif/negatif/nötr]
-        Detay: [kısa açıklama]
-        Güven: [%]
-        
-        {text[:2000]}
-        """
-        
-        try:
-            emotion_analysis = safe_ai_call(emotion_prompt, max_tokens=150, timeout=15)
-        except Exception as e:
-            logger.warning(f"Emotion analysis failed: {e}")
-            emotion_analysis = "Duygusal analiz yapılamadı"
-        
-        # 4. Konuşma hızı analizi
-        word_count = len(text.split())
-        if duration_seconds and duration_seconds > 0:
-            words_per_minute = (word_count / duration_seconds) * 60
-            speed_category = get_speech_speed_category(words_per_minute)
-            
-            # Kalite değerlendirmesi
-            if 120 <= words_per_minute <= 160:
-                quality_assessment = "Mükemmel - İdeal konuşma hızı"
-            elif 100 <= words_per_minute < 120 or 160 < words_per_minute <= 180:
-                quality_assessment = "İyi - Kabul edilebilir hız"
-            elif 80 <= words_per_minute < 100 or 180 < words_per_minute <= 220:
-                quality_assessment = "Orta - Biraz yavaş/hızlı"
-            else:
-                quality_assessment = "Düşük - Çok yavaş veya çok hızlı"
-            
-            speed_analysis = {
-                'word_count': word_count,
-                'duration_minutes': duration_seconds / 60,
-                'words_per_minute': words_per_minute,
-                'speed_category': speed_category,
-                'quality_assessment': quality_assessment
-            }
+            text = text[:8000] + _AI_TEXT_TRUNCATED_NOTE
+        return text
+    
+    tokens = encoding.encode(text)
+    if len(tokens) > AI_TEXT_TOKEN_BUDGET:
+        text = encoding.decode(tokens[:AI_TEXT_TOKEN_BUDGET]) + _AI_TEXT_TRUNCATED_NOTE
+    return text
+
+def _build_ai_prompt(text: str, model: str = "gpt-4-turbo") -> Tuple[str, str]:
+    """(kırpılmış metin, birleşik analiz prompt'u) döndürür"""
+    text = _trim_analysis_text(text, model)
+    return text, _AI_ANALYSIS_PROMPT_TEMPLATE.format(text=text)
+
+def _supports_json_mode(model: str) -> bool:
+    """Eski gpt-4 sürümleri response_format=json_object gönderilince 400 döndürür"""
+    return not (model == "gpt-4" or model.startswith(("gpt-4-0314", "gpt-4-0613", "gpt-4-32k")))
+
+def _ai_analysis_request(prompt: str, model: str) -> Dict[str, Any]:
+    """AI analiz isteğinin chat.completions gövdesi"""
+    request = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": AI_ANALYSIS_MAX_TOKENS,
+        "temperature": 0.3,
+    }
+    if _supports_json_mode(model):
+        request["response_format"] = {"type": "json_object"}
+    return request
+
+def _extract_json_object(content: str) -> Any:
+    """JSON modu olmayan modellerin cevabındaki ```json bloğu / açıklama metni içinden nesneyi çıkarır"""
+    try:
+        return json.loads(content)
+    except ValueError:
+        start, end = content.find('{'), content.rfind('}')
+        if start == -1 or end <= start:
+            raise
+        return json.loads(content[start:end + 1])
+
+def _parse_ai_analysis_response(content: Optional[str]) -> Tuple[str, List[str], str, bool]:
+    """JSON cevabı (özet, anahtar kelimeler, duygu metni, eksiksiz mi) olarak çözer"""
+    try:
+        data = _extract_json_object(content) if content else {}
+    except ValueError as e:
+        logger.warning(f"AI analysis response is not valid JSON: {e}")
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    
+    summary = str(data.get('summary') or '').strip()
+    if not summary:
+        logger.warning("Summary generation failed")
+        summary = "Özet oluşturulamadı"
+    
+    keywords = data.get('keywords')
+    if isinstance(keywords, str):
+        keywords = _parse_keywords(keywords)
+    elif isinstance(keywords, list):
+        keywords = [str(kw).strip() for kw in keywords if str(kw).strip()]
+    else:
+        keywords = []
+    if not keywords:
+        logger.warning("Keywords generation failed")
+    
+    # Duygu, ekranların beklediği "Genel Duygu/Detay/Güven" satır formatına çevrilir
+    emotion = data.get('emotion')
+    if isinstance(emotion, dict) and emotion.get('general'):
+        confidence = str(emotion.get('confidence', '')).strip()
+        if confidence and not confidence.endswith('%'):
+            confidence += '%'
+        emotion_analysis = (f"Genel Duygu: {str(emotion['general']).strip()}\n"
+                            f"Detay: {str(emotion.get('detail', '')).strip()}\n"
+                            f"Güven: {confidence}")
+    else:
+        logger.warning("Emotion analysis failed")
+        emotion_analysis = "Duygusal analiz yapılamadı"
+    
+    complete = (summary != "Özet oluşturulamadı" and bool(keywords)
+                and emotion_analysis != "Duygusal analiz yapılamadı")
+    return summary, keywords, emotion_analysis, complete
+
+def _build_ai_analysis_result(text: str, summary: str, keywords: List[str], emotion_analysis: str,
+                              duration_seconds: Optional[float], model: str) -> Dict[str, Any]:
+    """AI çıktılarını konuşma hızı analiziyle birlikte sonuç sözlüğüne dönüştürür"""
+    # 4. Konuşma hızı analizi
+    word_count = len(text.split())
+    if duration_seconds and duration_seconds > 0:
+        words_per_minute = (word_count / duration_seconds) * 60
+        speed_category = get_speech_speed_category(words_per_minute)
+        
+        # Kalite değerlendirmesi
+        if 120 <= words_per_minute <= 160:
+            quality_assessment = "Mükemmel - İdeal konuşma hızı"
+        elif 100 <= words_per_minute < 120 or 160 < words_per_minute <= 180:
+            quality_assessment = "İyi - Kabul edilebilir hız"
+        elif 80 <= words_per_minute < 100 or 180 < words_per_minute <= 220:
+            quality_assessment = "Orta - Biraz yavaş/hızlı"
         else:
-            speed_analysis = {
-                'word_count': word_count,
-                'duration_minutes': 0,
-                'words_per_minute': 0,
-                'speed_category': 'Süre bilgisi yok',
-                'quality_assessment': 'Değerlendirilemiyor - Süre bilgisi eksik'
-            }
-        
-        return {
-            'summary': summary,
-            'keywords': keywords,
-            'emotion_analysis': emotion_analysis,
-            'speed_analysis': speed_analysis,
-            'model': model,  # Kullanılan AI model bilgisi
-            'analysis_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),  # Analiz zamanı
-            'text_length': len(text),  # Analiz edilen metin uzunluğu
-            'analysis_quality': 'High' if len(text) > 100 else 'Limited'  # Analiz kalitesi
+            quality_assessment = "Düşük - Çok yavaş veya çok hızlı"
+        
+        speed_analysis = {
+            'word_count': word_count,
+            'duration_minutes': duration_seconds / 60,
+            'words_per_minute': words_per_minute,
+            'speed_category': speed_category,
+            'quality_assessment': quality_assessment
         }
-        
+    else:
+        speed_analysis = {
+            'word_count': word_count,
+            'duration_minutes': 0,
+            'words_per_minute': 0,
+            'speed_category': 'Süre bilgisi yok',
+            'quality_assessment': 'Değerlendirilemiyor - Süre bilgisi eksik'
+        }
+    
+    return {
+        'summary': summary,
+        'keywords': keywords,
+        'emotion_analysis': emotion_analysis,
+        'speed_analysis': speed_analysis,
+        'model': model,  # Kullanılan AI model bilgisi
+        'analysis_timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),  # Analiz zamanı
+        'text_length': len(text),  # Analiz edilen metin uzunluğu
+        'analysis_quality': 'High' if len(text) > 100 else 'Limited'  # Analiz kalitesi
+    }
+
+def _parse_keywords(keywords_text: str) -> List[str]:
+    """Virgülle ayrılmış anahtar kelime cevabını listeye çevirir"""
+    return [kw.strip() for kw in keywords_text.split(',') if kw.strip()]
+
+# AI analiz çağrılarında SDK retry sayısı ve SDK'nın denemeler arası en uzun beklemesi (saniye)
+AI_CALL_MAX_RETRIES = 3
+_SDK_MAX_BACKOFF_SECONDS = 8
+
+class _PartialAIAnalysis(Exception):
+    """Yedek değer içeren analiz sonucu - cache'e yazılmadan çağırana döner"""
+    
+    def __init__(self, result: Dict[str, Any]):
+        super().__init__("partial AI analysis")
+        self.result = result
+
+# Bundan kısa transkriptler (çoğunlukla başarısız ASR) API'ye gönderilmez
+AI_MIN_TEXT_LENGTH = 100
+
+def _short_text_analysis(text: str, duration_seconds: Optional[float], model: str) -> Dict[str, Any]:
+    """Çok kısa metin için API çağrısız sonuç - analysis_quality 'Limited' olur"""
+    text = text.strip()
+    return _build_ai_analysis_result(text, text, [], "Metin çok kısa", duration_seconds, model)
+
+def analyze_text_with_ai(text, client, duration_seconds=None, model="gpt-4-turbo"):
+    """Metni AI ile analiz eder - aynı metin/model/süre için sonuç cache'ten gelir"""
+    if len(text.strip()) < AI_MIN_TEXT_LENGTH:
+        return _short_text_analysis(text, duration_seconds, model)
+    text_hash = hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+    try:
+        return _analyze_text_with_ai_cached(text_hash, model, duration_seconds, text, client)
+    except _PartialAIAnalysis as partial:
+        return partial.result
     except Exception as e:
         logger.error(f"AI analiz hatası: {e}")
         return None
 
+@st.cache_data(persist="disk", show_spinner=False)
+def _analyze_text_with_ai_cached(text_hash, model, duration_seconds, _text, _client):
+    """analyze_text_with_ai'ın cache'li gövdesi - anahtar metin hash'i, client hash'lenmez"""
+    text, client = _text, _client
+    text, prompt = _build_ai_prompt(text, model)
+    
+    # Tek istek: metin bir kez gönderilir. 429/timeout/5xx hataları SDK içinde üstel backoff
+    # ile tekrarlanır; bekleme süresi tüm denemeleri kapsamalı, yoksa sonuç gelmeden yedek değere düşülür
+    timeout = 30
+    wait_budget = timeout * (AI_CALL_MAX_RETRIES + 1) + _SDK_MAX_BACKOFF_SECONDS * AI_CALL_MAX_RETRIES
+    future = _get_api_executor().submit(
+        client.with_options(max_retries=AI_CALL_MAX_RETRIES).chat.completions.create,
+        timeout=timeout,
+        **_ai_analysis_request(prompt, model)
+    )
+    
+    content = None
+    try:
+        response: Any = future.result(timeout=wait_budget)
+        if hasattr(response, 'choices') and response.choices:
+            content = response.choices[0].message.content
+    except Exception as e:
+        logger.warning(f"AI call failed: {e}")
+    
+    summary, keywords, emotion_analysis, complete = _parse_ai_analysis_response(content)
+    result = _build_ai_analysis_result(text, summary, keywords, emotion_analysis,
+                                       duration_seconds, model)
+    
+    # Başarısız çağrı yedek değerleri kalıcı cache'e yazılmamalı - bir sonraki denemede tekrar sorulur
+    if not complete:
+        raise _PartialAIAnalysis(result)
+    return result
+
 def get_speech_speed_category(wpm):
     """Konuşma hızı kategorisini belirler"""
     if wpm < 120:
@@ -948,14 +1509,24 @@ def get_speech_speed_category(wpm):
     else:
         return "🏃‍♂️ Çok Hızlı"
 
+# Duygu cevabındaki "Alan: değer" satırları - tek geçişte, eksik alanlara toleranslı
+_EMOTION_FIELD_RE = re.compile(r'^[ \t]*(Genel Duygu|Detay|Güven)[ \t]*:[ \t]*(.*?)[ \t\r]*$', re.MULTILINE)
+
+_KEYWORD_BADGE_COLORS = ('#4a90e2', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#f97316', '#06b6d4', '#84cc16')
+_KEYWORD_BADGE_TEMPLATE = ('<span style="background: {color}; color: white; padding: 6px 12px; margin: 3px; '
+                           'border-radius: 15px; display: inline-block; font-size: 0.85rem; font-weight: 500; '
+                           'box-shadow: 0 2px 4px rgba(0,0,0,0.2);">{keyword}</span>')
+
+_KEYWORD_MARK_TEMPLATE = '<mark style="background-color: #4a90e2; color: white; padding: 2px 4px; border-radius: 3px;">{}</mark>'
+
 def highlight_keywords_in_text(text, keywords):
-    """Metinde anahtar kelimeleri vurgular"""
-    highlighted_text = text
-    for keyword in keywords:
-        if keyword and len(keyword.strip()) > 2:  # En az 3 karakter
-            pattern = re.compile(re.escape(keyword.strip()), re.IGNORECASE)
-            highlighted_text = pattern.sub(f'<mark style="background-color: #4a90e2; color: white; padding: 2px 4px; border-radius: 3px;">{keyword.strip()}</mark>', highlighted_text)
-    return highlighted_text
+    """Metinde anahtar kelimeleri tek geçişte vurgular"""
+    # En az 3 karakter; uzun ifadeler önce denenir ki alt dizgileri onları bölmesin
+    parts = {re.escape(keyword.strip()) for keyword in keywords if keyword and len(keyword.strip()) > 2}
+    if not parts:
+        return text
+    pattern = re.compile('(' + '|'.join(sorted(parts, key=len, reverse=True)) + ')', re.IGNORECASE)
+    return pattern.sub(lambda m: _KEYWORD_MARK_TEMPLATE.format(m.group(0)), text)
 
 def create_ai_analysis_display(ai_analysis, original_text):
     """AI analiz sonuçlarını temiz ve düzenli bir şekilde gösterir - GELİŞTİRİLMİŞ SÜRÜM"""
@@ -992,20 +1563,12 @@ def create_ai_analysis_display(ai_analysis, original_text):
             st.markdown("#### 🔑 Anahtar Kelimeler")
             keywords = ai_analysis.get('keywords', [])
             if keywords:
-                keyword_badges = ""
-                for i, keyword in enumerate(keywords[:8]):  # 8 anahtar kelime
-                    if keyword.strip():
-                        # Renkli badges
-                        colors = ['#4a90e2', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#f97316', '#06b6d4', '#84cc16']
-                        color = colors[i % len(colors)]
-                        keyword_badges += f'''
-                        <span style="background: {color}; color: white; 
-                                   padding: 6px 12px; margin: 3px; 
-                                   border-radius: 15px; display: inline-block; 
-                                   font-size: 0.85rem; font-weight: 500;
-                                   box-shadow: 0 2px 4px rgba(0,0,0,0.2);">
-                            {keyword.strip()}
-                        </span> '''
+                # Renkli badges - 8 anahtar kelime
+                keyword_badges = ' '.join(
+                    _KEYWORD_BADGE_TEMPLATE.format(color=_KEYWORD_BADGE_COLORS[i % len(_KEYWORD_BADGE_COLORS)],
+                                                   keyword=keyword.strip())
+                    for i, keyword in enumerate(keywords[:8]) if keyword.strip()
+                )
                 
                 st.markdown(f"""
                 <div style="background: #1a1d23; padding: 1.5rem; border-radius: 12px; 
@@ -1087,12 +1650,7 @@ def create_ai_analysis_display(ai_analysis, original_text):
             
             # Duygu parsing (eğer structured format varsa)
             if isinstance(emotion, str) and "Genel Duygu:" in emotion:
-                lines = emotion.split('\n')
-                emotion_info = {}
-                for line in lines:
-                    if ":" in line:
-                        key, value = line.split(":", 1)
-                        emotion_info[key.strip()] = value.strip()
+                emotion_info = dict(_EMOTION_FIELD_RE.findall(emotion))
                 
                 general_emotion = emotion_info.get('Genel Duygu', 'Bilinmiyor')
                 detail = emotion_info.get('Detay', '')
@@ -1175,8 +1733,9 @@ def create_ai_analysis_display(ai_analysis, original_text):
 # 📤 INITIALIZATION HELPER
 # =============================================
 
+@st.cache_resource
 def initialize_openai_client():
-    """Güvenli OpenAI client başlatma - asenkron test ile"""
+    """Güvenli OpenAI client başlatma - süreç başına bir kez oluşturulur ve test edilir"""
     api_key = os.getenv("OPENAI_API_KEY")
     
     if not api_key:
@@ -1194,7 +1753,7 @@ def initialize_openai_client():
             timeout=ADVANCED_CONFIG.get('api_timeout_seconds', 30)
         )
         
-        # API bağlantısını güvenli şekilde test et
+        # API bağlantısını güvenli şekilde test et - cache_resource sayesinde rerun'larda tekrarlanmaz
         test_success, test_message = AsyncAPIHandler.test_api_connection(client)
         
         if test_success:
@@ -1210,36 +1769,369 @@ def initialize_openai_client():
 # 🔗 ALTERNATIVE DOWNLOAD MANAGERS
 # =============================================
 
+# aria2c --summary-interval satırı: "[#2089b0 1.0MiB/10MiB(10%) CN:8 DL:2.1MiB]"
+_ARIA2_PERCENT_RE = re.compile(rb'\((\d+)%\)')
+
+# Nagle kapalı + uzun/hızlı hatlarda BDP'ye yetecek alım tamponu (işletim sistemi varsayılanı ~208 KB)
+_DOWNLOAD_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024),
+]
+
+if requests is not None:
+    class _TunedHTTPAdapter(requests.adapters.HTTPAdapter):
+        """Havuzdaki her sokete _DOWNLOAD_SOCKET_OPTIONS uygulayan HTTPAdapter"""
+        
+        def init_poolmanager(self, *args, **kwargs):
+            kwargs['socket_options'] = list(_DOWNLOAD_SOCKET_OPTIONS)
+            super().init_poolmanager(*args, **kwargs)
+
+def _httpx_transport(async_: bool = False, **kwargs):
+    """Soket seçenekli httpx transport'u; eski httpx sürümleri socket_options desteklemez"""
+    transport_cls = httpx.AsyncHTTPTransport if async_ else httpx.HTTPTransport
+    try:
+        return transport_cls(socket_options=_DOWNLOAD_SOCKET_OPTIONS, **kwargs)
+    except TypeError:
+        return transport_cls(**kwargs)
+
+# Tekrarlanan indirmelerde TCP/TLS el sıkışması tekrarlanmasın diye paylaşılan requests oturumu
+_DOWNLOAD_SESSION = None
+_DOWNLOAD_SESSION_LOCK = threading.Lock()
+
+def _get_download_session():
+    """Bağlantı havuzlu requests.Session'ı ilk kullanımda oluşturur"""
+    global _DOWNLOAD_SESSION
+    if _DOWNLOAD_SESSION is None:
+        with _DOWNLOAD_SESSION_LOCK:
+            if _DOWNLOAD_SESSION is None:
+                session = requests.Session()
+                session.headers.update({
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    'Accept': '*/*',
+                    # Ses dosyaları zaten sıkıştırılmış - gzip sunucuda CPU, burada ikinci bir decode demek
+                    'Accept-Encoding': 'identity',
+                    'Connection': 'keep-alive'
+                })
+                adapter = _TunedHTTPAdapter(pool_connections=8, pool_maxsize=16)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                atexit.register(session.close)
+                _DOWNLOAD_SESSION = session
+    return _DOWNLOAD_SESSION
+
+_HTTPX_CLIENT = None
+
+def _get_httpx_client():
+    """Paylaşılan senkron httpx.Client'ı ilk kullanımda oluşturur"""
+    global _HTTPX_CLIENT
+    if _HTTPX_CLIENT is None:
+        with _DOWNLOAD_SESSION_LOCK:
+            if _HTTPX_CLIENT is None:
+                _HTTPX_CLIENT = httpx.Client(timeout=60.0, follow_redirects=True,
+                                             transport=_httpx_transport(http2=_HTTP2_AVAILABLE))
+                atexit.register(_HTTPX_CLIENT.close)
+    return _HTTPX_CLIENT
+
+class DownloadValidatorCache:
+    """URL indirmelerini ETag/Last-Modified ile diskte saklar - değişmemişse gövde tekrar indirilmez
+    
+    Toplam gövde boyutu max_bytes'ı aşarsa en uzun süre kullanılmamış (mtime) kayıtlar silinir.
+    """
+    
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+    
+    def _paths(self, url: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+        return f"{base}.json", f"{base}.bin"
+    
+    def _validators(self, url: str) -> Optional[Dict[str, str]]:
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if os.path.exists(body_path) else None
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Cache'te gövde varsa If-None-Match / If-Modified-Since başlıkları"""
+        meta = self._validators(url) or {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+    
+    def matches(self, url: str, response_headers) -> bool:
+        """HEAD cevabındaki doğrulayıcılar cache'tekiyle aynı mı"""
+        meta = self._validators(url)
+        if not meta:
+            return False
+        etag = response_headers.get('etag')
+        if etag and meta.get('etag'):
+            return etag == meta['etag']
+        last_modified = response_headers.get('last-modified')
+        return bool(last_modified) and last_modified == meta.get('last_modified')
+    
+    def load(self, url: str) -> Optional[Union[bytes, mmap.mmap]]:
+        """Cache'teki gövdeyi salt okunur mmap olarak döndürür, yoksa None - içerik heap'e kopyalanmaz"""
+        body_path = self._paths(url)[1]
+        try:
+            with open(body_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b''
+                body = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            # LRU sırası mtime ile tutulur - okunan kayıt en yeni sayılır
+            os.utime(body_path)
+            return body
+        except (OSError, ValueError):
+            return None
+    
+    def _evict(self) -> None:
+        """Toplam boyut sınırın altına inene kadar en eski gövdeleri siler"""
+        entries, total = [], 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.bin'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+        except OSError:
+            return
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, body_path in entries:
+            # Önce meta silinir - gövdesiz meta doğrulayıcı olarak kullanılmaz
+            for path in (body_path[:-4] + '.json', body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+    
+    def store(self, url: str, response_headers, body: bytes) -> None:
+        """Doğrulayıcı başlık varsa gövdeyi saklar - önce gövde, sonra meta rename edilir"""
+        etag = response_headers.get('etag')
+        last_modified = response_headers.get('last-modified')
+        if (not etag and not last_modified) or len(body) > self.max_bytes:
+            return
+        meta_path, body_path = self._paths(url)
+        suffix = f".{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(body_path + suffix, 'wb') as f:
+                f.write(body)
+            os.replace(body_path + suffix, body_path)
+            with open(meta_path + suffix, 'w', encoding='utf-8') as f:
+                json.dump({'etag': etag, 'last_modified': last_modified}, f)
+            os.replace(meta_path + suffix, meta_path)
+        except OSError as e:
+            logger.warning(f"Download cache write failed: {e}")
+            return
+        self._evict()
+
+def _get_download_cache() -> Optional[DownloadValidatorCache]:
+    """Ayarlarda cache açıksa indirme cache'i"""
+    if not ADVANCED_CONFIG.get('enable_cache', True):
+        return None
+    return DownloadValidatorCache(os.path.join(ADVANCED_CONFIG.get('cache_dir', '.whisper_cache'), 'downloads'),
+                                  ADVANCED_CONFIG.get('download_cache_max_mb', 1024) * 1024 * 1024)
+
+class _RangeRequestUnsupported(Exception):
+    """Sunucu byte aralığı isteğini beklendiği gibi yanıtlamadı"""
+
+class _DownloadCancelled(Exception):
+    """Yarışta başka bir indirici önce bitirdi - kaybeden indirme durduruluyor"""
+
+# Bu boyutun üstündeki indirmeler RAM yerine geçici dosyaya bağlı mmap'e yazılır
+DOWNLOAD_SPILL_THRESHOLD = 64 * 1024 * 1024
+
+def _allocate_download_storage(size: int) -> Union[bytearray, mmap.mmap]:
+    """Eşiğin altında bytearray; üstünde sayfaları çekirdeğin yönettiği, dosya destekli yazılabilir mmap"""
+    if size < DOWNLOAD_SPILL_THRESHOLD:
+        return bytearray(size)
+    # TemporaryFile adsız (POSIX) ya da kapanınca silinir (Windows); mmap kendi tanıtıcısını tutar
+    with tempfile.TemporaryFile(suffix=".download") as tf:
+        tf.truncate(size)
+        mm = mmap.mmap(tf.fileno(), size)
+    # Yazım ve sonraki okuma sıralı - çekirdek önden okur, geride kalan sayfaları erken geri alır
+    if hasattr(mm, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+        try:
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        except OSError:
+            pass
+    return mm
+
+class _DownloadBuffer:
+    """Content-Length biliniyorsa tek seferde ayrılan indirme buffer'ı"""
+    
+    def __init__(self, expected_size: int = 0):
+        self._buf = _allocate_download_storage(expected_size)
+        self._pos = 0
+    
+    def write(self, chunk) -> int:
+        """Parçayı yerine yazar ve toplam yazılan byte sayısını döndürür"""
+        end = self._pos + len(chunk)
+        if end <= len(self._buf):
+            # Aynı boyutlu dilim ataması - yeniden ayırma/kopya büyümesi yok
+            self._buf[self._pos:end] = chunk
+        elif isinstance(self._buf, mmap.mmap) and self._resize_mmap(end):
+            self._buf[self._pos:end] = chunk
+        else:
+            # Boyut bilinmiyor ya da beklenenden fazla veri (ör. sıkıştırılmış Content-Length)
+            del self._buf[self._pos:]
+            self._buf += chunk
+        self._pos = end
+        return end
+    
+    def fill_from(self, stream, read_size: int, report: Optional[Callable[[int], None]] = None) -> int:
+        """Akışı readinto ile doğrudan buffer'a okur - parça başına bytes nesnesi ve kopyası oluşmaz"""
+        view = memoryview(self._buf)
+        try:
+            while self._pos < len(self._buf):
+                n = stream.readinto(view[self._pos:self._pos + read_size])
+                if not n:
+                    break
+                self._pos += n
+                if report:
+                    report(self._pos)
+        finally:
+            view.release()
+        # Boyut bilinmiyorsa ya da beklenenden fazla veri geldiyse kalan kısım write ile eklenir
+        while True:
+            chunk = stream.read(read_size)
+            if not chunk:
+                break
+            downloaded = self.write(chunk)
+            if report:
+                report(downloaded)
+        return self._pos
+    
+    def _resize_mmap(self, size: int) -> bool:
+        """mmap'i yeniden boyutlandırır; platform desteklemiyorsa (ör. mremap yok) bytearray'e döner"""
+        try:
+            self._buf.resize(size)
+            return True
+        except (OSError, SystemError):
+            data = bytearray(self._buf[:self._pos])
+            self._buf.close()
+            self._buf = data
+            return False
+    
+    def detach(self) -> Union[bytearray, mmap.mmap]:
+        """Yazılan veriyi kopyalamadan döndürür - bytes() dönüşümü tüm dosyayı bir kez daha kopyalardı"""
+        if isinstance(self._buf, mmap.mmap):
+            if self._pos == 0:
+                self._buf.close()
+                self._buf = bytearray()
+            elif self._pos != len(self._buf):
+                self._resize_mmap(self._pos)
+        if not isinstance(self._buf, mmap.mmap) and self._pos != len(self._buf):
+            # Sondan kırpma yerinde yapılır; önceki baytlar taşınmaz
+            del self._buf[self._pos:]
+        buf, self._buf, self._pos = self._buf, bytearray(), 0
+        return buf
+
 class AlternativeDownloadManager:
     """Alternatif indirme yöneticileri sınıfı"""
     
+    # Büyük parça: chunk başına Python yükü (callback, extend, syscall) MB başına azalır
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
+    # requests: urllib3 ham akışından tek read() ile okunan boyut - MB başına tek Python turu
+    RAW_READ_SIZE = 1024 * 1024
+    # HTTPX: Range destekleyen sunucularda dosya bu kadar paralel parçada indirilir
+    RANGE_SEGMENTS = 8
+    RANGE_MIN_SIZE = 4 * 1024 * 1024
+    
     @staticmethod
-    def download_with_requests(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[bytes], Dict]:
-        """Requests ile direkt URL indirme (extract edilmiş URL gerekli)"""
+    def _map_and_unlink(path: str) -> Union[bytes, mmap.mmap]:
+        """Dosyayı salt okunur mmap olarak açar ve diskten siler - içerik Python heap'ine kopyalanmaz
+        
+        POSIX'te map dosya silindikten sonra da geçerlidir; Windows'ta silme başarısız olursa
+        dosya süreç kapanırken silinir.
+        """
         try:
-            # Requests import - hata varsa yakala
+            with open(path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b''
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
             try:
-                import requests
-            except ImportError:
+                os.unlink(path)
+            except OSError:
+                atexit.register(TempFileManager.cleanup_temp_file, path)
+    
+    @staticmethod
+    def _cached_download_metadata(url: str, audio_data: bytes, elapsed: float, downloader: str,
+                                  progress_callback: Optional[Callable] = None) -> Dict:
+        """Koşullu istekte 304 alınıp cache'ten dönülen indirme için metadata"""
+        if progress_callback:
+            progress_callback("✅ Dosya değişmemiş - cache'ten yüklendi", 100)
+        return {
+            'title': url.split('?', 1)[0].rstrip('/').split('/')[-1] or "audio_file",
+            'file_size_mb': len(audio_data) / (1024 * 1024),
+            'original_url': url,
+            'download_time': elapsed,
+            'downloader': downloader,
+            'cache_hit': True
+        }
+    
+    @staticmethod
+    def _progress_reporter(progress_callback: Optional[Callable], total_size: int) -> Optional[Callable[[int], None]]:
+        """İndirme ilerlemesini her %1'lik adımda bir kez bildirir"""
+        if not progress_callback or total_size <= 0:
+            return None
+        # Chunk başına yalnızca bir tamsayı karşılaştırması; bölme ve format yalnızca bildirimde
+        inv_total = 100.0 / total_size
+        step = max(1, total_size // 100)
+        next_tick = [step]
+        
+        def report(downloaded: int):
+            if downloaded < next_tick[0]:
+                return
+            next_tick[0] = (downloaded // step + 1) * step
+            percent = downloaded * inv_total
+            progress_callback(f"📥 İndiriliyor: {percent:.1f}%", min(percent * 0.8, 80))
+        
+        return report
+    
+    @staticmethod
+    def download_with_requests(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[Union[bytes, bytearray, mmap.mmap]], Dict]:
+        """Requests ile direkt URL indirme (extract edilmiş URL gerekli)
+        
+        progress_callback verilmezse gövde doğrudan geçici dosyaya akıtılır ve salt okunur mmap döner.
+        """
+        response = None
+        try:
+            if requests is None:
                 return None, {'error': 'Requests kütüphanesi yüklü değil. Lütfen: pip install requests'}
             
-            import time
-            from urllib.parse import urlparse
-            
             start_time = time.time()
             
             if progress_callback:
                 progress_callback("🌐 Requests ile bağlantı kuruluyor...", 10)
             
-            # Stream download with progress
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': '*/*',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive'
-            }
+            # Stream download with progress - başlıklar ve bağlantı havuzu paylaşılan oturumda
+            session = _get_download_session()
+            download_cache = _get_download_cache()
+            conditional = download_cache.conditional_headers(url) if download_cache else {}
+            response = session.get(url, headers=conditional, stream=True, timeout=30)
             
-            response = requests.get(url, headers=headers, stream=True, timeout=30)
+            # 304: dosya değişmemiş - gövde cache'ten
+            if response.status_code == 304:
+                response.close()
+                audio_data = download_cache.load(url)
+                if audio_data is not None:
+                    return audio_data, AlternativeDownloadManager._cached_download_metadata(
+                        url, audio_data, time.time() - start_time, 'requests', progress_callback)
+                response = session.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
@@ -1247,23 +2139,36 @@ class AlternativeDownloadManager:
             if progress_callback:
                 progress_callback(f"📥 Requests ile indiriliyor ({total_size/(1024*1024):.1f} MB)...", 20)
             
-            audio_data = bytearray()
-            downloaded = 0
+            # iter_content'in üreteç katmanı atlanır; Accept-Encoding identity olduğundan decode ucuz
+            raw = response.raw
+            raw.decode_content = True
             
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    audio_data.extend(chunk)
-                    downloaded += len(chunk)
-                    
-                    if total_size > 0 and progress_callback:
-                        percent = (downloaded / total_size) * 100
-                        progress_callback(f"📥 İndiriliyor: {percent:.1f}%", min(percent * 0.8, 80))
+            if progress_callback:
+                buffer = _DownloadBuffer(total_size)
+                report = AlternativeDownloadManager._progress_reporter(progress_callback, total_size)
+                buffer.fill_from(raw, AlternativeDownloadManager.RAW_READ_SIZE, report)
+                
+                audio_data = buffer.detach()
+                del buffer
+            else:
+                # İlerleme gerekmiyorsa kopya döngüsü C tarafında (copyfileobj) döner; sonuç mmap
+                tf = tempfile.NamedTemporaryFile(delete=False, suffix=".download")
+                try:
+                    with tf:
+                        shutil.copyfileobj(raw, tf, length=AlternativeDownloadManager.RAW_READ_SIZE)
+                except BaseException:
+                    TempFileManager.cleanup_temp_file(tf.name)
+                    raise
+                audio_data = AlternativeDownloadManager._map_and_unlink(tf.name)
             
             total_time = time.time() - start_time
             
             if progress_callback:
                 progress_callback("✅ Requests indirme tamamlandı!", 100)
             
+            if download_cache:
+                download_cache.store(url, response.headers, audio_data)
+            
             # Basit metadata
             filename = urlparse(url).path.split('/')[-1] or "audio_file"
             
@@ -1272,24 +2177,28 @@ class AlternativeDownloadManager:
                 'file_size_mb': len(audio_data) / (1024 * 1024),
                 'original_url': url,
                 'download_time': total_time,
-                'downloader': 'requests'
+                'downloader': 'requests',
+                'backing': 'mmap' if isinstance(audio_data, mmap.mmap) else 'memory'
             }
             
-            return bytes(audio_data), metadata
+            return audio_data, metadata
             
         except Exception as e:
+            # Yarım kalan stream bağlantısı havuza geri verilmeden kapatılır
+            if response is not None:
+                response.close()
             logger.error(f"Requests download error: {e}")
             return None, {'error': f'Requests hatası: {str(e)}'}
     
     @staticmethod
-    def download_with_aria2(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[bytes], Dict]:
-        """Aria2 ile indirme (external process)"""
+    def download_with_aria2_to_path(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[str], Dict]:
+        """Aria2 ile indirir ve dosya yolunu döndürür - byte'lar belleğe okunmaz
+        
+        Dosya cleanup_aria2_download(path) çağrılana kadar diskte kalır; çağrılmazsa
+        süreç kapanırken silinir. ffmpeg/librosa/soundfile doğrudan yolu okuyabilir.
+        """
+        temp_dir = None
         try:
-            import subprocess
-            import tempfile
-            import time
-            import os
-            
             start_time = time.time()
             
             if progress_callback:
@@ -1297,16 +2206,20 @@ class AlternativeDownloadManager:
             
             # Geçici dizin
             temp_dir = tempfile.mkdtemp()
-            output_file = os.path.join(temp_dir, "aria2_audio")
             
             # Aria2 komutu
             aria2_cmd = [
                 'aria2c',
-                '--max-connection-per-server=8',
-                '--split=8',
-                '--min-split-size=1M',
+                '--max-connection-per-server=16',
+                '--split=16',
+                '--min-split-size=2M',
                 '--max-download-limit=0',
-                '--file-allocation=falloc',
+                # Boyut zaten HTTP'den biliniyor - ön ayırma yerine parçalar geldikçe yazılır, yazımlar önbellekte toplanır
+                '--file-allocation=none',
+                '--disk-cache=64M',
+                '--stream-piece-selector=inorder',
+                '--optimize-concurrent-downloads=true',
+                '--http-accept-gzip=false',
                 '--continue=true',
                 '--auto-file-renaming=false',
                 '--allow-overwrite=true',
@@ -1319,32 +2232,47 @@ class AlternativeDownloadManager:
             if progress_callback:
                 progress_callback("📥 Aria2 ile hızlı indirme başlatılıyor...", 20)
             
-            # Aria2 çalıştır
-            process = subprocess.run(aria2_cmd, capture_output=True, text=True, timeout=300)
+            # Aria2 çalıştır - özet satırları akarken ilerleme gösterilir, log bellekte biriktirilmez
+            process = subprocess.Popen(aria2_cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+            # readline sessiz kalan bir süreçte bloklar; süre aşımını ayrı zamanlayıcı uygular
+            killer = threading.Timer(300, process.kill)
+            killer.start()
+            tail = deque(maxlen=20)  # hata mesajı için son satırlar
+            last_report = 0.0
+            try:
+                for line in iter(process.stdout.readline, b''):
+                    tail.append(line)
+                    match = _ARIA2_PERCENT_RE.search(line)
+                    if match and progress_callback:
+                        now = time.monotonic()
+                        if now - last_report >= 0.2:
+                            last_report = now
+                            percent = int(match.group(1))
+                            progress_callback(f"📥 Aria2 indiriyor: {percent}%", 20 + percent * 0.7)
+                returncode = process.wait()
+            except BaseException:
+                # İlerleme callback'i indirmeyi iptal ettiyse süreç arkada çalışmaya devam etmesin
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                killer.cancel()
+                process.stdout.close()
             
-            if process.returncode != 0:
-                return None, {'error': f'Aria2 error: {process.stderr}'}
+            if returncode != 0:
+                output = b''.join(tail).decode('utf-8', errors='replace')
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                return None, {'error': f'Aria2 error: {output}'}
             
-            # İndirilen dosyayı bul
-            downloaded_file = None
-            for file in os.listdir(temp_dir):
-                if file.startswith("aria2_audio"):
-                    downloaded_file = os.path.join(temp_dir, file)
-                    break
+            # --out ve --auto-file-renaming=false ile çıktı yolu belli; .aria2 kontrol dosyası eşleşmez
+            downloaded_file = os.path.join(temp_dir, "aria2_audio")
             
-            if not downloaded_file or not os.path.exists(downloaded_file):
+            if not os.path.exists(downloaded_file):
+                shutil.rmtree(temp_dir, ignore_errors=True)
                 return None, {'error': 'Aria2 ile dosya indirilemedi'}
             
-            if progress_callback:
-                progress_callback("📖 Dosya okunuyor...", 90)
-            
-            # Dosyayı oku
-            with open(downloaded_file, 'rb') as f:
-                audio_data = f.read()
-            
-            # Temizlik
-            import shutil
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            # Çağıran temizlemeyi unutursa süreç kapanırken silinir
+            atexit.register(shutil.rmtree, temp_dir, True)
             
             total_time = time.time() - start_time
             
@@ -1353,64 +2281,180 @@ class AlternativeDownloadManager:
             
             metadata = {
                 'title': 'Aria2 Download',
-                'file_size_mb': len(audio_data) / (1024 * 1024),
+                'file_size_mb': os.path.getsize(downloaded_file) / (1024 * 1024),
                 'original_url': url,
                 'download_time': total_time,
                 'downloader': 'aria2'
             }
             
-            return audio_data, metadata
+            return downloaded_file, metadata
             
         except Exception as e:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
             logger.error(f"Aria2 download error: {e}")
             return None, {'error': f'Aria2 hatası: {str(e)}'}
     
     @staticmethod
-    def download_with_httpx(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[bytes], Dict]:
-        """HTTPX ile asenkron indirme"""
+    def cleanup_aria2_download(path: str) -> None:
+        """download_with_aria2_to_path'in oluşturduğu geçici dizini siler"""
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+    
+    @staticmethod
+    def download_with_aria2(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[Union[bytes, bytearray, mmap.mmap]], Dict]:
+        """Aria2 ile indirme (external process) - byte benzeri, salt okunur mmap döndürür"""
+        downloaded_file, metadata = AlternativeDownloadManager.download_with_aria2_to_path(url, progress_callback)
+        if downloaded_file is None:
+            return None, metadata
         try:
-            # HTTPX import - hata varsa yakala
-            try:
-                import httpx  # type: ignore
-            except ImportError:
+            # Dosya Python heap'ine kopyalanmaz; sayfalar okundukça diskten gelir.
+            # POSIX'te map dosya silindikten sonra da geçerli kalır (Windows'ta dizin atexit'te silinir)
+            with open(downloaded_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return b'', metadata
+                audio_data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            metadata['backing'] = 'mmap'
+            return audio_data, metadata
+        except Exception as e:
+            logger.error(f"Aria2 download error: {e}")
+            return None, {'error': f'Aria2 hatası: {str(e)}'}
+        finally:
+            # Temizlik
+            AlternativeDownloadManager.cleanup_aria2_download(downloaded_file)
+    
+    @staticmethod
+    def download_with_httpx(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[Union[bytes, bytearray, mmap.mmap]], Dict]:
+        """HTTPX ile indirme - sunucu destekliyorsa paralel byte aralıklarıyla (asenkron)"""
+        try:
+            if httpx is None:
                 return None, {'error': 'HTTPX kütüphanesi yüklü değil. Lütfen: pip install httpx'}
             
-            import asyncio
-            import time
-            
             start_time = time.time()
             
-            async def async_download():
+            def single_stream_download(client, headers):
+                """(gövde, cevap başlıkları) döndürür; 304'te gövde None"""
+                with client.stream('GET', url, headers=headers) as response:
+                    if response.status_code == 304:
+                        return None, response.headers
+                    response.raise_for_status()
+                    
+                    total_size = int(response.headers.get('content-length', 0))
+                    buffer = _DownloadBuffer(total_size)
+                    
+                    if progress_callback:
+                        progress_callback(f"📥 HTTPX ile indiriliyor ({total_size/(1024*1024):.1f} MB)...", 20)
+                    
+                    report = AlternativeDownloadManager._progress_reporter(progress_callback, total_size)
+                    for chunk in response.iter_bytes(chunk_size=AlternativeDownloadManager.DOWNLOAD_CHUNK_SIZE):
+                        downloaded = buffer.write(chunk)
+                        if report:
+                            report(downloaded)
+                    
+                    return buffer.detach(), response.headers
+            
+            async def ranged_download(headers, total_size):
                 if progress_callback:
-                    progress_callback("⚡ HTTPX async indirme başlatılıyor...", 10)
+                    progress_callback(f"📥 HTTPX ile {AlternativeDownloadManager.RANGE_SEGMENTS} paralel parçada "
+                                      f"indiriliyor ({total_size/(1024*1024):.1f} MB)...", 20)
+                
+                # Her parça önceden ayrılmış buffer'daki kendi aralığına yazar - birleştirme kopyası yok
+                buffer = _allocate_download_storage(total_size)
+                view = memoryview(buffer)
+                downloaded = [0]
+                report = AlternativeDownloadManager._progress_reporter(progress_callback, total_size)
                 
-                async with httpx.AsyncClient(timeout=60.0) as client:
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    }
+                limits = httpx.Limits(max_connections=AlternativeDownloadManager.RANGE_SEGMENTS * 2)
+                transport = _httpx_transport(async_=True, http2=_HTTP2_AVAILABLE, limits=limits)
+                async with httpx.AsyncClient(timeout=60.0, follow_redirects=True,
+                                             transport=transport) as client:
                     
-                    async with client.stream('GET', url, headers=headers) as response:
-                        response.raise_for_status()
-                        
-                        total_size = int(response.headers.get('content-length', 0))
-                        audio_data = bytearray()
-                        downloaded = 0
-                        
-                        if progress_callback:
-                            progress_callback(f"📥 HTTPX ile indiriliyor ({total_size/(1024*1024):.1f} MB)...", 20)
-                        
-                        async for chunk in response.aiter_bytes(chunk_size=8192):
-                            audio_data.extend(chunk)
-                            downloaded += len(chunk)
-                            
-                            if total_size > 0 and progress_callback:
-                                percent = (downloaded / total_size) * 100
-                                progress_callback(f"📥 İndiriliyor: {percent:.1f}%", min(percent * 0.8, 80))
-                        
-                        return bytes(audio_data)
-            
-            # Async download çalıştır
-            audio_data = asyncio.run(async_download())
+                    async def fetch_range(start: int, end: int):
+                        range_headers = {**headers, 'Range': f'bytes={start}-{end - 1}'}
+                        async with client.stream('GET', url, headers=range_headers) as response:
+                            response.raise_for_status()
+                            if response.status_code != 206:
+                                # Sunucu Range'i yok saydı (200) - tüm dosyayı her parçada göndermesin
+                                raise _RangeRequestUnsupported(f"HTTP {response.status_code}")
+                            pos = start
+                            async for chunk in response.aiter_raw(chunk_size=AlternativeDownloadManager.DOWNLOAD_CHUNK_SIZE):
+                                n = len(chunk)
+                                if pos + n > end:
+                                    raise _RangeRequestUnsupported("range response longer than requested")
+                                view[pos:pos + n] = chunk
+                                pos += n
+                                downloaded[0] += n
+                                if report:
+                                    report(downloaded[0])
+                            if pos != end:
+                                raise _RangeRequestUnsupported(f"range {start}-{end - 1} incomplete")
+                    
+                    segment = -(-total_size // AlternativeDownloadManager.RANGE_SEGMENTS)
+                    tasks = [asyncio.create_task(fetch_range(start, min(start + segment, total_size)))
+                             for start in range(0, total_size, segment)]
+                    try:
+                        await asyncio.gather(*tasks)
+                    except BaseException:
+                        for task in tasks:
+                            task.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                        raise
+                
+                view.release()
+                return buffer
+            
+            if progress_callback:
+                progress_callback("⚡ HTTPX indirme başlatılıyor...", 10)
+            
+            # HEAD ve tek akışlı indirme senkron, paylaşılan client ile - event loop kurulmaz
+            client = _get_httpx_client()
+            # Ses zaten sıkıştırılmış - identity; byte aralıkları da böylece gövdeyle birebir örtüşür
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+                'Accept-Encoding': 'identity'
+            }
+            
+            # Boyut, Range desteği ve ETag/Last-Modified HEAD ile öğrenilir
+            download_cache = _get_download_cache()
+            total_size, accepts_ranges, head_headers = 0, False, {}
+            try:
+                head = client.head(url, headers=headers)
+                if head.status_code < 400:
+                    head_headers = head.headers
+                    total_size = int(head.headers.get('content-length', 0))
+                    accepts_ranges = head.headers.get('accept-ranges', '').lower() == 'bytes'
+            except (httpx.HTTPError, ValueError):
+                pass
+            
+            # Dosya değişmemişse gövde hiç indirilmez
+            if download_cache and head_headers and download_cache.matches(url, head_headers):
+                audio_data = download_cache.load(url)
+                if audio_data is not None:
+                    return audio_data, AlternativeDownloadManager._cached_download_metadata(
+                        url, audio_data, time.time() - start_time, 'httpx', progress_callback)
+            
+            # Event loop yalnızca gerçekten paralel istek atılacaksa açılır
+            audio_data, validators = None, head_headers
+            if accepts_ranges and total_size >= AlternativeDownloadManager.RANGE_MIN_SIZE:
+                try:
+                    audio_data = asyncio.run(ranged_download(headers, total_size))
+                except (_RangeRequestUnsupported, httpx.HTTPError) as e:
+                    logger.info(f"Parallel range download unavailable, falling back to single stream: {e}")
+            
+            if audio_data is None:
+                # HEAD desteklemeyen sunucular için doğrulama koşullu GET ile yapılır
+                conditional = download_cache.conditional_headers(url) if download_cache else {}
+                audio_data, validators = single_stream_download(client, {**headers, **conditional})
+                if audio_data is None:
+                    audio_data = download_cache.load(url)
+                    if audio_data is not None:
+                        return audio_data, AlternativeDownloadManager._cached_download_metadata(
+                            url, audio_data, time.time() - start_time, 'httpx', progress_callback)
+                    audio_data, validators = single_stream_download(client, headers)
+                    if audio_data is None:
+                        raise Exception("HTTP 304 without cached body")
+            
+            if download_cache:
+                download_cache.store(url, validators, audio_data)
             
             total_time = time.time() - start_time
             
@@ -1422,7 +2466,8 @@ class AlternativeDownloadManager:
                 'file_size_mb': len(audio_data) / (1024 * 1024),
                 'original_url': url,
                 'download_time': total_time,
-                'downloader': 'httpx'
+                'downloader': 'httpx',
+                'backing': 'mmap' if isinstance(audio_data, mmap.mmap) else 'memory'
             }
             
             return audio_data, metadata
@@ -1430,5 +2475,69 @@ class AlternativeDownloadManager:
         except Exception as e:
             logger.error(f"HTTPX download error: {e}")
             return None, {'error': f'HTTPX hatası: {str(e)}'}
+    
+    @staticmethod
+    def download_race(url: str, progress_callback: Optional[Callable] = None) -> Tuple[Optional[Union[bytes, bytearray, mmap.mmap]], Dict]:
+        """Requests, HTTPX ve Aria2'yi aynı anda başlatır; ilk başarılı indirme kazanır
+        
+        Kaybedenler bir sonraki ilerleme bildiriminde _DownloadCancelled ile durdurulur.
+        """
+        downloaders = {
+            'requests': AlternativeDownloadManager.download_with_requests,
+            'httpx': AlternativeDownloadManager.download_with_httpx,
+            'aria2': AlternativeDownloadManager.download_with_aria2,
+        }
+        finished = threading.Event()
+        # İşçi thread'ler yalnızca en ileri durumu kaydeder; Streamlit callback'i çağıran thread'de çalışır
+        latest = {'percent': -1.0, 'message': None}
+        latest_lock = threading.Lock()
+        
+        def racer_callback(message: str, percent: float):
+            if finished.is_set():
+                raise _DownloadCancelled()
+            with latest_lock:
+                if percent > latest['percent']:
+                    latest['percent'], latest['message'] = percent, message
+        
+        start_time = time.time()
+        if progress_callback:
+            progress_callback("🏁 Requests, HTTPX ve Aria2 yarışıyor...", 5)
+        
+        executor = ThreadPoolExecutor(max_workers=len(downloaders), thread_name_prefix="download-race")
+        futures = {executor.submit(download, url, racer_callback): name
+                   for name, download in downloaders.items()}
+        errors = {}
+        reported = -1.0
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                if progress_callback:
+                    with latest_lock:
+                        percent, message = latest['percent'], latest['message']
+                    if message and percent > reported and percent < 100:
+                        reported = percent
+                        progress_callback(message, percent)
+                for future in done:
+                    name = futures[future]
+                    try:
+                        audio_data, metadata = future.result()
+                    except Exception as e:
+                        audio_data, metadata = None, {'error': str(e)}
+                    if audio_data is None:
+                        errors[name] = metadata.get('error', 'unknown error')
+                        continue
+                    metadata['download_time'] = time.time() - start_time
+                    metadata['race_winner'] = name
+                    if progress_callback:
+                        progress_callback(f"✅ {name} indirmeyi ilk tamamladı!", 100)
+                    return audio_data, metadata
+        finally:
+            finished.set()
+            # Kaybedenler beklenmez; iptal edilip kendi geçici dosyalarını temizlerler
+            executor.shutdown(wait=False)
+        
+        details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+        return None, {'error': f'Tüm indiriciler başarısız oldu - {details}'}
 
 # End of file
@@ -3,257 +3,502 @@ Basit YouTube Transkripsiyon Modülü
 Karmaşık olmayan, düz çalışan sistem
 """
 import os
+import re
+import csv
+import shutil
+import subprocess
 import tempfile
 import streamlit as st
-from urllib.parse import urlparse, parse_qs
 from datetime import datetime
 import uuid
 import time
+import atexit
+import threading
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Akıllı loglama sistemi
 from logger_config import youtube_logger, setup_logging
 
 # Config import for multilingual support
-from config import get_text
+from config import get_text, get_current_language
+from utils import MemoryManager
 
 # Loglama sistemini başlat
 setup_logging()
 
+# Ağır kütüphaneler ilk kullanımda bir kez import edilir - YouTube sekmesi kullanılmazsa hiç yüklenmez
+@lru_cache(maxsize=1)
+def _yt_dlp():
+    import yt_dlp
+    return yt_dlp
+
+@lru_cache(maxsize=1)
+def _pytube_youtube():
+    from pytube import YouTube
+    return YouTube
+
+@lru_cache(maxsize=1)
+def _openai_client():
+    """Süreç boyunca tek OpenAI istemcisi - parçalı yüklemelerde TCP/TLS bağlantıları yeniden kullanılır"""
+    import httpx
+    from openai import OpenAI
+    from config import OPENAI_API_KEY
+    try:
+        import h2  # noqa: F401  # httpx HTTP/2 desteği h2 paketini gerektirir
+        http2 = True
+    except ImportError:
+        http2 = False
+    http_client = httpx.Client(
+        http2=http2,
+        timeout=httpx.Timeout(600.0, connect=10.0),
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=8),
+    )
+    return OpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+
+# Rate limit geri çekilmesi - yalnızca bu süreçte gerçekten 429 alındıysa beklenir
+_LAST_429_TS = 0.0
+_CONSECUTIVE_429 = 0
+_RATE_LIMIT_MAX_DELAY = 60.0
+
+def _rate_limit_backoff_delay():
+    """Son rate limit hatasından bu yana beklenmesi gereken kalan süre (saniye)"""
+    if _CONSECUTIVE_429 == 0:
+        return 0.0
+    needed = min(_RATE_LIMIT_MAX_DELAY, 0.25 * 1.5 ** _CONSECUTIVE_429)
+    return max(0.0, needed - (time.time() - _LAST_429_TS))
+
+def _retry_sleep(attempt):
+    """yt-dlp'nin kendi yeniden denemeleri için üstel bekleme (0.25 * 1.5^n, en fazla 60 sn)"""
+    return min(_RATE_LIMIT_MAX_DELAY, 0.25 * 1.5 ** attempt)
+
+def _record_rate_limit(hit):
+    """Rate limit sonucunu kaydeder - başarıda geri çekilme sıfırlanır"""
+    global _LAST_429_TS, _CONSECUTIVE_429
+    if hit:
+        _LAST_429_TS = time.time()
+        _CONSECUTIVE_429 += 1
+    else:
+        _CONSECUTIVE_429 = 0
+
+# Süreç boyunca tek YoutubeDL - extractor kurulumu ve YouTube çerezleri çağrılar arasında korunur
+_YDL_INSTANCE = None
+_YDL_LOCK = threading.Lock()
+_YDL_PROGRESS = {'callback': None}  # aktif indirmenin hook'u; _YDL_LOCK altında değişir
+
+def _dispatch_ydl_progress(d):
+    callback = _YDL_PROGRESS['callback']
+    if callback:
+        callback(d)
+
+_YDL_OPTIONS = {
+    'format': 'bestaudio[ext=m4a]/bestaudio/best[height<=480]',  # Düşük kalite, hızlı indirme
+    'outtmpl': os.path.join(tempfile.gettempdir(), 'youtube_audio_%(id)s.%(ext)s'),  # her indirmede değişir
+    'quiet': True,
+    'no_warnings': True,
+    'extractaudio': True,
+    'audioformat': 'm4a',
+    'retries': 3,
+    'fragment_retries': 3,
+    'extractor_retries': 3,
+    'sleep_interval': 2,  # 2 saniye bekleme
+    'max_sleep_interval': 5,  # Maksimum 5 saniye
+    # Yeniden denemeler arası bekleme yt-dlp içinde, her HTTP/fragment isteğinde uygulanır
+    'retry_sleep_functions': {
+        'http': _retry_sleep,
+        'fragment': _retry_sleep,
+        'extractor': _retry_sleep,
+    },
+    'socket_timeout': 30,
+    'http_chunk_size': 10485760,  # 10MB chunks
+    # DASH/HLS parçaları paralel indirilir; istek başına sabit uyku olmadığından hız sınırı yalnızca
+    # 429 sonrası geri çekilmeyle (retry_sleep_functions, _rate_limit_backoff_delay) korunur
+    'concurrent_fragment_downloads': 6,
+    # Bir oynatıcı istemcisi başarısız olursa sıradaki aynı süreçte denenir
+    'extractor_args': {'youtube': {'player_client': ['ios', 'android', 'web', 'tv_embedded']}},
+    'cookiefile': os.path.join(tempfile.gettempdir(), 'yt_cookies.txt'),
+    'progress_hooks': [_dispatch_ydl_progress],
+}
+
+def _get_youtube_dl():
+    """Paylaşılan YoutubeDL örneği - _YDL_LOCK tutulurken çağrılmalı"""
+    global _YDL_INSTANCE
+    if _YDL_INSTANCE is None:
+        _YDL_INSTANCE = _yt_dlp().YoutubeDL(_YDL_OPTIONS)
+        # Çıkışta çerezler dosyaya yazılır ve bağlantılar kapatılır
+        atexit.register(_YDL_INSTANCE.__exit__, None, None, None)
+    return _YDL_INSTANCE
+
+# Tüm indirmeler tek havuz dizinine yazılır; her indirme kendi uuid önekini taşır
+_POOL_DIR = None
+_POOL_DIR_LOCK = threading.Lock()
+
+def _get_pool_dir():
+    """YouTube indirmeleri için süreç ömrü boyunca kullanılan geçici dizin"""
+    global _POOL_DIR
+    if _POOL_DIR is None:
+        with _POOL_DIR_LOCK:
+            if _POOL_DIR is None:
+                _POOL_DIR = tempfile.mkdtemp(prefix='echoforge_yt_')
+                atexit.register(shutil.rmtree, _POOL_DIR, True)
+    return _POOL_DIR
+
+def _remove_job_files(path):
+    """Havuzda aynı indirme önekiyle başlayan dosyaları siler (orijinal, dönüştürülmüş, parçalar)"""
+    directory = os.path.dirname(path)
+    job_prefix = os.path.basename(path).split('_', 1)[0] + '_'
+    try:
+        for entry in os.scandir(directory):
+            if entry.name.startswith(job_prefix):
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+
+# watch?…v=ID, youtu.be/ID ve embed/ID biçimleri tek aramada
+_YOUTUBE_ID_RE = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:[^&#]*&)*v=|embed/)|youtu\.be/)([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])')
+
 def extract_youtube_id(url):
     """YouTube URL'sinden video ID'sini çıkarır"""
-    try:
-        if 'youtube.com/watch' in url:
-            parsed_url = urlparse(url)
-            return parse_qs(parsed_url.query).get('v', [None])[0]
-        elif 'youtu.be/' in url:
-            return url.split('youtu.be/')[-1].split('?')[0]
-        elif 'youtube.com/embed/' in url:
-            return url.split('embed/')[-1].split('?')[0]
-        return None
-    except:
-        return None
+    match = _YOUTUBE_ID_RE.search(url or '')
+    return match.group(1) if match else None
+
+_INVALID_YOUTUBE_URL_MSG = "Geçerli bir YouTube URL'si değil"
 
 def validate_youtube_url(url):
-    """YouTube URL'sinin geçerli olup olmadığını kontrol eder"""
+    """YouTube URL'sinin geçerli olup olmadığını kontrol eder - uzunluk ve karakter kümesi regex'te"""
     video_id = extract_youtube_id(url)
-    if not video_id:
-        return False, "Geçerli bir YouTube URL'si değil"
-    
-    if len(video_id) != 11:
-        return False, "YouTube video ID formatı hatalı"
-    
-    return True, video_id
+    return (True, video_id) if video_id else (False, _INVALID_YOUTUBE_URL_MSG)
+
+# Nedeni ayırt edilemeyen indirme hatalarında gösterilen genel çözüm önerileri
+_DOWNLOAD_FAILED_MSG = """❌ YouTube video indirme başarısız oldu.
+
+🔧 **ÇÖZÜM ÖNERİLERİ:**
+
+**🚫 Rate Limiting Sorunu:**
+- YouTube 1 saatlik rate limit uygulamış
+- Farklı internet bağlantısı deneyin (mobil veri, VPN)
+- 1-2 saat bekleyip tekrar deneyin
+
+**📱 Manuel İndirme:**
+1. Video → MP3 olarak manuel indirin
+2. "📁 Dosya Yükle" sekmesini kullanın
+3. İndirdiğiniz MP3'ü buraya yükleyin
 
-def download_youtube_audio(url):
-    """YouTube videosunu çoklu yöntemle indirir - rate limiting ve hata yönetimi ile"""
+**🔄 Alternatif Çözümler:**
+- Farklı YouTube video URL'i deneyin
+- Video public/erişilebilir olduğundan emin olun
+- Video çok yeni ise biraz bekleyin
+
+**⚠️ Video Durumu:**
+- Video silinmiş/private olabilir
+- Coğrafi kısıtlama olabilir
+- Yaş sınırı içerebilir"""
+
+def download_youtube_audio(url, progress_callback=None):
+    """YouTube videosunu yt-dlp ile indirir - rate limiting ve hata yönetimi ile
+    
+    progress_callback verilirse yt-dlp'nin bayt ilerlemesi 0-1 arası oran olarak iletilir.
+    Worker thread'de çalıştığı için st çağrısı yapmaz; hata {'kind', 'message', 'detail'}
+    dict'i olarak döner ve arayüzde script thread'inde gösterilir.
+    """
     video_id = extract_youtube_id(url)
-    output_path = tempfile.mkdtemp()
+    output_path = _get_pool_dir()
+    # Aynı video yeniden denense ya da iki oturumda açılsa da dosya adları çakışmaz
+    job_id = uuid.uuid4().hex
     
     youtube_logger.start(f"YouTube video indirme başladı: {video_id}")
     
-    # Rate limiting kontrolü için bekleme
-    import time
-    import random
-    
-    # Rastgele bekleme (1-3 saniye) - rate limiting önlemi
-    wait_time = random.uniform(1, 3)
-    youtube_logger.info(f"Rate limiting önlemi: {wait_time:.1f}s bekleniyor")
-    time.sleep(wait_time)
+    # Önceki istek rate limit'e takıldıysa üstel geri çekilme; aksi halde beklemeden başla
+    wait_time = _rate_limit_backoff_delay()
+    if wait_time > 0:
+        youtube_logger.info(f"Rate limiting önlemi: {wait_time:.1f}s bekleniyor")
+        time.sleep(wait_time)
     
-    # Yöntem 1: yt-dlp (en stabil)
+    # yt-dlp - istemci yedeklemesi kendi içinde (player_client listesi), ayrı kütüphane denenmez
+    error_kind = 'failed'
     try:
-        youtube_logger.progress(1, 3, "yt-dlp yöntemi deneniyor (önerilen)...")
-        import yt_dlp
-        
-        output_template = os.path.join(output_path, f'youtube_audio_{video_id}.%(ext)s')
-        
-        ydl_opts = {
-            'format': 'bestaudio[ext=m4a]/bestaudio/best[height<=480]',  # Düşük kalite, hızlı indirme
-            'outtmpl': output_template,
-            'quiet': True,
-            'no_warnings': True,
-            'extractaudio': True,
-            'audioformat': 'm4a',
-            'retries': 3,
-            'fragment_retries': 3,
-            'extractor_retries': 3,
-            'sleep_interval': 2,  # 2 saniye bekleme
-            'max_sleep_interval': 5,  # Maksimum 5 saniye
-            'socket_timeout': 30,
-            'http_chunk_size': 10485760,  # 10MB chunks
-        }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        youtube_logger.info("yt-dlp ile indiriliyor...")
+        output_template = os.path.join(output_path, f'{job_id}_youtube_audio_{video_id}.%(ext)s')
+        
+        # yt-dlp bitirdiği dosyanın yolunu bildirir - uzantı tahmini ve dizin taraması gerekmez
+        finished_files = []
+        
+        def on_progress(d):
+            status = d.get('status')
+            if status == 'downloading' and progress_callback:
+                total = d.get('total_bytes') or d.get('total_bytes_estimate')
+                if total:
+                    progress_callback(min(1.0, d.get('downloaded_bytes', 0) / total))
+            elif status == 'finished' and d.get('filename'):
+                finished_files.append(d['filename'])
+        
+        # Tek örnek aynı anda tek indirme yapar; çıktı şablonu ve hook her çağrıda değiştirilir
+        with _YDL_LOCK:
+            ydl = _get_youtube_dl()
+            ydl.params['outtmpl'] = {'default': output_template}
+            _YDL_PROGRESS['callback'] = on_progress
             try:
                 ydl.download([url])
                 
-                # Dosyayı bul
-                for ext in ['m4a', 'mp4', 'webm', 'mp3']:
-                    potential_file = os.path.join(output_path, f'youtube_audio_{video_id}.{ext}')
+                # Hook yol bildirmediyse tek scandir; uzantı listesi yok, yt-dlp'nin seçtiği her uzantı bulunur
+                prefix = f'{job_id}_youtube_audio_{video_id}.'
+                candidates = finished_files or [entry.path for entry in os.scandir(output_path)
+                                                if entry.name.startswith(prefix) and not entry.name.endswith('.part')]
+                for potential_file in reversed(candidates):
                     if os.path.exists(potential_file) and os.path.getsize(potential_file) > 0:
+                        _record_rate_limit(False)
                         youtube_logger.success("yt-dlp ile indirme başarılı")
-                        st.success("✅ yt-dlp ile başarılı")
                         return potential_file, None
                 
                 raise Exception("yt-dlp: Dosya bulunamadı")
                 
             except Exception as ydl_error:
                 error_msg = str(ydl_error)
-                if "rate-limited" in error_msg.lower() or "rate limit" in error_msg.lower():
+                if "rate-limited" in error_msg.lower() or "rate limit" in error_msg.lower() or "429" in error_msg:
+                    _record_rate_limit(True)
                     youtube_logger.warning("YouTube rate limiting tespit edildi")
+                    error_kind = 'rate_limit'
                     raise Exception("YouTube rate limiting: 1 saat bekleyin veya farklı ağ deneyin")
                 elif "unavailable" in error_msg.lower() or "private" in error_msg.lower():
                     youtube_logger.warning("Video erişilemez durumda")
+                    error_kind = 'unavailable'
                     raise Exception("Video özel, silinmiş veya coğrafi kısıtlamalı")
                 else:
                     raise ydl_error
+            finally:
+                _YDL_PROGRESS['callback'] = None
             
     except Exception as e:
+        # Başarısız indirmenin yarım dosyaları bırakılmaz
+        _remove_job_files(output_template)
         error_msg = str(e)
         youtube_logger.warning(f"yt-dlp hatası: {error_msg[:100]}...")
-        st.warning(f"❌ yt-dlp hatası: {error_msg[:150]}...")
-        
-        # Rate limiting hatası özel mesajı
+        detail = error_msg[:150]
         if "rate-limited" in error_msg.lower() or "rate limit" in error_msg.lower():
-            st.error("🚫 YouTube rate limiting aktif!")
-            st.info("""
-            **🛠️ Çözüm önerileri:**
-            1. **1 saat bekleyin** ve tekrar deneyin
-            2. **Farklı internet bağlantısı** kullanın (mobil veri, VPN)
-            3. **Manuel indirme:** Video → MP3 olarak indirin → "Dosya Yükle" sekmesini kullanın
-            4. **Daha sonra** tekrar deneyin (YouTube limitleri geçicidir)
-            """)
-            return None, "YouTube rate limiting: Lütfen 1 saat bekleyin veya manuel indirme yapın"
+            error_kind = 'rate_limit'
     
-    # Yöntem 2: pytube3 (yedek)
+    # İndirme başarısız
+    youtube_logger.error("yt-dlp ile indirme başarısız")
+    
+    if error_kind == 'rate_limit':
+        return None, {'kind': error_kind, 'detail': detail,
+                      'message': "YouTube rate limiting: Lütfen 1 saat bekleyin veya manuel indirme yapın"}
+    if error_kind == 'unavailable':
+        return None, {'kind': error_kind, 'detail': detail,
+                      'message': "Video özel, silinmiş veya coğrafi kısıtlamalı"}
+    return None, {'kind': error_kind, 'detail': detail, 'message': _DOWNLOAD_FAILED_MSG}
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_video_info(video_id):
+    """pytube ile video bilgilerini çeker - her rerun'da ağa gidilmez; hatalar cache'lenmez"""
+    youtube_logger.info(f"Video bilgileri alınıyor: {video_id}")
+    
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    yt = _pytube_youtube()(url)
+    
+    duration_seconds = yt.length or 0
+    duration_str = f"{duration_seconds//60}:{duration_seconds%60:02d}" if duration_seconds else "Bilinmiyor"
+    
+    video_info = {
+        'title': yt.title or f'YouTube Video {video_id}',
+        'duration': duration_str,
+        'duration_seconds': duration_seconds,
+        'channel': yt.author or 'Bilinmiyor',
+        'views': f"{yt.views:,}" if yt.views else "Bilinmiyor"
+    }
+    
+    youtube_logger.success(f"Video bilgileri alındı: {video_info['title'][:30]}...")
+    return video_info
+
+def _transcode_for_whisper(audio_file):
+    """Sesi 16 kHz mono Opus'a (Ogg) çevirir - Whisper zaten 16 kHz mono işler, yükleme birkaç kat küçülür
+    
+    ffmpeg yoksa ya da dönüştürme başarısız olursa orijinal dosya döner.
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        return audio_file
+    
+    # .opus uzantısı Whisper API'de kabul edilmiyor; aynı akış .ogg kabında gönderilir
+    output_file = os.path.splitext(audio_file)[0] + '_16k.ogg'
+    cmd = [ffmpeg, '-nostdin', '-loglevel', 'error', '-y', '-i', audio_file,
+           '-vn', '-ac', '1', '-ar', '16000', '-c:a', 'libopus', '-b:a', '24k', output_file]
     try:
-        youtube_logger.progress(2, 3, "pytube3 yöntemi deneniyor (yedek)...")
-        from pytube import YouTube
-        
-        # Bekleme ekle
-        time.sleep(random.uniform(2, 4))
-        
-        yt = YouTube(url)
-        
-        if yt.length > 7200:  # 2 saat
-            youtube_logger.warning(f"Video çok uzun: {yt.length//60} dakika")
-            return None, f"Video çok uzun ({yt.length//60} dakika). Maksimum 2 saat."
-        
-        audio_stream = yt.streams.filter(only_audio=True).first()
-        
-        if not audio_stream:
-            raise Exception("Pytube3: Ses stream bulunamadı")
-        
-        output_filename = f'youtube_audio_{video_id}.mp4'
-        output_file = os.path.join(output_path, output_filename)
-        
-        audio_stream.download(output_path=output_path, filename=output_filename)
-        
-        if os.path.exists(output_file) and os.path.getsize(output_file) > 0:
-            youtube_logger.success("pytube3 ile indirme başarılı")
-            st.info("✅ pytube3 ile başarılı")
-            return output_file, None
-        else:
-            raise Exception("Pytube3: Dosya indirilemedi")
-            
-    except Exception as e:
-        error_msg = str(e)
-        youtube_logger.warning(f"pytube3 hatası: {error_msg[:50]}...")
-        st.warning(f"❌ pytube3 hatası: {error_msg[:100]}...")
+        subprocess.run(cmd, check=True, capture_output=True, timeout=600)
+    except (subprocess.SubprocessError, OSError) as e:
+        youtube_logger.warning(f"ffmpeg dönüştürme hatası, orijinal dosya gönderilecek: {str(e)[:100]}")
+        return audio_file
     
-    # Yöntem 3: youtube-dl (son çare)
+    if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+        return audio_file
+    return output_file
+
+# Uzun sesler bu uzunlukta parçalara bölünüp eşzamanlı transkribe edilir
+_SEGMENT_SECONDS = 600
+_MAX_PARALLEL_TRANSCRIPTIONS = 5
+
+def _split_audio(audio_file):
+    """ffmpeg segment ile sesi ~10 dakikalık parçalara böler - [(yol, başlangıç saniyesi)] ya da None"""
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        return None
+    
+    base, ext = os.path.splitext(audio_file)
+    list_file = f"{base}_segments.csv"
+    cmd = [ffmpeg, '-nostdin', '-loglevel', 'error', '-y', '-i', audio_file, '-vn',
+           '-f', 'segment', '-segment_time', str(_SEGMENT_SECONDS), '-reset_timestamps', '1',
+           '-segment_list', list_file, '-segment_list_type', 'csv',
+           '-c', 'copy', f"{base}_part%03d{ext}"]
     try:
-        youtube_logger.progress(3, 3, "youtube-dl yöntemi deneniyor (son çare)...")
-        import youtube_dl
-        
-        # Daha uzun bekleme
-        time.sleep(random.uniform(3, 6))
-        
-        output_template = os.path.join(output_path, f'youtube_audio_{video_id}.%(ext)s')
-        
-        ydl_opts = {
-            'format': 'bestaudio/best[height<=360]',  # Çok düşük kalite
-            'outtmpl': output_template,
-            'quiet': True,
-            'no_warnings': True,
-            'extractaudio': True,
-            'audioformat': 'mp3',
-            'socket_timeout': 30,
-            'retries': 2,
-        }
-        
-        with youtube_dl.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-            
-            # Dosyayı bul
-            for ext in ['mp3', 'm4a', 'mp4', 'webm']:
-                potential_file = os.path.join(output_path, f'youtube_audio_{video_id}.{ext}')
-                if os.path.exists(potential_file) and os.path.getsize(potential_file) > 0:
-                    youtube_logger.success("youtube-dl ile indirme başarılı")
-                    print("✅ youtube-dl ile başarılı")
-                    return potential_file, None
-                    
-            raise Exception("youtube-dl: Dosya bulunamadı")
-            
-    except Exception as e:
-        youtube_logger.error(f"youtube-dl hatası: {str(e)[:50]}...")
-        print(f"❌ youtube-dl hatası: {str(e)}")
+        subprocess.run(cmd, check=True, capture_output=True, timeout=600)
+        # CSV satırı: dosya adı, gerçek başlangıç, bitiş - kesimler paket sınırına denk gelir
+        segments = []
+        with open(list_file, newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if len(row) >= 2:
+                    path = row[0] if os.path.isabs(row[0]) else os.path.join(os.path.dirname(audio_file), row[0])
+                    segments.append((path, float(row[1])))
+    except (subprocess.SubprocessError, OSError, ValueError) as e:
+        youtube_logger.warning(f"Ses parçalara bölünemedi, tek parça gönderilecek: {str(e)[:100]}")
+        return None
+    return segments or None
+
+def _format_timestamp(seconds, separator):
+    """Saniyeyi srt (virgül) / vtt (nokta) zaman damgasına çevirir"""
+    millis = max(0, round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+def _format_transcript(transcript, response_format):
+    """verbose_json sonucunu (metin + segmentler) istenen formata yerelde çevirir - API tekrar çağrılmaz"""
+    segments = transcript['segments']
+    if response_format == 'srt':
+        return "".join(
+            f"{i}\n{_format_timestamp(seg['start'], ',')} --> {_format_timestamp(seg['end'], ',')}\n{seg['text'].strip()}\n\n"
+            for i, seg in enumerate(segments, 1))
+    if response_format == 'vtt':
+        return "WEBVTT\n\n" + "".join(
+            f"{_format_timestamp(seg['start'], '.')} --> {_format_timestamp(seg['end'], '.')}\n{seg['text'].strip()}\n\n"
+            for seg in segments)
+    return transcript['text']
+
+def _transcribe_file(client, audio_file, language_code, offset=0.0):
+    """Tek dosya için verbose_json Whisper çağrısı - {'text', 'segments'}; segment süreleri offset kadar kaydırılır"""
+    kwargs = {'model': "whisper-1", 'response_format': "verbose_json"}
+    if language_code:
+        kwargs['language'] = language_code
+    with open(audio_file, "rb") as f:
+        # Çekirdek dosyayı önden okur - disk okuması ağ gönderimiyle örtüşür (yalnızca POSIX)
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                pass
+        transcript = client.audio.transcriptions.create(file=f, **kwargs)
     
-    # Tüm yöntemler başarısız
-    youtube_logger.error("Tüm indirme yöntemleri başarısız")
+    # SDK sürümüne göre segmentler nesne ya da dict; session_state'te saklanabilsin diye düz dict'e çevrilir
+    segments = []
+    for seg in getattr(transcript, 'segments', None) or []:
+        get = seg.get if isinstance(seg, dict) else (lambda key, seg=seg: getattr(seg, key, None))
+        segments.append({'start': (get('start') or 0.0) + offset,
+                         'end': (get('end') or 0.0) + offset,
+                         'text': get('text') or ''})
+    return {'text': (getattr(transcript, 'text', None) or '').strip(), 'segments': segments}
+
+def _transcribe_audio(client, audio_file, duration_seconds, language_code):
+    """Uzun sesi parçalayıp eşzamanlı transkribe eder; kısa seste ya da bölme başarısızsa tek çağrı"""
+    # Süre bilinmiyorsa API'nin 25 MB sınırına yaklaşan dosyalar da bölünür
+    long_audio = duration_seconds > _SEGMENT_SECONDS or (
+        not duration_seconds and os.path.getsize(audio_file) > 24 * 1024 * 1024)
+    parts = _split_audio(audio_file) if long_audio else None
+    if not parts or len(parts) < 2:
+        return _transcribe_file(client, audio_file, language_code)
     
-    return None, """❌ YouTube video indirme başarısız oldu.
+    youtube_logger.info(f"{len(parts)} parça eşzamanlı transkribe ediliyor")
+    with ThreadPoolExecutor(max_workers=min(_MAX_PARALLEL_TRANSCRIPTIONS, len(parts))) as executor:
+        results = list(executor.map(
+            lambda part: _transcribe_file(client, part[0], language_code, offset=part[1]), parts))
+    return {
+        'text': "\n".join(result['text'] for result in results if result['text']),
+        'segments': [seg for result in results for seg in result['segments']],
+    }
 
-🔧 **ÇÖZÜM ÖNERİLERİ:**
+# Oturumda tutulan son işlenmiş dosya sayısı (çeviri sekmesi son 5'ini listeler)
+_PROCESSED_FILES_LIMIT = 32
 
-**🚫 Rate Limiting Sorunu:**
-- YouTube 1 saatlik rate limit uygulamış
-- Farklı internet bağlantısı deneyin (mobil veri, VPN)
-- 1-2 saat bekleyip tekrar deneyin
+# İndirme + transkripsiyon işleri Streamlit script thread'ini bloklamasın diye arka planda çalışır
+_PIPELINE_EXECUTOR = None
+_PIPELINE_EXECUTOR_LOCK = threading.Lock()
 
-**📱 Manuel İndirme:**
-1. Video → MP3 olarak manuel indirin
-2. "📁 Dosya Yükle" sekmesini kullanın
-3. İndirdiğiniz MP3'ü buraya yükleyin
+def _get_pipeline_executor():
+    """YouTube işleri için paylaşılan thread havuzu"""
+    global _PIPELINE_EXECUTOR
+    if _PIPELINE_EXECUTOR is None:
+        with _PIPELINE_EXECUTOR_LOCK:
+            if _PIPELINE_EXECUTOR is None:
+                _PIPELINE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="youtube-pipeline")
+                atexit.register(_PIPELINE_EXECUTOR.shutdown, wait=False)
+    return _PIPELINE_EXECUTOR
 
-**🔄 Alternatif Çözümler:**
-- Farklı YouTube video URL'i deneyin
-- Video public/erişilebilir olduğundan emin olun
-- Video çok yeni ise biraz bekleyin
+# Veritabanı yazımları ayrı tek thread'de - uzun indirme/transkripsiyon işlerinin arkasında beklemez
+_DB_WRITE_EXECUTOR = None
 
-**⚠️ Video Durumu:**
-- Video silinmiş/private olabilir
-- Coğrafi kısıtlama olabilir
-- Yaş sınırı içerebilir"""
+def _get_db_write_executor():
+    """YouTube sonuçlarının veritabanı kaydı için tek işçili havuz"""
+    global _DB_WRITE_EXECUTOR
+    if _DB_WRITE_EXECUTOR is None:
+        with _PIPELINE_EXECUTOR_LOCK:
+            if _DB_WRITE_EXECUTOR is None:
+                _DB_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="youtube-db")
+                atexit.register(_DB_WRITE_EXECUTOR.shutdown, wait=True)
+    return _DB_WRITE_EXECUTOR
 
-def get_video_info(video_id):
-    """Video bilgilerini alır - geliştirilmiş hata yönetimi ile"""
+def _youtube_pipeline(youtube_url, duration_seconds, language_code, progress):
+    """Arka planda indirir ve transkribe eder - (verbose transkript, hata dict'i) döndürür, ilerlemeyi progress dict'ine yazar"""
+    youtube_logger.progress(1, 4, "Video indirme aşaması")
+    progress.update(percent=0, message="📥 YouTube videosu indiriliyor...")
+    
+    def on_download_progress(fraction):
+        # İndirme çubuğun ilk yarısını kaplar; hook saniyede birkaç kez çağrılır, yalnızca dict güncellenir
+        progress.update(percent=int(45 * fraction), message=f"📥 YouTube videosu indiriliyor... {fraction:.0%}")
+    
+    audio_file, error = download_youtube_audio(youtube_url, progress_callback=on_download_progress)
+    if error:
+        return None, error
+    
     try:
-        youtube_logger.info(f"Video bilgileri alınıyor: {video_id}")
-        
-        # Kısa bekleme - rate limiting önlemi
-        import time
-        import random
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        from pytube import YouTube
+        # 2. Transkripsiyon
+        youtube_logger.progress(2, 4, "OpenAI Whisper transkripsiyon")
+        progress.update(percent=50, message="🧠 Transkripsiyon işleniyor...")
         
-        url = f"https://www.youtube.com/watch?v={video_id}"
-        yt = YouTube(url)
+        client = _openai_client()
         
-        duration_seconds = yt.length or 0
-        duration_str = f"{duration_seconds//60}:{duration_seconds%60:02d}" if duration_seconds else "Bilinmiyor"
+        # Yükleme ağ sınırlı - Whisper'ın zaten kullandığı 16 kHz mono'ya küçültülür
+        audio_file = _transcode_for_whisper(audio_file)
         
-        video_info = {
-            'title': yt.title or f'YouTube Video {video_id}',
-            'duration': duration_str,
-            'duration_seconds': duration_seconds,
-            'channel': yt.author or 'Bilinmiyor',
-            'views': f"{yt.views:,}" if yt.views else "Bilinmiyor"
-        }
+        # Dosya boyutunu logla
+        file_size_mb = os.path.getsize(audio_file) / (1024 * 1024)
+        youtube_logger.info(f"Ses dosyası boyutu: {file_size_mb:.1f} MB")
         
-        youtube_logger.success(f"Video bilgileri alındı: {video_info['title'][:30]}...")
-        return video_info
+        # Uzun videolarda parçalar eşzamanlı gönderilir
+        return _transcribe_audio(client, audio_file, duration_seconds, language_code), None
+    finally:
+        # Bu indirmenin geçici dosyalarını temizle - havuz dizini kalır
+        _remove_job_files(audio_file)
+        youtube_logger.info("Geçici dosya temizlendi")
+
+def get_video_info(video_id):
+    """Video bilgilerini alır - geliştirilmiş hata yönetimi ile"""
+    try:
+        return _fetch_video_info(video_id)
         
     except Exception as e:
         error_msg = str(e)
@@ -272,16 +517,265 @@ def get_video_info(video_id):
             'error': str(e)
         }
 
+class _LangView(dict):
+    """format_map için çeviri görünümü - anahtarlar ilk istendiğinde get_text ile doldurulur"""
+    def __init__(self, lang):
+        super().__init__()
+        self.lang = lang
+
+    def __missing__(self, key):
+        value = self[key] = get_text(key, self.lang)
+        return value
+
+_RATE_LIMIT_WARNING_TMPL = """
+    **{youtube_rate_limiting_warning}**
+    {youtube_rate_limiting_text}
+    """
+
+# URL beklenirken gösterilen panel metinleri - dil başına bir kez hazırlanır, rerun'larda sözlükten okunur
+_WAITING_TEXT_CACHE = {}
+
+def _waiting_texts(lang):
+    texts = _WAITING_TEXT_CACHE.get(lang)
+    if texts is None:
+        texts = _WAITING_TEXT_CACHE.setdefault(lang, (
+            f"🎬 {get_text('waiting_youtube_url', lang)}",
+            get_text('paste_youtube_link', lang),
+        ))
+    return texts
+
+# Geçersiz URL paneli metinleri - modül yüklenirken bir kez oluşturulur
+_YT_ERROR_MD = """
+### 📝 Desteklenen URL Formatları:
+- `https://www.youtube.com/watch?v=VIDEO_ID`
+- `https://youtu.be/VIDEO_ID`
+- `https://www.youtube.com/embed/VIDEO_ID`
+
+### 🛠️ URL Sorunları Çözümleri:
+**🔗 URL Kontrolleri:**
+- Video URL'sinin doğru kopyalandığından emin olun
+- Video hala erişilebilir durumda olduğunu kontrol edin
+- Video private/gizli olmadığından emin olun
+
+**🔄 Alternatif Yöntemler:**
+- Videoyu tarayıcıda açıp URL'yi tekrar kopyalayın  
+- Farklı bir YouTube videosu deneyin
+- Video → MP3 manuel indirme yapın → "📁 Dosya Yükle" kullanın
+"""
+
+_YT_MANUAL_GUIDE_MD = """
+**Adım 1:** YouTube videosunu tarayıcıda açın
+**Adım 2:** Video URL'sini online MP3 converter'a yapıştırın  
+**Adım 3:** MP3 olarak indirin
+**Adım 4:** İndirilen dosyayı "📁 Dosya Yükle" sekmesine yükleyin
+
+**🌐 Önerilen Siteler:** youtube-mp3.org, ytmp3.cc, y2mate.com
+"""
+
+# Rehber açıkken hata metniyle tek markdown olarak gönderilir
+_YT_ERROR_WITH_GUIDE_MD = _YT_ERROR_MD + "\n### 📱 Manuel İndirme Rehberi\n" + _YT_MANUAL_GUIDE_MD
+
+@st.fragment
+def _render_youtube_waiting_panel(error=None):
+    """URL hatası / bekleme panelini çizer - fragment olduğundan içindeki etkileşimler tüm sekmeyi yeniden çalıştırmaz"""
+    if error:
+        st.error(f"❌ {error}")
+        # Manuel indirme rehberi - expander gövdesi kapalıyken de üretildiği için yalnızca işaretlenince çizilir
+        guide_opened = st.checkbox("📱 Manuel İndirme Rehberi", key="yt_guide_opened")
+        st.markdown(_YT_ERROR_WITH_GUIDE_MD if guide_opened else _YT_ERROR_MD)
+    else:
+        title, body = _waiting_texts(get_current_language())
+        with st.container():
+            st.subheader(title)
+            st.caption(body)
+
+@st.fragment(run_every=0.5)
+def _await_youtube_save():
+    """Arka plandaki veritabanı kaydını bekler - bitince bir kez tüm uygulama yeniden çalışır ve ID gösterilir"""
+    save_future = st.session_state.get('youtube_save_future')
+    if save_future is not None and save_future.done():
+        st.rerun()
+
+@st.fragment(run_every=0.5)
+def _render_youtube_job_progress():
+    """Çalışan işin ilerlemesi - yalnızca bu fragment yenilenir, iş bitince bir kez tüm uygulama yeniden çalışır"""
+    job = st.session_state.get('youtube_job')
+    if job is None:
+        return
+    if job['future'].done():
+        st.rerun()
+    title = (job['video_info'] or {}).get('title') or job['url']
+    st.info(f"⏳ İşleniyor: {title}")
+    st.progress(job['progress']['percent'])
+    st.caption(job['progress']['message'])
+
+def _render_finished_youtube_job(job):
+    """Biten arka plan işinin sonucunu işler - URL kutusundaki değerden bağımsız çalışır"""
+    del st.session_state['youtube_job']
+    # İş başlatıldığındaki seçimler kullanılır - URL kutusu ve widget'lar bu arada değişmiş olabilir
+    youtube_url = job['url']
+    video_id = extract_youtube_id(youtube_url) or 'video'
+    video_info = job['video_info']
+    selected_language = job['selected_language']
+    language_code = job['language_code']
+    response_format = job['response_format']
+    
+    progress_bar = st.progress(75)
+    status_text = st.empty()
+    
+    try:
+        transcript, error = job['future'].result()
+        
+        if error:
+            youtube_logger.error(f"Video indirme hatası: {error['message'][:50]}...")
+            # İndirme worker thread'inde yapıldı; yt-dlp ayrıntısı burada, script thread'inde gösterilir
+            if error.get('detail'):
+                st.warning(f"❌ yt-dlp hatası: {error['detail']}...")
+            
+            # Özel hata mesajları
+            if error['kind'] == 'rate_limit':
+                st.error("🚫 YouTube Rate Limiting Tespit Edildi!")
+                st.info("""
+                **🛠️ Hemen Deneyebilecekleriniz:**
+                1. **VPN veya mobil veri** ile farklı IP adresi deneyin
+                2. **1-2 saat bekleyin** ve tekrar deneyin  
+                3. **Manuel indirme:** Video → MP3 olarak indirin → "📁 Dosya Yükle" sekmesini kullanın
+                
+                **📱 Manuel İndirme Adımları:**
+                - YouTube → Video Url → Online MP3 converter
+                - MP3 dosyasını bilgisayarınıza kaydedin
+                - "📁 Dosya Yükle" sekmesinde MP3'ü yükleyin
+                """)
+                st.markdown("---")
+                st.markdown("**💡 Online MP3 Converter Önerileri:** youtube-mp3.org, ytmp3.cc, y2mate.com")
+            elif error['kind'] == 'unavailable':
+                st.error(f"🔒 {error['message']}")
+                st.info("🔄 Videonun herkese açık olduğundan emin olun veya farklı bir video deneyin")
+            else:
+                st.error(f"❌ İndirme hatası: {error['message']}")
+            
+            return
+        
+        # Ham segmentler saklanır; aynı video/dil için başka format istenirse yerelde üretilir
+        st.session_state.youtube_verbose = {
+            'url': youtube_url,
+            'language_code': language_code,
+            'transcript': transcript,
+        }
+        result_text = _format_transcript(transcript, response_format)
+        youtube_logger.success(f"Transkripsiyon tamamlandı: {len(result_text)} karakter")
+        
+        # 3. Veritabanı kaydetme
+        youtube_logger.progress(3, 4, "Veritabanına kaydetme")
+        progress_bar.progress(75)
+        
+        # Session state'e kaydet
+        result_bytes = result_text.encode('utf-8')
+        MemoryManager.set_session('youtube_transcription_result', result_text)
+        MemoryManager.set_session('youtube_transcription_bytes', result_bytes)
+        st.session_state.youtube_video_info = video_info
+        st.session_state.youtube_last_url = youtube_url
+        st.session_state.youtube_selected_language = selected_language
+        
+        # Global erişim için en son işlenen dosya bilgilerini sakla - listeyle aynı dict paylaşılır
+        processed_entry = {
+            "result_text": result_text,
+            "ai_analysis": None,  # YouTube'da AI analiz yok
+            "transcription_id": None,  # Henüz yok, sonra eklenecek
+            "file_name": f"{video_info.get('title', 'YouTube Video')}.mp3",
+            "language_code": language_code,
+            "audio_info": {
+                "duration": video_info.get('duration_seconds', 0),
+                "duration_str": video_info.get('duration', 'Unknown'),
+                "source": "youtube"
+            },
+            "processed_at": time.time(),
+            "tab_source": "youtube",
+            "video_info": video_info,
+            "youtube_url": youtube_url
+        }
+        st.session_state["last_processed_file"] = processed_entry
+        
+        # Tüm işlenmiş dosyaları sınırlı bir deque'da tut - en eski kayıt kendiliğinden düşer
+        processed_files = st.session_state.get("processed_files_list")
+        if not isinstance(processed_files, deque):
+            processed_files = deque(processed_files or (), maxlen=_PROCESSED_FILES_LIMIT)
+            st.session_state.processed_files_list = processed_files
+        processed_files.append(processed_entry)
+        
+        # Veritabanına otomatik kaydet - arka planda; sonuç beklemeden gösterilir, kayıt bitince sekme yenilenir
+        from database import save_youtube_transcription
+        st.session_state.youtube_save_future = _get_db_write_executor().submit(
+            save_youtube_transcription,
+            video_url=youtube_url,
+            video_info=video_info,
+            transcript_text=result_text,
+            language=selected_language,
+            format_type=response_format
+        )
+        
+        # 4. Tamamlama
+        youtube_logger.progress(4, 4, "İşlem tamamlanıyor")
+        progress_bar.progress(100)
+        status_text.success("✅ İşlem tamamlandı!")
+        
+        youtube_logger.success("YouTube transkripsiyon süreci başarıyla tamamlandı")
+        
+        # Sonucu göster
+        st.success("🎉 Transkripsiyon tamamlandı!")
+        
+        st.markdown(f"### 🎬 {video_info.get('title', 'YouTube Video')}")
+        st.markdown(f"**Kanal:** {video_info.get('channel', 'Bilinmiyor')}")
+        st.markdown(f"**Süre:** {video_info.get('duration', 'Bilinmiyor')}")
+        st.markdown(f"**Dil:** {selected_language}")
+        
+        st.markdown("### 📝 Transkripsiyon Sonucu")
+        st.text_area("", result_text, height=300, key="current_result")
+        
+        # İndirme butonu
+        st.download_button(
+            label="📥 Metni İndir",
+            data=result_bytes,
+            file_name=f"youtube_transcript_{video_id}.txt",
+            mime="text/plain",
+            key="download_current"
+        )
+        
+    except Exception as e:
+        error_msg = str(e)
+        youtube_logger.error(f"Genel hata: {error_msg}")
+        
+        # Hata türüne göre özel mesajlar
+        if "rate limit" in error_msg.lower() or "429" in error_msg:
+            st.error("🚫 API Rate Limiting")
+            st.info("⏰ 5-10 dakika bekleyip tekrar deneyin")
+        elif "network" in error_msg.lower() or "connection" in error_msg.lower():
+            st.error("🌐 İnternet Bağlantı Sorunu")
+            st.info("🔄 İnternet bağlantınızı kontrol edin")
+        elif "timeout" in error_msg.lower():
+            st.error("⏱️ İşlem Zaman Aşımı")
+            st.info("🔄 Tekrar deneyin veya daha küçük video kullanın")
+        else:
+            st.error(f"❌ Beklenmeyen hata: {error_msg}")
+            
+        # Her durumda manuel indirme önerisi
+        with st.expander("🛠️ Alternatif Çözüm: Manuel İndirme"):
+            st.markdown("""
+            **📱 Hızlı Çözüm:**
+            1. YouTube video → Online MP3 converter kullanın
+            2. İndirilen MP3 dosyasını "📁 Dosya Yükle" sekmesine yükleyin
+            3. Normal transkripsiyon işlemi yapın
+            
+            **🌐 Önerilen siteler:** youtube-mp3.org, ytmp3.cc, y2mate.com
+            """)
+
 def render_youtube_tab():
     """YouTube transkripsiyon sekmesini render eder"""
     st.markdown(f"## {get_text('youtube_transcription')}")
     st.markdown(get_text("youtube_description"))
     
     # Önemli uyarı kutusu
-    st.warning(f"""
-    **{get_text('youtube_rate_limiting_warning')}**
-    {get_text('youtube_rate_limiting_text')}
-    """)
+    st.warning(_RATE_LIMIT_WARNING_TMPL.format_map(_LangView(get_current_language())))
     
     # Session state başlatma
     if 'youtube_transcription_result' not in st.session_state:
@@ -289,6 +783,25 @@ def render_youtube_tab():
     if 'youtube_video_info' not in st.session_state:
         st.session_state.youtube_video_info = None
     
+    # Arka planda başlatılan veritabanı kaydı bittiyse sonucu al
+    save_future = st.session_state.get('youtube_save_future')
+    if save_future is not None and not save_future.done():
+        _await_youtube_save()
+    elif save_future is not None:
+        del st.session_state['youtube_save_future']
+        try:
+            transcription_id = save_future.result()
+            if transcription_id:
+                st.session_state.youtube_last_saved_id = transcription_id
+                youtube_logger.success(f"Veritabanına kaydedildi: ID {transcription_id}")
+                st.info(f"✅ Transkripsiyon geçmişe kaydedildi (ID: {transcription_id})")
+            else:
+                youtube_logger.warning("Veritabanı kaydetme başarısız")
+                st.warning("⚠️ Geçmişe kaydetme başarısız oldu")
+        except Exception as db_error:
+            youtube_logger.error(f"Veritabanı hatası: {str(db_error)[:50]}...")
+            st.warning(f"⚠️ Geçmişe kaydetme hatası: {str(db_error)}")
+    
     # Global state'ten son işlenen dosyayı kontrol et
     recent_file_from_other_tabs = None
     if ("last_processed_file" in st.session_state and 
@@ -321,9 +834,12 @@ def render_youtube_tab():
         
         # İndirme butonu
         video_id = extract_youtube_id(st.session_state.get('youtube_last_url', '')) or 'video'
+        # Metin sonuç üretildiğinde bir kez UTF-8'e çevrilir; her rerun'da tekrar encode edilmez
+        download_data = (st.session_state.get('youtube_transcription_bytes')
+                         or st.session_state.youtube_transcription_result)
         st.download_button(
             label="📥 Metni İndir",
-            data=st.session_state.youtube_transcription_result,
+            data=download_data,
             file_name=f"youtube_transcript_{video_id}.txt",
             mime="text/plain",
             key="download_previous"
@@ -333,10 +849,14 @@ def render_youtube_tab():
         col1, col2 = st.columns(2)
         with col1:
             if st.button(get_text("clean_and_new"), type="secondary"):
-                st.session_state.youtube_transcription_result = None
+                MemoryManager.set_session('youtube_transcription_result', None)
+                MemoryManager.set_session('youtube_transcription_bytes', None)
                 st.session_state.youtube_video_info = None
                 st.session_state.youtube_last_url = None
                 st.session_state.youtube_last_saved_id = None
+                # Bekleyen kayıt temizlenen sonuca ait - ID'si artık gösterilmez
+                st.session_state.pop('youtube_save_future', None)
+                _fetch_video_info.clear()
                 st.rerun()
         
         with col2:
@@ -363,6 +883,14 @@ def render_youtube_tab():
         help="YouTube video linkini buraya yapıştırın"
     )
     
+    # Arka plan işi URL kutusundan bağımsız izlenir - URL değişse de sonuç kaybolmaz
+    running_job = st.session_state.get('youtube_job')
+    if running_job:
+        if running_job['future'].done():
+            _render_finished_youtube_job(running_job)
+        else:
+            _render_youtube_job_progress()
+    
     if youtube_url:
         # URL doğrulama
         is_valid, result = validate_youtube_url(youtube_url)
@@ -412,263 +940,53 @@ def render_youtube_tab():
                     index=0
                 )
             
-            # İşleme butonu
+            # İşleme butonu - indirme ve transkripsiyon arka planda çalışır, arayüz donmaz
+            job = st.session_state.get('youtube_job')
             if st.button("🚀 YouTube Videosunu İşle", type="primary"):
-                if 'youtube_processing' not in st.session_state:
-                    st.session_state.youtube_processing = False
-                
-                if st.session_state.youtube_processing:
+                if job and not job['future'].done():
                     st.warning("⏳ Video zaten işleniyor...")
                 else:
-                    st.session_state.youtube_processing = True
-                    
-                    youtube_logger.start(f"YouTube transkripsiyon başladı: {video_info.get('title', 'Bilinmiyor')[:30]}...")
-                    
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
+                    # 0. Aynı video/dil/format daha önce işlendiyse indirme ve API çağrısı atlanır
+                    from database import find_youtube_transcription
+                    previous = find_youtube_transcription(youtube_url, selected_language, response_format)
+                    if previous and previous.get('transcript_text'):
+                        youtube_logger.success(f"Geçmişten yüklendi: ID {previous['id']}")
+                        MemoryManager.set_session('youtube_transcription_result', previous['transcript_text'])
+                        MemoryManager.set_session('youtube_transcription_bytes', previous['transcript_text'].encode('utf-8'))
+                        st.session_state.youtube_video_info = video_info
+                        st.session_state.youtube_last_url = youtube_url
+                        st.session_state.youtube_last_saved_id = previous['id']
+                        st.rerun()
                     
-                    try:
-                        # 1. Video indirme
-                        youtube_logger.progress(1, 4, "Video indirme aşaması")
-                        status_text.info("📥 YouTube videosu indiriliyor...")
-                        progress_bar.progress(25)
-                        
-                        audio_file, error = download_youtube_audio(youtube_url)
-                        
-                        if error:
-                            youtube_logger.error(f"Video indirme hatası: {error[:50]}...")
-                            
-                            # Özel hata mesajları
-                            if "rate limit" in error.lower() or "rate-limited" in error.lower():
-                                st.error("🚫 YouTube Rate Limiting Tespit Edildi!")
-                                st.info("""
-                                **🛠️ Hemen Deneyebilecekleriniz:**
-                                1. **VPN veya mobil veri** ile farklı IP adresi deneyin
-                                2. **1-2 saat bekleyin** ve tekrar deneyin  
-                                3. **Manuel indirme:** Video → MP3 olarak indirin → "📁 Dosya Yükle" sekmesini kullanın
-                                
-                                **📱 Manuel İndirme Adımları:**
-                                - YouTube → Video Url → Online MP3 converter
-                                - MP3 dosyasını bilgisayarınıza kaydedin
-                                - "📁 Dosya Yükle" sekmesinde MP3'ü yükleyin
-                                """)
-                                st.markdown("---")
-                                st.markdown("**💡 Online MP3 Converter Önerileri:** youtube-mp3.org, ytmp3.cc, y2mate.com")
-                            else:
-                                st.error(f"❌ İndirme hatası: {error}")
-                            
-                            st.session_state.youtube_processing = False
-                            return
-                        
-                        # 2. Transkripsiyon
-                        youtube_logger.progress(2, 4, "OpenAI Whisper transkripsiyon")
-                        status_text.info("🧠 Transkripsiyon işleniyor...")
-                        progress_bar.progress(50)
-                        
-                        from config import OPENAI_API_KEY
-                        from openai import OpenAI
-                        client = OpenAI(api_key=OPENAI_API_KEY)
-                        
-                        # Dosya boyutunu logla
-                        file_size_mb = os.path.getsize(audio_file) / (1024 * 1024)
-                        youtube_logger.info(f"Ses dosyası boyutu: {file_size_mb:.1f} MB")
-                        
-                        # Basit API çağrısı
-                        with open(audio_file, "rb") as f:
-                            if language_code:
-                                transcript = client.audio.transcriptions.create(
-                                    model="whisper-1",
-                                    file=f,
-                                    language=language_code,
-                                    response_format=response_format
-                                )
-                            else:
-                                transcript = client.audio.transcriptions.create(
-                                    model="whisper-1",
-                                    file=f,
-                                    response_format=response_format
-                                )
-                        
-                        # Sonucu al
-                        if hasattr(transcript, 'text'):
-                            result_text = transcript.text
-                        else:
-                            result_text = str(transcript)
-                        
-                        youtube_logger.success(f"Transkripsiyon tamamlandı: {len(result_text)} karakter")
-                        
-                        # 3. Veritabanı kaydetme
-                        youtube_logger.progress(3, 4, "Veritabanına kaydetme")
-                        progress_bar.progress(75)
-                        
-                        # Geçici dosyayı temizle
-                        try:
-                            if os.path.exists(audio_file):
-                                os.unlink(audio_file)
-                                youtube_logger.info("Geçici dosya temizlendi")
-                        except:
-                            pass
-                        
-                        # Session state'e kaydet
-                        st.session_state.youtube_transcription_result = result_text
+                    # Aynı video/dil bu oturumda transkribe edildiyse yalnızca format değişmiştir - API'ye gidilmez
+                    verbose = st.session_state.get('youtube_verbose')
+                    if verbose and verbose['url'] == youtube_url and verbose['language_code'] == language_code:
+                        result_text = _format_transcript(verbose['transcript'], response_format)
+                        MemoryManager.set_session('youtube_transcription_result', result_text)
+                        MemoryManager.set_session('youtube_transcription_bytes', result_text.encode('utf-8'))
                         st.session_state.youtube_video_info = video_info
                         st.session_state.youtube_last_url = youtube_url
-                        st.session_state.youtube_selected_language = selected_language
-                        
-                        # Global erişim için en son işlenen dosya bilgilerini sakla
-                        st.session_state["last_processed_file"] = {
-                            "result_text": result_text,
-                            "ai_analysis": None,  # YouTube'da AI analiz yok
-                            "transcription_id": None,  # Henüz yok, sonra eklenecek
-                            "file_name": f"{video_info.get('title', 'YouTube Video')}.mp3",
-                            "language_code": language_code,
-                            "audio_info": {
-                                "duration": video_info.get('duration_seconds', 0),
-                                "duration_str": video_info.get('duration', 'Unknown'),
-                                "source": "youtube"
-                            },
-                            "processed_at": time.time(),
-                            "tab_source": "youtube",
-                            "video_info": video_info,
-                            "youtube_url": youtube_url
-                        }
-                        
-                        # Tüm işlenmiş dosyaları bir listede tut
-                        if "processed_files_list" not in st.session_state:
-                            st.session_state.processed_files_list = []
-                        
-                        # Yeni dosyayı listeye ekle
-                        st.session_state.processed_files_list.append({
-                            "result_text": result_text,
-                            "ai_analysis": None,
-                            "transcription_id": None,
-                            "file_name": f"{video_info.get('title', 'YouTube Video')}.mp3",
-                            "language_code": language_code,
-                            "audio_info": {
-                                "duration": video_info.get('duration_seconds', 0),
-                                "duration_str": video_info.get('duration', 'Unknown'),
-                                "source": "youtube"
-                            },
-                            "processed_at": time.time(),
-                            "tab_source": "youtube",
-                            "video_info": video_info,
-                            "youtube_url": youtube_url
-                        })
-                        
-                        # Veritabanına otomatik kaydet
-                        try:
-                            from database import save_youtube_transcription
-                            transcription_id = save_youtube_transcription(
-                                video_url=youtube_url,
-                                video_info=video_info,
-                                transcript_text=result_text,
-                                language=selected_language,
-                                format_type=response_format
-                            )
-                            if transcription_id:
-                                st.session_state.youtube_last_saved_id = transcription_id
-                                youtube_logger.success(f"Veritabanına kaydedildi: ID {transcription_id}")
-                                st.info(f"✅ Transkripsiyon geçmişe kaydedildi (ID: {transcription_id})")
-                            else:
-                                youtube_logger.warning("Veritabanı kaydetme başarısız")
-                                st.warning("⚠️ Geçmişe kaydetme başarısız oldu")
-                        except Exception as db_error:
-                            youtube_logger.error(f"Veritabanı hatası: {str(db_error)[:50]}...")
-                            st.warning(f"⚠️ Geçmişe kaydetme hatası: {str(db_error)}")
-                        
-                        # 4. Tamamlama
-                        youtube_logger.progress(4, 4, "İşlem tamamlanıyor")
-                        progress_bar.progress(100)
-                        status_text.success("✅ İşlem tamamlandı!")
-                        
-                        youtube_logger.success("YouTube transkripsiyon süreci başarıyla tamamlandı")
-                        
-                        # Sonucu göster
-                        st.success("🎉 Transkripsiyon tamamlandı!")
-                        
-                        st.markdown(f"### 🎬 {video_info.get('title', 'YouTube Video')}")
-                        st.markdown(f"**Kanal:** {video_info.get('channel', 'Bilinmiyor')}")
-                        st.markdown(f"**Süre:** {video_info.get('duration', 'Bilinmiyor')}")
-                        st.markdown(f"**Dil:** {selected_language}")
-                        
-                        st.markdown("### 📝 Transkripsiyon Sonucu")
-                        st.text_area("", result_text, height=300, key="current_result")
-                        
-                        # İndirme butonu
-                        st.download_button(
-                            label="📥 Metni İndir",
-                            data=result_text,
-                            file_name=f"youtube_transcript_{video_id}.txt",
-                            mime="text/plain",
-                            key="download_current"
-                        )
-                        
-                    except Exception as e:
-                        error_msg = str(e)
-                        youtube_logger.error(f"Genel hata: {error_msg}")
-                        
-                        # Hata türüne göre özel mesajlar
-                        if "rate limit" in error_msg.lower() or "429" in error_msg:
-                            st.error("🚫 API Rate Limiting")
-                            st.info("⏰ 5-10 dakika bekleyip tekrar deneyin")
-                        elif "network" in error_msg.lower() or "connection" in error_msg.lower():
-                            st.error("🌐 İnternet Bağlantı Sorunu")
-                            st.info("🔄 İnternet bağlantınızı kontrol edin")
-                        elif "timeout" in error_msg.lower():
-                            st.error("⏱️ İşlem Zaman Aşımı")
-                            st.info("🔄 Tekrar deneyin veya daha küçük video kullanın")
-                        else:
-                            st.error(f"❌ Beklenmeyen hata: {error_msg}")
-                            
-                        # Her durumda manuel indirme önerisi
-                        with st.expander("🛠️ Alternatif Çözüm: Manuel İndirme"):
-                            st.markdown("""
-                            **📱 Hızlı Çözüm:**
-                            1. YouTube video → Online MP3 converter kullanın
-                            2. İndirilen MP3 dosyasını "📁 Dosya Yükle" sekmesine yükleyin
-                            3. Normal transkripsiyon işlemi yapın
-                            
-                            **🌐 Önerilen siteler:** youtube-mp3.org, ytmp3.cc, y2mate.com
-                            """)
+                        st.rerun()
                     
-                    finally:
-                        st.session_state.youtube_processing = False
+                    youtube_logger.start(f"YouTube transkripsiyon başladı: {video_info.get('title', 'Bilinmiyor')[:30]}...")
+                    
+                    progress = {'percent': 0, 'message': "📥 YouTube videosu indiriliyor..."}
+                    duration_seconds = video_info.get('duration_seconds', 0) if video_info else 0
+                    job = {
+                        'future': _get_pipeline_executor().submit(
+                            _youtube_pipeline, youtube_url, duration_seconds, language_code, progress),
+                        'progress': progress,
+                        'url': youtube_url,
+                        'video_info': video_info,
+                        'selected_language': selected_language,
+                        'language_code': language_code,
+                        'response_format': response_format,
+                    }
+                    st.session_state.youtube_job = job
+                    st.rerun()
         
         else:
-            st.error(f"❌ {result}")
-            st.markdown("""
-            ### 📝 Desteklenen URL Formatları:
-            - `https://www.youtube.com/watch?v=VIDEO_ID`
-            - `https://youtu.be/VIDEO_ID`
-            - `https://www.youtube.com/embed/VIDEO_ID`
-            
-            ### 🛠️ URL Sorunları Çözümleri:
-            **🔗 URL Kontrolleri:**
-            - Video URL'sinin doğru kopyalandığından emin olun
-            - Video hala erişilebilir durumda olduğunu kontrol edin
-            - Video private/gizli olmadığından emin olun
-            
-            **🔄 Alternatif Yöntemler:**
-            - Videoyu tarayıcıda açıp URL'yi tekrar kopyalayın  
-            - Farklı bir YouTube videosu deneyin
-            - Video → MP3 manuel indirme yapın → "📁 Dosya Yükle" kullanın
-            """)
-            
-            # Manuel indirme rehberi
-            with st.expander("📱 Manuel İndirme Rehberi"):
-                st.markdown("""
-                **Adım 1:** YouTube videosunu tarayıcıda açın
-                **Adım 2:** Video URL'sini online MP3 converter'a yapıştırın  
-                **Adım 3:** MP3 olarak indirin
-                **Adım 4:** İndirilen dosyayı "📁 Dosya Yükle" sekmesine yükleyin
-                
-                **🌐 Önerilen Siteler:** youtube-mp3.org, ytmp3.cc, y2mate.com
-                """)
+            _render_youtube_waiting_panel(result)
     
     else:
-        st.markdown(f"""
-        <div style="text-align: center; padding: 2rem; color: #666;">
-            <h3>🎬 {get_text('waiting_youtube_url')}</h3>
-            <p>{get_text('paste_youtube_link')}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        _render_youtube_waiting_panel()